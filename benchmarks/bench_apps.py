@@ -0,0 +1,211 @@
+"""
+Headless UI benchmark for the Apps tab (AppInstaller).
+
+Mounts AppInstaller under Textual's App.run_test pilot with synthetic catalogs
+and a synthetic local pacman DB, then times mount, first paint, an idle frame,
+a checkbox toggle, Select All and the refresh after an install. Results are written as JSON
+so runs can be compared as the catalog code changes.
+
+    python benchmarks/bench_apps.py --output bench_apps.json
+    python benchmarks/bench_apps.py --sizes 100,1000 --installed 3000
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import datetime
+import tempfile
+from functools import partial
+from unittest.mock import patch
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(SRC_DIR)
+
+import textual
+from textual.app import App
+from textual.widgets import DataTable
+
+import apps
+import pacman_db
+import sync_db
+from catalog import Catalog
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_INSTALLED = 3000
+# Apps per category tab
+CATEGORY_SIZE = 500
+# Packages "installed" by the simulated transaction
+INSTALL_BATCH = 50
+# Unreachable RPC endpoint: AUR lookups fail fast instead of hitting the network
+OFFLINE_RPC = "http://127.0.0.1:9/rpc"
+
+DESC_TEMPLATE = """%NAME%
+{name}
+
+%VERSION%
+1.0-1
+
+%DESC%
+Synthetic benchmark package
+
+%SIZE%
+1048576
+
+%REASON%
+{reason}
+"""
+
+def app_pkg(i):
+    return f"bench-app-{i:05d}"
+
+def build_categories(size):
+    """Synthetic catalog: `size` apps in tabs of CATEGORY_SIZE, every 10th from the AUR."""
+    categories = {}
+    for i in range(size):
+        category = f"Bench Category {i // CATEGORY_SIZE:02d}"
+        categories.setdefault(category, {})[f"Bench App {i:05d}"] = {
+            "pkg": app_pkg(i),
+            "source": "aur" if i % 10 == 0 else "pacman",
+            "tier": "Standard",
+            "description": f"Synthetic app number {i} for the UI benchmark.",
+        }
+    return categories
+
+def write_package(db_path, name, reason=pacman_db.REASON_EXPLICIT):
+    entry = os.path.join(db_path, f"{name}-1.0-1")
+    os.makedirs(entry, exist_ok=True)
+    with open(os.path.join(entry, "desc"), "w") as f:
+        f.write(DESC_TEMPLATE.format(name=name, reason=reason))
+
+def build_local_db(db_path, catalog_size, installed):
+    """
+    Writes a local DB of `installed` packages: every third catalog app (up to
+    half of them), the rest dependency-only libraries.
+    """
+    os.makedirs(db_path, exist_ok=True)
+    apps_installed = [app_pkg(i) for i in range(0, catalog_size, 3)][:installed // 2]
+    for name in apps_installed:
+        write_package(db_path, name)
+    for j in range(installed - len(apps_installed)):
+        write_package(db_path, f"bench-lib-{j:05d}", pacman_db.REASON_DEPEND)
+
+class BenchApp(App):
+    CSS_PATH = os.path.join(SRC_DIR, "styles.tcss")
+
+    def compose(self):
+        yield apps.AppInstaller()
+
+    def log_message(self, message):
+        pass
+
+def ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+async def settle(pilot, inst):
+    """Waits for pending workers and the cart render, then one more frame."""
+    await pilot.app.workers.wait_for_complete()
+    await pilot.pause()
+    while inst.cart_render_pending:
+        await pilot.pause(0.005)
+    await pilot.pause()
+
+async def bench_size(size, installed, root):
+    db_path = os.path.join(root, "local")
+    build_local_db(db_path, size, installed)
+    state = pacman_db.PackageState(db_path)
+    sync_index = sync_db.SyncIndex(os.path.join(root, "sync"), os.path.join(root, "pacman.conf"))
+
+    with patch.object(apps, "_CATALOG", Catalog(build_categories(size))), \
+            patch.object(pacman_db, "get_package_state", lambda *args: state), \
+            patch.object(pacman_db, "get_installed_packages", partial(pacman_db.get_installed_packages, db_path)), \
+            patch.object(sync_db, "get_sync_index", sync_index.refresh):
+        app = BenchApp()
+        result = {"apps": size, "tabs": -(-size // CATEGORY_SIZE), "installed": installed}
+
+        start = time.perf_counter()
+        async with app.run_test(size=(200, 60)) as pilot:
+            result["mount_ms"] = ms(start)
+            inst = app.query_one(apps.AppInstaller)
+
+            # First paint: status worker done, the active tab and the cart rendered
+            await settle(pilot, inst)
+            result["first_paint_ms"] = ms(start)
+
+            table = app.query_one(f"#{inst.get_active_table_id()}", DataTable)
+            result["active_rows"] = table.row_count
+
+            # Cost of settle() itself with nothing to do, to read the others against
+            start = time.perf_counter()
+            await settle(pilot, inst)
+            result["idle_ms"] = ms(start)
+
+            table.move_cursor(row=1, column=0)
+            start = time.perf_counter()
+            table.action_select_cursor()
+            await settle(pilot, inst)
+            result["toggle_ms"] = ms(start)
+
+            start = time.perf_counter()
+            inst.action_select_all_tab()
+            await settle(pilot, inst)
+            result["select_all_ms"] = ms(start)
+
+            # Post-install refresh: new local DB entries picked up by the watcher path
+            new = [row_key.value for row_key in table.rows if row_key.value not in state.packages]
+            for name in new[:INSTALL_BATCH]:
+                write_package(db_path, name)
+            start = time.perf_counter()
+            state.refresh()
+            await settle(pilot, inst)
+            result["post_install_refresh_ms"] = ms(start)
+            result["post_install_changed"] = len(new[:INSTALL_BATCH])
+
+    return result
+
+async def run(sizes, installed):
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as root:
+            os.environ["XDG_CACHE_HOME"] = os.path.join(root, "cache")
+            result = await bench_size(size, installed, root)
+        print(
+            f"{size:>6} apps: mount {result['mount_ms']} ms, first paint {result['first_paint_ms']} ms, "
+            f"idle {result['idle_ms']} ms, "
+            f"toggle {result['toggle_ms']} ms, select all {result['select_all_ms']} ms, "
+            f"post-install refresh {result['post_install_refresh_ms']} ms",
+            file=sys.stderr
+        )
+        results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Apps tab benchmark")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated catalog sizes")
+    parser.add_argument("--installed", type=int, default=DEFAULT_INSTALLED,
+                        help="packages in the synthetic local DB")
+    parser.add_argument("--output", help="JSON file to write (default: stdout)")
+    args = parser.parse_args()
+
+    os.environ[apps.aur.AUR_RPC_ENV] = OFFLINE_RPC
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    report = {
+        "benchmark": "apps",
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "textual": textual.__version__,
+        "results": asyncio.run(run(sizes, args.installed)),
+    }
+
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+
+if __name__ == "__main__":
+    main()
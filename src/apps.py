@@ -1,13 +1,28 @@
+import os
+import time
 import asyncio
+import bisect
+import codecs
 import subprocess
 import re
 from textual.app import ComposeResult
-from textual.widgets import Static, SelectionList, Button, RichLog, ProgressBar, Label, DataTable, TabbedContent, TabPane, ListView, ListItem
+from textual.widgets import Static, SelectionList, Button, RichLog, ProgressBar, Label, DataTable, TabbedContent, TabPane, Input, Checkbox
 from textual.containers import Vertical, Horizontal, Grid, ScrollableContainer, VerticalScroll
 from textual.screen import ModalScreen
 from textual import on, work
 from textual.binding import Binding
-from goatfetch_ui import UninstallConfirmationScreen, UninstallSafetyScreen
+from rich.markup import escape
+from goatfetch_ui import UninstallConfirmationScreen, UninstallSafetyScreen, OrphanCleanupScreen, AURBuildScreen
+import pacman_db
+import sync_db
+from search_index import SearchIndex
+from dep_graph import DependencyGraph
+import preflight
+import prefetch
+import aur
+import aur_build
+from catalog import load_catalog, AUR_SOURCES
+from vercmp import vercmp
 
 # Application Definitions (New Structure)
 APPS_CATEGORIES = {
@@ -122,18 +137,63 @@ APPS_CATEGORIES = {
     }
 }
 
-# Helper to flatten APPS_CATEGORIES for easier processing by installer
-def get_flat_app_list():
-    flat_list = []
-    for category, apps in APPS_CATEGORIES.items():
-        for app_name, app_details in apps.items():
-            app_copy = app_details.copy()
-            app_copy['name'] = app_name
-            app_copy['category'] = category
-            # Create a unique ID
-            app_copy['id'] = app_details['pkg']
-            flat_list.append(app_copy)
-    return flat_list
+_CATALOG = None
+
+def get_catalog():
+    """
+    Returns the app Catalog: APPS_CATEGORIES overlaid with the system and user
+    catalog files (see catalog.load_catalog). Built once per run.
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        _CATALOG = load_catalog(APPS_CATEGORIES)
+    return _CATALOG
+
+def build_search_index(sync_index=None):
+    """Builds the Apps tab search index: curated catalog first, then repo packages."""
+    index = SearchIndex()
+    for app in get_catalog():
+        index.add(app.pkg, app.name, app.pkg, app.description, app.source)
+    if sync_index:
+        for pkg in sync_index.packages.values():
+            index.add(pkg['name'], pkg['name'], pkg['name'], pkg['description'], pkg['repo'])
+    return index
+
+# Max rows shown for a search; keeps each keystroke within a frame
+SEARCH_LIMIT = 100
+
+# Command output streaming (install/uninstall): read size, longest kept line
+# (the rest is dropped) and log batching, so output shows live with flat memory
+STREAM_CHUNK = 64 * 1024
+MAX_LINE = 4096
+LOG_FLUSH_INTERVAL = 0.1
+LOG_FLUSH_LINES = 200
+# Lines kept in the Apps log widget
+LOG_MAX_LINES = 5000
+
+async def read_lines(stream, max_line=MAX_LINE, chunk_size=STREAM_CHUNK):
+    """
+    Yields decoded lines from an asyncio stream as they arrive.
+    Only the current partial line is buffered, capped at max_line characters.
+    For \r progress redraws only the last frame is kept, as a terminal would show it.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while True:
+        chunk = await stream.read(chunk_size)
+        lines = (pending + decoder.decode(chunk, final=not chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            line = line.rstrip("\r")
+            yield line[line.rfind("\r") + 1:][:max_line]
+        # A trailing \r may be the first half of a \r\n split across reads; keep it
+        frame = pending[:-1] if pending.endswith("\r") else pending
+        pending = pending[frame.rfind("\r") + 1:][:max_line]
+        if not chunk:
+            break
+    pending = pending.rstrip("\r")
+    if pending:
+        yield pending
 
 def get_table_id(category):
     # Strictly sanitize: replace non-alphanumeric chars with _, collapse duplicates, strip ends
@@ -141,6 +201,25 @@ def get_table_id(category):
     clean = re.sub(r'_+', '_', clean).strip('_')
     return f"table_{clean}"
 
+def get_table_ids(categories):
+    """
+    {category: table id}, unique across categories: names that slugify to the
+    same id ("AI & Creative", "AI Creative") or to nothing (non-ASCII names)
+    get their index as a suffix.
+    """
+    table_ids = {}
+    used = set()
+    for index, category in enumerate(categories):
+        table_id = get_table_id(category)
+        base = table_id.rstrip("_")
+        suffix = index
+        while table_id in used or table_id == "table_":
+            table_id = f"{base}_{suffix}"
+            suffix += 1
+        used.add(table_id)
+        table_ids[category] = table_id
+    return table_ids
+
 class AppDescriptionScreen(ModalScreen):
     """Modal screen to show application details."""
     
@@ -166,6 +245,21 @@ class AppDescriptionScreen(ModalScreen):
                 
                 yield Label("Package:", classes="desc-label")
                 yield Label(self.app_data['pkg'], classes="desc-value")
+
+                # Offline repo metadata from the sync DB index, if available
+                repo_info = self.app_data.get('repo_info')
+                if repo_info:
+                    yield Label("Repository:", classes="desc-label")
+                    yield Label(f"{repo_info['repo']} ({repo_info['version']})", classes="desc-value")
+
+                    yield Label("Download Size:", classes="desc-label")
+                    yield Label(pacman_db.format_size(repo_info['download_size']), classes="desc-value")
+
+                    yield Label("Installed Size:", classes="desc-label")
+                    yield Label(pacman_db.format_size(repo_info['installed_size']), classes="desc-value")
+
+                    yield Label("Depends:", classes="desc-label")
+                    yield Label(", ".join(repo_info['depends']) or "None", classes="desc-value")
             
             yield Label("Description:", classes="desc-label-header")
             with ScrollableContainer(id="app_desc_text_container"):
@@ -182,18 +276,39 @@ class AppDescriptionScreen(ModalScreen):
         self.dismiss()
 
 class AppInstaller(Horizontal):
+    BINDINGS = [Binding("delete", "remove_cart_item", "Remove from cart", show=False)]
+
     def __init__(self, *args, **kwargs):
         super().__init__(id="apps_container", *args, **kwargs)
         # Local import to avoid circular dependency as config imports apps
         from config import detect_aur_helper
         self.aur_helper = detect_aur_helper()
+        self.catalog = get_catalog()
         self.selected_apps = set() # Stores pkg_ids of selected apps
+        self.sync_index = None # Offline repo metadata (sync_db.SyncIndex)
+        self.installed_packages = set()
+        self.aur_info = {} # AUR RPC records for catalog AUR apps and foreign packages
+        self.search_index = build_search_index()
+        self.search_has_repo = False
+        self.table_ids = get_table_ids(self.catalog.categories())
+        # pkg -> category table id, for keeping checkmarks in sync with search results
+        self.pkg_tables = {pkg: self.table_ids[app.category] for pkg, app in self.catalog.by_pkg.items()}
+        self.table_categories = {table_id: category for category, table_id in self.table_ids.items()}
+        # Category tables whose rows are stale (set by refresh_app_status); rebuilt when their tab is shown
+        self.dirty_tables = set()
+        # Set once a full refresh has built the tables; until then changes can't be diffed
+        self.status_loaded = False
+        # Catalog pkg -> installed satisfier at the last status refresh (diffed on the next)
+        self.app_satisfiers = {}
+        # Sorted pkgs shown in the cart table, index-aligned with its rows
+        self.cart_pkgs = []
+        self.cart_render_pending = False
 
     def compose(self) -> ComposeResult:
         # Left Panel: Tabbed Interface
         with Vertical(id="apps_left_pane"):
             yield Label("Select Applications", id="app_list_title")
-            yield Label("Navigate tabs to find apps. Click [x] to select.", id="app_list_instructions")
+            yield Label("Navigate tabs or search to find apps. Click [x] to select.", id="app_list_instructions")
             
             with Horizontal(id="app_toolbar"):
                 yield Button("<", id="tab_prev", classes="compact")
@@ -202,128 +317,399 @@ class AppInstaller(Horizontal):
                 yield Button("All", id="select_all", classes="compact")
                 yield Button("None", id="deselect_all", classes="compact")
 
+            yield Input(placeholder="Search apps and repo packages...", id="app_search")
+            yield DataTable(id="search_results", cursor_type="cell")
+
             with TabbedContent(id="apps_tabs"):
-                for category in APPS_CATEGORIES.keys():
-                    with TabPane(category, id=f"tab_{get_table_id(category)}"):
-                        # Unique ID for each table
-                        table_id = get_table_id(category)
+                for category, table_id in self.table_ids.items():
+                    with TabPane(category, id=f"tab_{table_id}"):
                         yield DataTable(id=table_id, cursor_type="cell")
             
             yield Label("", id="install_status")
             yield ProgressBar(total=100, show_eta=False, id="install_progress")
             
+            yield Checkbox("Offline: install from the package cache only", id="offline_mode")
+            yield Checkbox("Build AUR packages in parallel (makepkg pool)", id="parallel_builds")
+
             with Horizontal(id="app_actions"):
                 yield Button("Install Selected", variant="primary", id="app_install_btn", classes="compact")
                 yield Button("Uninstall Selected", variant="error", id="app_uninstall_btn", classes="compact")
+                yield Button("Clean Orphans", variant="warning", id="app_orphans_btn", classes="compact")
 
         # Right Panel: Cart & Logs
         with Vertical(id="apps_right_pane"):
             # Cart Section
             with Vertical(id="cart_section"):
                 yield Label("Selected Apps", id="cart_header")
-                yield ListView(id="cart_list")
+                yield DataTable(id="cart_list", cursor_type="cell", show_header=False)
+                yield Label("[dim]No apps selected[/dim]", id="cart_empty")
+                yield Label("", id="cart_summary")
 
             # Log Section
             with Vertical(id="log_section"):
                 yield Label("Logs")
-                yield RichLog(id="app_log", markup=True, highlight=True)
+                yield RichLog(id="app_log", markup=True, highlight=True, max_lines=LOG_MAX_LINES)
 
     def on_mount(self):
         self.query_one("#install_progress", ProgressBar).display = False
         
         # Configure all DataTables
-        for category in APPS_CATEGORIES.keys():
-            table_id = get_table_id(category)
+        for table_id in self.table_categories:
             try:
                 table = self.query_one(f"#{table_id}", DataTable)
                 table.add_column("Select", key="Select")
                 table.add_column("Name", key="Name")
                 table.add_column("Source", key="Source")
                 table.add_column("Tier", key="Tier")
+                table.add_column("Version", key="Version")
+                table.add_column("Size", key="Size")
                 table.add_column("Status", key="Status")
             except Exception:
                 pass
+
+        search_table = self.query_one("#search_results", DataTable)
+        search_table.add_column("Select", key="Select")
+        search_table.add_column("Name", key="Name")
+        search_table.add_column("Package", key="Package")
+        search_table.add_column("Source", key="Source")
+        search_table.add_column("Status", key="Status")
+        search_table.display = False
+
+        cart_table = self.query_one("#cart_list", DataTable)
+        cart_table.add_column("Remove", key="Remove")
+        cart_table.add_column("Name", key="Name")
+        cart_table.add_column("Package", key="Package")
+        cart_table.display = False
         
         # Populate data
-        self.run_worker(self.refresh_app_status(), exclusive=True)
+        self.run_worker(self.refresh_app_status(), exclusive=True, group="app_status")
+        pacman_db.get_package_state().subscribe(self.on_packages_changed)
+
+    def on_unmount(self):
+        pacman_db.get_package_state().unsubscribe(self.on_packages_changed)
 
-    async def refresh_app_status(self):
-        """Check installed status of all apps and populate the tables."""
+    def on_packages_changed(self, changed: set[str]):
+        """Called by the package state cache when the local DB changes."""
+        self.run_worker(self.refresh_app_status(changed), exclusive=True, group="app_status")
+
+    async def refresh_app_status(self, changed=None):
+        """
+        Check installed status of all apps and populate the tables.
+        With `changed` (package names from the local DB watcher), built tables are
+        diffed and only the cells whose state changed are updated.
+        """
         self.log_message("Checking installed applications...")
         
         installed_packages = await self.get_installed_packages()
+        self.installed_packages = installed_packages
+        self.sync_index = await self.get_sync_index()
+
+        if self.sync_index and not self.search_has_repo:
+            # Merge the repo packages into search (built off the event loop)
+            self.search_index = await asyncio.to_thread(build_search_index, self.sync_index)
+            self.search_has_repo = True
         
         # Populate local set with installed apps initially (optional, but good for UX)
         # Or keep selection separate from installed status?
         # "Selection means I want this". If it's installed, it's already "selected" in a way.
         # Let's auto-select installed apps.
-        for pkg in installed_packages:
-             # Only add if it's one of our known apps
-             flat = get_flat_app_list()
-             if any(a['pkg'] == pkg for a in flat):
-                 self.selected_apps.add(pkg)
+        # Entries satisfied by a provider (e.g. a -git variant) count as installed
+        satisfiers = {app.pkg: self.get_satisfier(app.pkg) for app in self.catalog}
+        newly_selected = {pkg for pkg, satisfier in satisfiers.items() if satisfier and pkg not in self.selected_apps}
+        self.selected_apps |= newly_selected
+        status_changed = {pkg for pkg, satisfier in satisfiers.items() if self.app_satisfiers.get(pkg) != satisfier}
+        self.app_satisfiers = satisfiers
 
         self.update_cart_view()
 
-        # Iterate categories to populate each table
-        for category, apps in APPS_CATEGORIES.items():
-            table_id = get_table_id(category)
+        if changed is not None and self.status_loaded and len(self.dirty_tables) < len(self.table_categories):
+            # Keeps cursor and scroll: only the rows of changed packages are touched
+            self.update_changed_rows(set(changed) | newly_selected | status_changed)
+        else:
+            # Only the visible tab is rebuilt now; hidden ones are just flagged
+            self.dirty_tables = set(self.table_categories)
+            self.populate_table(self.get_active_table_id())
+            self.update_search_results(self.query_one("#app_search", Input).value)
+            self.status_loaded = True
+        self.log_message("[green]Application list updated.[/green]")
+        self.run_worker(self.refresh_aur_info(), exclusive=True, group="aur_info")
+
+    def get_active_table_id(self):
+        """Table id of the active category tab (TabPane ids are "tab_<table_id>")."""
+        active = self.query_one("#apps_tabs", TabbedContent).active
+        return active[4:] if active and active.startswith("tab_") else None
+
+    @on(TabbedContent.TabActivated, "#apps_tabs")
+    def on_tab_activated(self, event: TabbedContent.TabActivated):
+        if event.pane.id and event.pane.id.startswith("tab_"):
+            self.populate_table(event.pane.id[4:])
+
+    def populate_table(self, table_id):
+        """(Re)build a category table if it is dirty."""
+        if table_id not in self.dirty_tables:
+            return
+        try:
+            table = self.query_one(f"#{table_id}", DataTable)
+        except Exception:
+            return
+        self.dirty_tables.discard(table_id)
+        table.clear()
+
+        for app in self.catalog.in_category(self.table_categories[table_id]):
+            pkg = app.pkg
+            check_mark, status_str = self.get_row_state(pkg)
+            version_str, size_str = self.get_repo_columns(pkg, app.source)
+            
+            table.add_row(
+                check_mark,
+                app.name,
+                app.source,
+                app.tier,
+                version_str,
+                size_str,
+                status_str,
+                key=pkg
+            )
+
+    def get_row_state(self, pkg: str):
+        """(Select, Status) cell values for a catalog row."""
+        check_mark = r"\[x]" if pkg in self.selected_apps else r"\[ ]"
+        return check_mark, self.get_status_str(pkg)
+
+    def update_changed_rows(self, pkgs):
+        """
+        Diff the rendered Select/Status cells of pkgs, in their category table and
+        the search results, against the current state and update_cell only the
+        ones that differ. Returns the number of updated cells.
+        """
+        tables = {}
+        updated = 0
+        for pkg in pkgs:
+            for table_id in (self.pkg_tables.get(pkg), "search_results"):
+                # Dirty tables read the new state when they are rebuilt
+                if not table_id or table_id in self.dirty_tables:
+                    continue
+                if table_id not in tables:
+                    try:
+                        tables[table_id] = self.query_one(f"#{table_id}", DataTable)
+                    except Exception:
+                        tables[table_id] = None
+                table = tables[table_id]
+                if table is None or pkg not in table.rows:
+                    continue
+                for column, value in zip(("Select", "Status"), self.get_row_state(pkg)):
+                    if str(table.get_cell(pkg, column)) != value:
+                        table.update_cell(pkg, column, value)
+                        updated += 1
+        return updated
+
+    async def refresh_aur_info(self):
+        """Fetch versions of catalog AUR apps and installed foreign packages in one RPC request."""
+        catalog_aur = [app.pkg for app in self.catalog.with_source(*AUR_SOURCES)]
+        try:
+            foreign = await asyncio.to_thread(aur.get_foreign_packages)
+            names = sorted(set(catalog_aur) | set(foreign))
+            self.aur_info = await asyncio.to_thread(aur.get_aur_client().info, names)
+        except Exception as e:
+            self.log_message(f"[dim]AUR info unavailable: {escape(str(e))}[/dim]")
+            return
+
+        updates = aur.find_aur_updates(foreign, self.aur_info)
+        if updates:
+            self.log_message(f"[yellow]{len(updates)} AUR updates available: {', '.join(u['name'] for u in updates)}[/yellow]")
+
+        for pkg in catalog_aur:
+            table_id = self.pkg_tables.get(pkg)
+            if table_id in self.dirty_tables:
+                continue # Picks up self.aur_info when built
             try:
                 table = self.query_one(f"#{table_id}", DataTable)
-                table.clear()
-                
-                for app_name, app_details in apps.items():
-                    pkg = app_details['pkg']
-                    is_installed = pkg in installed_packages
-                    is_selected = pkg in self.selected_apps
-                    
-                    check_mark = r"\[x]" if is_selected else r"\[ ]"
-                    status_str = "[green]Installed[/green]" if is_installed else "[dim]Not Installed[/dim]"
-                    
-                    table.add_row(
-                        check_mark,
-                        app_name,
-                        app_details['source'],
-                        app_details.get('tier', ''),
-                        status_str,
-                        key=pkg
-                    )
+                if pkg in table.rows:
+                    version_str, _size_str = self.get_repo_columns(pkg, "aur")
+                    table.update_cell(pkg, "Version", version_str)
+                    table.update_cell(pkg, "Status", self.get_status_str(pkg))
             except Exception:
                 continue
-            
-        self.log_message("[green]Application list updated.[/green]")
 
-    def update_cart_view(self):
-        """Refresh the Cart ListView based on self.selected_apps."""
-        cart_list = self.query_one("#cart_list", ListView)
-        cart_list.clear()
-        
-        if not self.selected_apps:
-            cart_list.append(ListItem(Label("[dim]No apps selected[/dim]")))
+    def get_satisfier(self, pkg: str):
+        """Installed package satisfying pkg: pkg itself or a provider of it, else None."""
+        if pkg in self.installed_packages:
+            return pkg
+        return pacman_db.get_package_state().satisfier(pkg)
+
+    def get_status_str(self, pkg: str) -> str:
+        satisfier = self.get_satisfier(pkg)
+        if satisfier is None:
+            return "[dim]Not Installed[/dim]"
+        if satisfier != pkg:
+            return f"[green]Installed ({escape(satisfier)})[/green]"
+        record = self.aur_info.get(pkg)
+        local = pacman_db.get_package_state().packages.get(pkg)
+        if record and local and vercmp(record['version'], local['version']) > 0:
+            return "[yellow]Update Available[/yellow]"
+        return "[green]Installed[/green]"
+
+    @on(Input.Changed, "#app_search")
+    def on_search_changed(self, event: Input.Changed):
+        self.update_search_results(event.value)
+
+    def update_search_results(self, query: str):
+        """Show search results in place of the category tabs (tabs return when empty)."""
+        table = self.query_one("#search_results", DataTable)
+        tabs = self.query_one("#apps_tabs", TabbedContent)
+
+        if not query.strip():
+            table.display = False
+            tabs.display = True
             return
 
-        # Sort for display
-        sorted_apps = sorted(list(self.selected_apps))
-        
-        flat_apps = get_flat_app_list()
-        
-        for pkg in sorted_apps:
-            # Find readable name
-            app_data = next((a for a in flat_apps if a['pkg'] == pkg), None)
-            name = app_data['name'] if app_data else pkg
-            
-            item_layout = Horizontal(
-                Label(f"{name} ({pkg})"),
-                Button("x", id=f"remove_{pkg}", classes="compact remove-btn"),
-                classes="cart-item"
-            )
-            cart_list.append(ListItem(item_layout))
+        table.clear()
+        for key, name, pkg, _description, source in self.search_index.search(query, limit=SEARCH_LIMIT):
+            check_mark = r"\[x]" if pkg in self.selected_apps else r"\[ ]"
+            status_str = self.get_status_str(pkg)
+            table.add_row(check_mark, name, pkg, source, status_str, key=key)
+
+        tabs.display = False
+        table.display = True
+
+    def sync_row_checkmark(self, pkg: str, source_table: DataTable):
+        """Mirror a checkbox toggle into the other table showing the same package."""
+        check_mark = r"\[x]" if pkg in self.selected_apps else r"\[ ]"
+        table_ids = [self.pkg_tables.get(pkg), "search_results"]
+        for table_id in table_ids:
+            if not table_id or table_id == source_table.id:
+                continue
+            try:
+                table = self.query_one(f"#{table_id}", DataTable)
+                if pkg in table.rows:
+                    table.update_cell(pkg, "Select", check_mark)
+            except Exception:
+                pass
+
+    def get_app_data(self, pkg: str):
+        """Catalog entry for pkg, or one derived from the sync index for repo-only packages."""
+        app = self.catalog.get(pkg)
+        app_data = app.to_dict() if app else None
+        if app_data is None and self.sync_index:
+            repo_info = self.sync_index.get(pkg)
+            if repo_info:
+                app_data = {
+                    "name": pkg,
+                    "pkg": pkg,
+                    "id": pkg,
+                    "source": "pacman",
+                    "category": repo_info['repo'],
+                    "tier": "Repository",
+                    "description": repo_info['description'],
+                }
+        return app_data
+
+    def get_repo_columns(self, pkg: str, source: str):
+        """Returns (version, download size) strings for a catalog entry."""
+        repo_info = self.sync_index.get(pkg) if self.sync_index else None
+        if repo_info:
+            return f"{repo_info['repo']}/{repo_info['version']}", pacman_db.format_size(repo_info['download_size'])
+        if source in AUR_SOURCES:
+            record = self.aur_info.get(pkg)
+            if record:
+                return f"aur/{record['version']}", "[dim]-[/dim]"
+            return "[dim]AUR[/dim]", "[dim]-[/dim]"
+        return "[dim]Unavailable[/dim]", "[dim]-[/dim]"
+
+    def update_cart_view(self):
+        """
+        Schedule a refresh of the cart table from self.selected_apps.
+        Any number of selection changes before the next frame render once.
+        """
+        if not self.cart_render_pending:
+            self.cart_render_pending = True
+            self.call_after_refresh(self.render_cart)
+
+    def make_cart_row(self, pkg: str):
+        # Find readable name
+        app = self.catalog.get(pkg)
+        name = app.name if app else pkg
+        return ("[b]x[/b]", escape(name), pkg)
+
+    def render_cart(self):
+        """
+        Sync the cart table (rows keyed by pkg) with the selection. Only changed
+        rows are removed or added; new rows are put in place with one sort, so
+        existing rows are neither rebuilt nor re-measured.
+        """
+        self.cart_render_pending = False
+        self.update_cart_summary()
+        cart_list = self.query_one("#cart_list", DataTable)
+        cart_pkgs = sorted(self.selected_apps)
+
+        if cart_pkgs != self.cart_pkgs:
+            cursor = cart_list.cursor_row
+            cursor_pkg = self.cart_pkgs[cursor] if 0 <= cursor < len(self.cart_pkgs) else None
+            for pkg in self.cart_pkgs:
+                if pkg not in self.selected_apps:
+                    cart_list.remove_row(pkg)
+            added = sorted(self.selected_apps.difference(self.cart_pkgs))
+            for pkg in added:
+                cart_list.add_row(*self.make_cart_row(pkg), key=pkg)
+            if added and self.cart_pkgs and added[0] < self.cart_pkgs[-1]:
+                cart_list.sort("Package")
+            # Keep the cursor on its pkg (or the next one if it was removed)
+            if cursor_pkg is not None and cart_pkgs:
+                row = min(bisect.bisect_left(cart_pkgs, cursor_pkg), len(cart_pkgs) - 1)
+                cart_list.move_cursor(row=row, animate=False)
+            self.cart_pkgs = cart_pkgs
+
+        cart_list.display = bool(cart_pkgs)
+        self.query_one("#cart_empty", Label).display = not cart_pkgs
+
+    def compute_cart_footprint(self):
+        """
+        Download/installed size of the selection (missing repo deps included) and
+        which of those packages are already in the package cache.
+        """
+        return preflight.plan_cached_install(self.selected_apps, self.sync_index)
+
+    def update_cart_summary(self):
+        """Show cart download/install totals and free space on / and the package cache."""
+        footprint, cache = self.compute_cart_footprint()
+        free, problems = preflight.check_disk_space(footprint)
+
+        def fmt_free(path):
+            return pacman_db.format_size(free[path]) if free[path] is not None else "?"
+
+        download = f"Download: {pacman_db.format_size(footprint['download'])}"
+        if cache['saved']:
+            download += f" ({pacman_db.format_size(cache['saved'])} cached)"
+        lines = [
+            f"{download} | Install: {pacman_db.format_size(footprint['installed'])}",
+            f"Free /: {fmt_free(preflight.ROOT_DIR)} | Cache: {fmt_free(preflight.PKG_CACHE_DIR)}",
+        ]
+        if footprint['unknown']:
+            lines.append(f"[dim]+{len(footprint['unknown'])} AUR/unknown (size not included)[/dim]")
+        if problems:
+            lines.append("[red]Not enough disk space![/red]")
+        self.query_one("#cart_summary", Label).update("\n".join(lines))
+
+    @on(DataTable.CellSelected, "#cart_list")
+    def on_cart_cell_selected(self, event: DataTable.CellSelected):
+        """Clicking the x column of a cart row removes that app from the selection."""
+        event.stop()
+        if event.coordinate.column == 0:
+            self.set_selected([event.cell_key.row_key.value], False)
+
+    def action_remove_cart_item(self):
+        """Delete on the focused cart removes the app under the cursor."""
+        cart_table = self.query_one("#cart_list", DataTable)
+        if cart_table.has_focus and 0 <= cart_table.cursor_row < len(self.cart_pkgs):
+            self.set_selected([self.cart_pkgs[cart_table.cursor_row]], False)
 
     @on(DataTable.CellSelected)
     def on_cell_selected(self, event: DataTable.CellSelected):
         """
         Handle cell selection across any table.
         """
+        if event.data_table.id == "cart_list":
+            return
         row_key = event.cell_key.row_key.value # This is the pkg ID
 
         # Use coordinate.column (index) for reliability
@@ -343,31 +729,34 @@ class AppInstaller(Horizontal):
                 self.selected_apps.add(row_key)
             
             table.update_cell_at(event.coordinate, new_val)
+            self.sync_row_checkmark(row_key, table)
             self.update_cart_view()
         
         else:
             # Any other column -> Show Details
-            flat_apps = get_flat_app_list()
-            app_data = next((a for a in flat_apps if a['pkg'] == row_key), None)
+            app_data = self.get_app_data(row_key)
             
             if app_data:
+                 if self.sync_index:
+                     app_data['repo_info'] = self.sync_index.get(row_key)
                  self.app.push_screen(AppDescriptionScreen(app_data))
 
     async def get_installed_packages(self) -> set[str]:
         """Return a set of all installed packages (pacman + yay)."""
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "pacman", "-Qq",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
-            if proc.returncode == 0:
-                return set(stdout.decode().splitlines())
+            # Directory scan of the local DB; run off the event loop
+            return await asyncio.to_thread(pacman_db.get_installed_packages)
         except Exception:
             pass
         return set()
 
+    async def get_sync_index(self):
+        """Load the offline sync DB index (repo, version, sizes) off the event loop."""
+        try:
+            return await asyncio.to_thread(sync_db.get_sync_index)
+        except Exception:
+            return None
+
     @on(Button.Pressed, "#app_install_btn")
     def install_selected(self):
         # Filter selected apps that are NOT installed?
@@ -379,8 +768,18 @@ class AppInstaller(Horizontal):
             self.log_message("[yellow]No applications selected.[/yellow]")
             return
 
+        # Disk space preflight: refuse up front instead of failing mid-download
+        footprint, _cache = self.compute_cart_footprint()
+        _free, problems = preflight.check_disk_space(footprint)
+        if problems:
+            for problem in problems:
+                self.log_message(f"[red]Preflight: {escape(problem)}[/red]")
+            self.log_message("[red]Installation aborted. Free some disk space and try again.[/red]")
+            return
+
         self.query_one("#app_install_btn", Button).disabled = True
         self.query_one("#app_uninstall_btn", Button).disabled = True
+        self.query_one("#app_orphans_btn", Button).disabled = True
         self.query_one("#install_progress", ProgressBar).display = True
         
         self.run_worker(self.run_installation(list(self.selected_apps)), exclusive=True)
@@ -399,12 +798,6 @@ class AppInstaller(Horizontal):
             self.action_select_all_tab()
         elif btn_id == "deselect_all":
             self.action_deselect_all_tab()
-        elif btn_id.startswith("remove_"):
-            pkg_to_remove = btn_id.replace("remove_", "")
-            if pkg_to_remove in self.selected_apps:
-                self.selected_apps.remove(pkg_to_remove)
-                self.update_cart_view()
-                self.refresh_tables_checkmarks()
 
     def action_prev_tab(self):
         tabs = self.query_one("#apps_tabs", TabbedContent)
@@ -451,6 +844,10 @@ class AppInstaller(Horizontal):
         if not active_pane_id.startswith("tab_"): return
         
         table_id = active_pane_id[4:] # remove "tab_" prefix
+
+        # While searching, All/None act on the visible search results
+        if self.query_one("#search_results", DataTable).display:
+            table_id = "search_results"
         
         try:
             table = self.query_one(f"#{table_id}", DataTable)
@@ -464,7 +861,7 @@ class AppInstaller(Horizontal):
         
         # Textual DataTable API: table.rows is different in versions.
         # Safer to use coordinate iteration or just iterate over list of data if we have it.
-        # But we used APPS_CATEGORIES to build it.
+        # But we used the catalog to build it.
         
         # Reverse lookup category from table_id? Or just iterate all rows in table.
         # table.coordinate_to_cell_key map exists?
@@ -473,31 +870,42 @@ class AppInstaller(Horizontal):
         # We can just scan the table's rows.
         
         # In modern Textual, table.rows is a dict.
-        for row_key in table.rows:
-             pkg = row_key.value
-             if select:
-                 self.selected_apps.add(pkg)
-             else:
-                 if pkg in self.selected_apps:
-                     self.selected_apps.remove(pkg)
-        
-        self.update_cart_view()
-        self.refresh_tables_checkmarks()
+        self.set_selected([row_key.value for row_key in table.rows], select, table)
 
-    def refresh_tables_checkmarks(self):
-        """Update checkmarks in all tables based on current selection."""
-        for category in APPS_CATEGORIES.keys():
-            table_id = get_table_id(category)
-            try:
-                table = self.query_one(f"#{table_id}", DataTable)
-                for row_key in table.rows:
-                    pkg = row_key.value
-                    is_selected = pkg in self.selected_apps
-                    check_mark = r"\[x]" if is_selected else r"\[ ]"
-                    # Update column 0 ("Select")
-                    table.update_cell(row_key, "Select", check_mark)
-            except Exception:
-                pass
+    def set_selected(self, pkgs, select: bool, source_table: DataTable = None):
+        """
+        Batch selection change. Only rows whose checkmark flips are updated, in
+        source_table and in the other built table showing the same package, and
+        the cart is rendered once. Returns the changed pkgs.
+        """
+        if select:
+            changed = [pkg for pkg in pkgs if pkg not in self.selected_apps]
+            self.selected_apps.update(changed)
+        else:
+            changed = [pkg for pkg in pkgs if pkg in self.selected_apps]
+            self.selected_apps.difference_update(changed)
+        if not changed:
+            return changed
+
+        check_mark = r"\[x]" if select else r"\[ ]"
+        source_id = source_table.id if source_table is not None else None
+        tables = {}
+        for pkg in changed:
+            # Dirty tables read the selection when they are rebuilt
+            for table_id in (source_id, self.pkg_tables.get(pkg), "search_results"):
+                if not table_id or table_id in self.dirty_tables:
+                    continue
+                if table_id not in tables:
+                    try:
+                        tables[table_id] = self.query_one(f"#{table_id}", DataTable)
+                    except Exception:
+                        tables[table_id] = None
+                table = tables[table_id]
+                if table is not None and pkg in table.rows:
+                    table.update_cell(pkg, "Select", check_mark)
+
+        self.update_cart_view()
+        return changed
 
     @on(Button.Pressed, "#app_uninstall_btn")
     def uninstall_selected(self):
@@ -505,51 +913,136 @@ class AppInstaller(Horizontal):
             self.log_message("[yellow]No applications selected.[/yellow]")
             return
 
+        targets = self.removal_targets(self.selected_apps)
+        if not targets:
+            self.log_message("[yellow]None of the selected applications are installed.[/yellow]")
+            return
+
         # Push confirmation screen
         def check_confirm(confirmed):
             if confirmed:
-                # Push safety screen
-                def check_safety(safe):
-                    if safe:
-                        self.query_one("#app_install_btn", Button).disabled = True
-                        self.query_one("#app_uninstall_btn", Button).disabled = True
-                        self.query_one("#install_progress", ProgressBar).display = True
-                        self.run_worker(self.run_uninstallation(list(self.selected_apps)), exclusive=True)
-                
-                self.app.push_screen(UninstallSafetyScreen(), check_safety)
+                self.confirm_uninstall(targets)
+
+        self.app.push_screen(UninstallConfirmationScreen(len(targets)), check_confirm)
+
+    def removal_targets(self, pkgs):
+        """
+        Installed packages to remove for pkgs: entries satisfied by a provider map to
+        that provider, and ones that are not installed are dropped (pacman -R would
+        abort the whole transaction on them).
+        """
+        targets = []
+        for pkg in sorted(pkgs):
+            satisfier = self.get_satisfier(pkg)
+            if satisfier is None:
+                self.log_message(f"[dim]Skipping {escape(pkg)}: not installed.[/dim]")
+            elif satisfier not in targets:
+                if satisfier != pkg:
+                    self.log_message(f"[dim]{escape(pkg)} is provided by {escape(satisfier)}; removing that.[/dim]")
+                targets.append(satisfier)
+        return targets
+
+    def confirm_uninstall(self, pkgs, graph=None):
+        """Show the safety screen for pkgs, then remove them in one batched run_uninstallation."""
+        # Show the exact -Rns impact, computed in process from the local DB
+        try:
+            plan = (graph or DependencyGraph.from_local_db()).removal_plan(pkgs)
+        except Exception:
+            plan = None
+        if plan:
+            # pacman -R aborts the whole transaction on a target that is not installed
+            pkgs = [pkg for pkg in pkgs if pkg not in plan['missing']]
+
+        def check_safety(safe):
+            if safe and pkgs:
+                self.query_one("#app_install_btn", Button).disabled = True
+                self.query_one("#app_uninstall_btn", Button).disabled = True
+                self.query_one("#app_orphans_btn", Button).disabled = True
+                self.query_one("#install_progress", ProgressBar).display = True
+                self.run_worker(self.run_uninstallation(pkgs), exclusive=True)
+        self.app.push_screen(UninstallSafetyScreen(plan), check_safety)
+
+    @on(Button.Pressed, "#app_orphans_btn")
+    def clean_orphans(self):
+        try:
+            graph = DependencyGraph.from_local_db()
+            report = graph.orphan_report()
+        except Exception as e:
+            self.log_message(f"[red]Orphan scan failed: {escape(str(e))}[/red]")
+            return
+
+        if not report['orphans'] and not report['optional_only']:
+            self.log_message("[green]No orphaned packages found.[/green]")
+            return
 
-        self.app.push_screen(UninstallConfirmationScreen(len(self.selected_apps)), check_confirm)
+        def check_selection(pkgs):
+            if pkgs:
+                self.confirm_uninstall(pkgs, graph)
+
+        self.app.push_screen(OrphanCleanupScreen(report, graph.packages), check_selection)
 
     async def run_installation(self, selected_pkgs):
         progress_bar = self.query_one("#install_progress", ProgressBar)
         status_label = self.query_one("#install_status", Label)
         
-        flat_apps = get_flat_app_list()
         pacman_apps = []
         yay_apps = []
 
         for pkg in selected_pkgs:
-            # Find app definition to know manager
-            app = next((a for a in flat_apps if a['pkg'] == pkg), None)
+            satisfier = self.get_satisfier(pkg)
+            if satisfier and satisfier != pkg:
+                # Installing the named package would conflict with its installed provider
+                self.log_message(f"[dim]Skipping {pkg}: provided by installed {satisfier}.[/dim]")
+                continue
+
+            # Find app definition to know manager (repo search results resolve to pacman)
+            app = self.get_app_data(pkg)
             if app:
                 if app['source'] == "pacman":
                     pacman_apps.append(pkg)
                 elif app['source'] == "yay" or app['source'] == "aur":
                     yay_apps.append(pkg)
 
-        total_steps = (1 if pacman_apps else 0) + (1 if yay_apps else 0)
+        offline = self.query_one("#offline_mode", Checkbox).value
+        parallel_builds = self.query_one("#parallel_builds", Checkbox).value
+        # Repo downloads and AUR sources are fetched together, without the pacman DB lock;
+        # the lock is only taken by the install steps below
+        prefetches = {}
+        if pacman_apps and not offline:
+            prefetches["repo"] = self.prefetch_repo_packages(pacman_apps)
+        if yay_apps and parallel_builds:
+            prefetches["aur"] = self.prepare_aur_builds(yay_apps)
+        elif yay_apps and self.aur_helper:
+            prefetches["aur"] = self.prefetch_aur_sources(yay_apps)
+
+        total_steps = (1 if prefetches else 0) + (1 if pacman_apps else 0) + (1 if yay_apps else 0)
         progress_bar.update(total=total_steps, progress=0)
         
         current_step = 0
 
+        prefetched = {}
+        if prefetches:
+            status_label.update("Downloading packages and AUR sources...")
+            prefetched = dict(zip(prefetches, await asyncio.gather(*prefetches.values())))
+            current_step += 1
+            progress_bar.update(progress=current_step)
+
         if pacman_apps:
-            status_label.update("Installing Pacman packages...")
-            await self.install_packages("pacman", pacman_apps)
+            if offline:
+                status_label.update("Installing from the package cache...")
+                await self.install_from_cache(pacman_apps)
+            else:
+                status_label.update("Installing Pacman packages...")
+                await self.install_packages("pacman", pacman_apps)
             current_step += 1
             progress_bar.update(progress=current_step)
         
         if yay_apps:
-            if self.aur_helper:
+            if parallel_builds:
+                status_label.update("Building AUR packages...")
+                if prefetched.get("aur"):
+                    await self.run_aur_builds(prefetched["aur"], yay_apps)
+            elif self.aur_helper:
                 status_label.update(f"Installing {self.aur_helper} packages...")
                 await self.install_packages(self.aur_helper, yay_apps)
             else:
@@ -561,16 +1054,23 @@ class AppInstaller(Horizontal):
         status_label.update("Installation complete.")
         self.query_one("#app_install_btn", Button).disabled = False
         self.query_one("#app_uninstall_btn", Button).disabled = False
+        self.query_one("#app_orphans_btn", Button).disabled = False
         progress_bar.display = False
         
-        # Refresh list to update status
-        await self.refresh_app_status()
+        # Re-sync installed state; subscribers (incl. this widget) refresh on change
+        pacman_db.get_package_state().refresh()
 
     async def run_uninstallation(self, selected_pkgs):
         progress_bar = self.query_one("#install_progress", ProgressBar)
         status_label = self.query_one("#install_status", Label)
         
+        selected_pkgs = self.removal_targets(selected_pkgs)
         if not selected_pkgs:
+            self.log_message("[yellow]Nothing to uninstall.[/yellow]")
+            self.query_one("#app_install_btn", Button).disabled = False
+            self.query_one("#app_uninstall_btn", Button).disabled = False
+            self.query_one("#app_orphans_btn", Button).disabled = False
+            progress_bar.display = False
             return
 
         progress_bar.update(total=1, progress=0)
@@ -587,20 +1087,12 @@ class AppInstaller(Horizontal):
         self.log_message(f"Running: {cmd_str}")
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+            returncode = await self.stream_command(cmd)
             
-            if stdout: self.log_message(stdout.decode())
-            if stderr: self.log_message(f"[yellow]{stderr.decode()}[/yellow]")
-            
-            if process.returncode == 0:
+            if returncode == 0:
                 self.log_message("[green]Successfully uninstalled packages.[/green]")
             else:
-                self.log_message(f"[red]Failed to uninstall packages. Code: {process.returncode}[/red]")
+                self.log_message(f"[red]Failed to uninstall packages. Code: {returncode}[/red]")
 
         except Exception as e:
             self.log_message(f"[red]Error: {str(e)}[/red]")
@@ -609,9 +1101,218 @@ class AppInstaller(Horizontal):
         status_label.update("Uninstallation complete.")
         self.query_one("#app_install_btn", Button).disabled = False
         self.query_one("#app_uninstall_btn", Button).disabled = False
+        self.query_one("#app_orphans_btn", Button).disabled = False
         progress_bar.display = False
         
-        await self.refresh_app_status()
+        pacman_db.get_package_state().refresh()
+
+    async def install_from_cache(self, packages: list[str]) -> bool:
+        """Offline install: pacman -U of the exact repo versions already in the package cache."""
+        footprint, cache = await asyncio.to_thread(preflight.plan_cached_install, packages, self.sync_index)
+        if not footprint['packages'] and not footprint['unknown']:
+            self.log_message("Selected packages are already installed.")
+            return True
+        if not cache['offline']:
+            missing = cache['missing'] + footprint['unknown']
+            self.log_message(f"[red]Offline install impossible, not in the package cache: {', '.join(missing)}[/red]")
+            return False
+
+        for cmd in preflight.offline_install_commands(cache['cached'], packages):
+            if not await self.run_command(cmd, "cached"):
+                return False
+        return True
+
+    async def prefetch_repo_packages(self, packages: list[str]) -> bool:
+        """pacman -Sw into the package cache through a private dbpath (no DB lock)."""
+        try:
+            dbpath = await asyncio.to_thread(prefetch.make_download_dbpath)
+        except OSError as e:
+            self.log_message(f"[dim]Download prefetch skipped: {escape(str(e))}[/dim]")
+            return False
+        with dbpath:
+            cmd = prefetch.download_command(packages, dbpath.name)
+            self.log_message(f"Running: {' '.join(cmd)}")
+            try:
+                returncode = await self.stream_command(cmd, prefix="download")
+            except Exception as e:
+                self.log_message(f"[dim]Download prefetch failed: {escape(str(e))}[/dim]")
+                return False
+        # Not fatal: the install step downloads whatever is still missing
+        if returncode != 0:
+            self.log_message(f"[dim]Download prefetch failed (code {returncode}); installing normally.[/dim]")
+        return returncode == 0
+
+    async def prefetch_aur_sources(self, packages: list[str]) -> bool:
+        """
+        Fetch PKGBUILDs into the AUR helper's clone directory and download their
+        sources (makepkg --verifysource), so the helper's install step finds them.
+        """
+        clone_dir = prefetch.get_aur_clone_dir(self.aur_helper)
+        if not clone_dir:
+            return False
+        try:
+            os.makedirs(clone_dir, exist_ok=True)
+            missing = [pkg for pkg in packages if not os.path.isdir(os.path.join(clone_dir, pkg))]
+            if missing:
+                await self.stream_command(prefetch.clone_command(self.aur_helper, missing), prefix="aur", cwd=clone_dir)
+        except Exception as e:
+            self.log_message(f"[dim]AUR prefetch skipped: {escape(str(e))}[/dim]")
+            return False
+
+        jobs = asyncio.Semaphore(prefetch.AUR_PREFETCH_JOBS)
+
+        async def verify(pkg):
+            pkg_dir = os.path.join(clone_dir, pkg)
+            # Split packages are cloned under their pkgbase; the helper handles those itself
+            if not os.path.isfile(os.path.join(pkg_dir, "PKGBUILD")):
+                return False
+            async with jobs:
+                try:
+                    return await self.stream_command(prefetch.verify_source_command(), prefix=pkg, cwd=pkg_dir) == 0
+                except Exception:
+                    return False
+
+        results = await asyncio.gather(*(verify(pkg) for pkg in packages))
+        return all(results)
+
+    async def prepare_aur_builds(self, packages: list[str]):
+        """
+        Resolve the AUR dependency closure and build order of packages and clone
+        their PKGBUILDs (see aur_build). Needs no pacman lock.
+        Returns the build plan, or None if it cannot be built.
+        """
+        def is_installed(name):
+            return self.get_satisfier(name) is not None
+
+        def in_repos(name):
+            return self.sync_index is not None and self.sync_index.find_provider(name) is not None
+
+        try:
+            plan = await asyncio.to_thread(
+                aur_build.resolve_builds, packages, aur.get_aur_client().info, is_installed, in_repos
+            )
+            plan['levels'] = aur_build.build_levels(plan)
+        except Exception as e:
+            self.log_message(f"[red]Cannot plan AUR builds: {escape(str(e))}[/red]")
+            return None
+        if plan['missing']:
+            self.log_message(f"[red]Not found in the repos or the AUR: {', '.join(plan['missing'])}[/red]")
+            return None
+
+        plan['bases'] = aur_build.names_by_base(plan)
+        plan['build_dir'] = aur_build.get_build_dir()
+        jobs = asyncio.Semaphore(prefetch.AUR_PREFETCH_JOBS)
+
+        async def fetch(base):
+            async with jobs:
+                cmd = aur_build.fetch_command(base, plan['build_dir'])
+                return await self.stream_command(cmd, prefix=base) == 0
+
+        try:
+            os.makedirs(plan['build_dir'], exist_ok=True)
+            fetched = await asyncio.gather(*(fetch(base) for base in plan['bases']))
+        except Exception as e:
+            self.log_message(f"[red]Cannot fetch PKGBUILDs: {escape(str(e))}[/red]")
+            return None
+        if not all(fetched):
+            self.log_message("[red]Fetching PKGBUILDs failed; AUR packages were not built.[/red]")
+            return None
+        return plan
+
+    async def run_aur_builds(self, plan, targets: list[str]) -> bool:
+        """
+        Build the planned AUR packages level by level, each level in a process pool
+        sized to CPU count and RAM, then install them in one pacman -U transaction.
+        Only packages that later levels build against are installed in between.
+        """
+        levels, bases, build_dir = plan['levels'], plan['bases'], plan['build_dir']
+        jobs = aur_build.build_jobs()
+        env = aur_build.build_env(jobs)
+        log_paths = {base: os.path.join(build_dir, f"{base}.log") for base in bases}
+
+        screen = AURBuildScreen(levels, bases, log_paths)
+        self.app.push_screen(screen)
+
+        def show(method, *args):
+            # The screen may have been closed; the builds carry on regardless
+            try:
+                getattr(screen, method)(*args)
+            except Exception:
+                pass
+
+        show("set_summary", f"{len(plan['packages'])} packages, {sum(map(len, levels))} builds in "
+                            f"{len(levels)} levels, {jobs} at a time (MAKEFLAGS={env['MAKEFLAGS']})")
+
+        if plan['repo_deps'] and not await self.run_command(aur_build.repo_deps_command(plan['repo_deps']), "build dependency"):
+            return False
+        # Build dependencies installed so far (as dependencies), reported if a later build fails
+        installed = list(plan['repo_deps'])
+
+        pool = asyncio.Semaphore(jobs)
+
+        async def build(base):
+            async with pool:
+                show("set_status", base, "[yellow]building[/yellow]")
+                start = time.perf_counter()
+                cwd = os.path.join(build_dir, base)
+                artifacts = None
+                try:
+                    with open(log_paths[base], "wb") as log:
+                        process = await asyncio.create_subprocess_exec(
+                            *aur_build.build_command(), cwd=cwd, env=env,
+                            stdout=log, stderr=asyncio.subprocess.STDOUT
+                        )
+                        returncode = await process.wait()
+                    if returncode == 0:
+                        process = await asyncio.create_subprocess_exec(
+                            *aur_build.packagelist_command(), cwd=cwd, env=env,
+                            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+                        )
+                        stdout, _ = await process.communicate()
+                        artifacts = aur_build.select_artifacts(stdout.decode().splitlines(), bases[base])
+                        if set(artifacts) != set(bases[base]):
+                            artifacts = None
+                except Exception as e:
+                    self.log_message(f"[red]Build of {escape(base)} failed: {escape(str(e))}[/red]")
+                elapsed = time.perf_counter() - start
+
+                if artifacts is None:
+                    show("set_status", base, "[red]failed[/red]", elapsed)
+                    self.log_message(f"[red]Failed to build {escape(base)} after {elapsed:.1f}s (log: {log_paths[base]})[/red]")
+                else:
+                    show("set_status", base, "[green]built[/green]", elapsed)
+                    self.log_message(f"Built {escape(base)} in {elapsed:.1f}s")
+                return artifacts
+
+        pending = {}
+        for i, level in enumerate(levels):
+            results = await asyncio.gather(*(build(base) for base in level))
+            if any(artifacts is None for artifacts in results):
+                for base in (b for later in levels[i + 1:] for b in later):
+                    show("set_status", base, "[dim]skipped[/dim]")
+                if installed:
+                    self.log_message("[red]AUR builds failed; these build dependencies were already "
+                                     f"installed and are left in place: {escape(', '.join(sorted(installed)))}[/red]")
+                else:
+                    self.log_message("[red]AUR builds failed; nothing was installed from them.[/red]")
+                return False
+            for artifacts in results:
+                pending.update(artifacts)
+
+            needed = {dep for later in levels[i + 1:] for base in later for name in bases[base] for dep in plan['deps_of'][name]}
+            now = {name: path for name, path in pending.items() if name in needed}
+            for cmd in aur_build.install_commands(now, targets):
+                if not await self.run_command(cmd, "AUR build dependency"):
+                    return False
+            for name in now:
+                del pending[name]
+            installed.extend(now)
+
+        for cmd in aur_build.install_commands(pending, targets):
+            if not await self.run_command(cmd, "AUR"):
+                return False
+        show("set_summary", f"All {sum(map(len, levels))} builds done.")
+        return True
 
     async def install_packages(self, manager: str, packages: list[str]) -> bool:
         cmd = []
@@ -620,35 +1321,67 @@ class AppInstaller(Horizontal):
         else:
             # Assuming AUR helper (yay, paru, etc.)
             cmd = [manager, "-S", "--noconfirm"] + packages
+        return await self.run_command(cmd, manager)
 
+    async def run_command(self, cmd: list[str], label: str) -> bool:
+        """Run an install command, logging its output. Returns True on success."""
         cmd_str = " ".join(cmd)
         self.log_message(f"Running: {cmd_str}")
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if stdout:
-                self.log_message(stdout.decode())
-            if stderr:
-                self.log_message(f"Error/Warning: {stderr.decode()}")
+            returncode = await self.stream_command(cmd)
                 
-            if process.returncode == 0:
-                self.log_message(f"Successfully installed {manager} packages.")
+            if returncode == 0:
+                self.log_message(f"Successfully installed {label} packages.")
                 return True
             else:
-                self.log_message(f"Failed to install {manager} packages. Return code: {process.returncode}")
+                self.log_message(f"Failed to install {label} packages. Return code: {returncode}")
                 return False
 
         except Exception as e:
             self.log_message(f"Exception during installation: {str(e)}")
             return False
 
+    async def stream_command(self, cmd: list[str], prefix: str = None, cwd: str = None) -> int:
+        """
+        Run cmd, logging its stdout and stderr (yellow) line by line while it runs.
+        Lines are batched into one log write per LOG_FLUSH_INTERVAL or LOG_FLUSH_LINES;
+        a prefix tells apart the output of commands running at the same time.
+        Returns the exit code.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd
+        )
+        lead = f"[dim]{escape(prefix)}:[/dim] " if prefix else ""
+        batch = []
+
+        def flush():
+            if batch:
+                self.log_message("\n".join(batch))
+                batch.clear()
+
+        async def pump(stream, style):
+            async for line in read_lines(stream):
+                batch.append(lead + (f"[{style}]{escape(line)}[/{style}]" if style else escape(line)))
+                if len(batch) >= LOG_FLUSH_LINES:
+                    flush()
+
+        async def tick():
+            while True:
+                await asyncio.sleep(LOG_FLUSH_INTERVAL)
+                flush()
+
+        ticker = asyncio.create_task(tick())
+        try:
+            await asyncio.gather(pump(process.stdout, None), pump(process.stderr, "yellow"))
+        finally:
+            ticker.cancel()
+            flush()
+        return await process.wait()
+
     def log_message(self, message: str):
         # Local log
         try:
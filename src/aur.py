@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import threading
+import urllib.parse
+import urllib.request
+
+import cache
+import pacman_db
+import sync_db
+from vercmp import vercmp
+
+AUR_RPC_URL = "https://aur.archlinux.org/rpc/v5/info"
+# Overrides the endpoint (mirrors, or a local stand-in server for tests)
+AUR_RPC_ENV = "GOATD_AUR_RPC"
+# Names per request; the AUR caps multiinfo results at 5000
+RPC_MAX_ARGS = 1000
+CACHE_TTL = 3600
+REQUEST_TIMEOUT = 10
+# Bump when record_from_rpc gains fields, so cached records are re-fetched
+RECORD_VERSION = 2
+
+def get_rpc_url():
+    return os.environ.get(AUR_RPC_ENV) or AUR_RPC_URL
+
+def foreign_packages(local_packages, sync_index):
+    """
+    Installed packages not found in any sync repo (what `pacman -Qm` lists).
+    Empty without sync data: every installed package would look foreign.
+    """
+    if not sync_index.packages:
+        return {}
+    return {name: pkg for name, pkg in local_packages.items() if name not in sync_index}
+
+def get_foreign_packages():
+    return foreign_packages(pacman_db.get_package_state().records(), sync_db.get_sync_index())
+
+def record_from_rpc(result):
+    return {
+        "name": result.get("Name", ""),
+        "version": result.get("Version", ""),
+        "description": result.get("Description") or "",
+        "out_of_date": result.get("OutOfDate"),
+        "last_modified": result.get("LastModified"),
+        "pkgbase": result.get("PackageBase") or result.get("Name", ""),
+        "depends": result.get("Depends") or [],
+        "makedepends": result.get("MakeDepends") or [],
+        "checkdepends": result.get("CheckDepends") or [],
+    }
+
+class AURClient:
+    """
+    Batched client for the AUR RPC `info` endpoint.
+
+    All uncached names go out as one multi-package POST (split only beyond
+    RPC_MAX_ARGS). Responses, including names the AUR does not know, are cached
+    on disk for `ttl` seconds, keyed by the endpoint URL and RECORD_VERSION.
+    """
+
+    def __init__(self, url=None, cache_dir=None, ttl=CACHE_TTL, timeout=REQUEST_TIMEOUT):
+        self.url = url or get_rpc_url()
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self._entries = None # name -> (fetched_at, record or None)
+        self._lock = threading.Lock()
+
+    @property
+    def cache_key(self):
+        return (self.url, RECORD_VERSION)
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, "info.cache") if self.cache_dir else None
+
+    def _load_entries(self):
+        if self._entries is None:
+            entries = cache.load(self.cache_path, self.cache_key) if self.cache_path else None
+            self._entries = entries or {}
+        return self._entries
+
+    def request(self, names):
+        """Performs one RPC info request. Returns the list of result records."""
+        data = urllib.parse.urlencode([("arg[]", name) for name in names]).encode()
+        req = urllib.request.Request(self.url, data=data, headers={"Accept": "application/json"})
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+        if payload.get("type") == "error":
+            raise OSError(f"AUR RPC error: {payload.get('error')}")
+        return [record_from_rpc(result) for result in payload.get("results", [])]
+
+    def info(self, names):
+        """
+        Returns {name: record} for the names that exist in the AUR.
+        Network errors propagate; already cached names are never re-requested.
+        """
+        with self._lock:
+            entries = self._load_entries()
+            now = time.time()
+            stale = sorted({n for n in names if n not in entries or now - entries[n][0] > self.ttl})
+
+            for i in range(0, len(stale), RPC_MAX_ARGS):
+                chunk = stale[i:i + RPC_MAX_ARGS]
+                found = {record["name"]: record for record in self.request(chunk)}
+                for name in chunk:
+                    entries[name] = (now, found.get(name))
+
+            if stale and self.cache_path:
+                cache.save(self.cache_path, self.cache_key, entries)
+
+            return {n: entries[n][1] for n in names if n in entries and entries[n][1]}
+
+def find_aur_updates(foreign, aur_info):
+    """Same records as updates.find_updates for foreign packages with a newer AUR version."""
+    updates = []
+    for name, pkg in foreign.items():
+        record = aur_info.get(name)
+        if not record or vercmp(record["version"], pkg["version"]) <= 0:
+            continue
+        updates.append({
+            "name": name,
+            "repo": "aur",
+            "local_version": pkg["version"],
+            "new_version": record["version"],
+            # Built locally; there is no prebuilt download size to report
+            "download_size": 0,
+            "size_delta": 0,
+        })
+    updates.sort(key=lambda u: u["name"])
+    return updates
+
+_CLIENT = None
+
+def get_aur_client():
+    """Returns the shared AURClient, cached under $XDG_CACHE_HOME/goatd/aur."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.url != get_rpc_url():
+        _CLIENT = AURClient(cache_dir=cache.get_cache_dir("aur"))
+    return _CLIENT
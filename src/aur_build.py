@@ -0,0 +1,168 @@
+import os
+
+import cache
+import pkg_cache
+from dep_graph import dep_name
+
+AUR_GIT_URL = "https://aur.archlinux.org/{}.git"
+# Memory budgeted per concurrent makepkg run
+BUILD_RAM = 2 * 1024 ** 3
+MEMINFO_PATH = "/proc/meminfo"
+
+def get_build_dir():
+    """Returns $XDG_CACHE_HOME/goatd/aur/build, where PKGBUILDs are cloned and built."""
+    return cache.get_cache_dir("aur", "build")
+
+def aur_dep_names(record):
+    """Names of everything a PKGBUILD needs installed to build: depends, makedepends and checkdepends."""
+    deps = record.get("depends", []) + record.get("makedepends", []) + record.get("checkdepends", [])
+    return list(dict.fromkeys(dep_name(dep) for dep in deps))
+
+def resolve_builds(targets, info, is_installed, in_repos):
+    """
+    Walks the AUR dependency closure of `targets`.
+
+    info(names) returns {name: AUR record} (aur.AURClient.info); it is called
+    once per dependency depth. is_installed(name) and in_repos(name) tell which
+    dependencies are already satisfied or come from the sync repos.
+
+    Returns a dict:
+        packages: {name: record} AUR packages to build (targets + AUR deps)
+        deps_of: {name: set of AUR packages it needs installed first}
+        repo_deps: sorted repo packages to install before building
+        missing: sorted names found neither installed, in the repos nor in the AUR
+    """
+    packages = {}
+    deps_of = {}
+    repo_deps = set()
+    missing = set()
+    pending = list(dict.fromkeys(targets))
+    while pending:
+        found = info(pending)
+        queued = set()
+        for name in pending:
+            record = found.get(name)
+            if record is None:
+                missing.add(name)
+                continue
+            packages[name] = record
+            aur_deps = set()
+            for dep in aur_dep_names(record):
+                if dep == name:
+                    continue
+                if dep in packages or dep in pending or dep in queued:
+                    aur_deps.add(dep)
+                elif is_installed(dep):
+                    continue
+                elif in_repos(dep):
+                    repo_deps.add(dep)
+                else:
+                    aur_deps.add(dep)
+                    queued.add(dep)
+            deps_of[name] = aur_deps
+        pending = sorted(queued - set(packages) - missing)
+
+    # Edges to names the AUR did not know are reported as missing instead
+    for name in deps_of:
+        deps_of[name] &= set(packages)
+    return {
+        "packages": packages,
+        "deps_of": deps_of,
+        "repo_deps": sorted(repo_deps),
+        "missing": sorted(missing),
+    }
+
+def build_levels(plan):
+    """
+    Orders the builds by pkgbase (split packages build once) into levels: every
+    base only needs bases from earlier levels installed, so the bases of one
+    level can build concurrently. Raises ValueError on a dependency cycle.
+    """
+    base_of = {name: record["pkgbase"] for name, record in plan["packages"].items()}
+    needs = {base: set() for base in base_of.values()}
+    for name, deps in plan["deps_of"].items():
+        needs[base_of[name]] |= {base_of[dep] for dep in deps} - {base_of[name]}
+
+    levels = []
+    done = set()
+    while len(done) < len(needs):
+        level = sorted(base for base, deps in needs.items() if base not in done and deps <= done)
+        if not level:
+            cycle = sorted(base for base in needs if base not in done)
+            raise ValueError(f"AUR dependency cycle between: {', '.join(cycle)}")
+        levels.append(level)
+        done.update(level)
+    return levels
+
+def names_by_base(plan):
+    """{pkgbase: sorted package names to take from its build}."""
+    bases = {}
+    for name, record in plan["packages"].items():
+        bases.setdefault(record["pkgbase"], []).append(name)
+    return {base: sorted(names) for base, names in bases.items()}
+
+def read_mem_available(meminfo_path=MEMINFO_PATH):
+    """MemAvailable in bytes, or None if /proc/meminfo is unreadable."""
+    try:
+        with open(meminfo_path, "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def build_jobs(cpu_count=None, mem_available=None, ram_per_build=BUILD_RAM):
+    """Concurrent builds: one per CPU, capped by available RAM (ram_per_build each)."""
+    cpus = cpu_count or os.cpu_count() or 1
+    if mem_available is None:
+        mem_available = read_mem_available()
+    jobs = cpus if mem_available is None else min(cpus, mem_available // ram_per_build)
+    return max(1, jobs)
+
+def build_env(jobs, cpu_count=None, environ=None):
+    """Environment for makepkg: the CPUs are split between the concurrent builds via MAKEFLAGS."""
+    cpus = cpu_count or os.cpu_count() or 1
+    env = dict(os.environ if environ is None else environ)
+    env["MAKEFLAGS"] = f"-j{max(1, cpus // jobs)}"
+    return env
+
+def fetch_command(pkgbase, build_dir):
+    """Clones the PKGBUILD repo, or fast-forwards an existing clone."""
+    path = os.path.join(build_dir, pkgbase)
+    if os.path.isdir(os.path.join(path, ".git")):
+        return ["git", "-C", path, "pull", "--ff-only", "-q"]
+    return ["git", "clone", "-q", AUR_GIT_URL.format(pkgbase), path]
+
+def build_command():
+    """Builds in the PKGBUILD directory. No -s: dependencies are installed beforehand, under the lock."""
+    return ["makepkg", "--noconfirm", "--force", "--clean"]
+
+def packagelist_command():
+    return ["makepkg", "--packagelist"]
+
+def select_artifacts(paths, names):
+    """{name: path} of the built package files for `names` (debug and other split packages are skipped)."""
+    artifacts = {}
+    for path in paths:
+        parsed = pkg_cache.parse_pkg_filename(os.path.basename(path.strip()))
+        if parsed and parsed[0] in names:
+            artifacts[parsed[0]] = path.strip()
+    return artifacts
+
+def repo_deps_command(repo_deps):
+    return ["sudo", "pacman", "-S", "--needed", "--noconfirm", "--asdeps"] + list(repo_deps)
+
+def install_commands(artifacts, targets):
+    """
+    One `pacman -U` transaction for all built packages, then marks the ones
+    that were not selected as dependencies.
+    """
+    if not artifacts:
+        return []
+    names = sorted(artifacts)
+    cmds = [["sudo", "pacman", "-U", "--noconfirm"] + [artifacts[name] for name in names]]
+    deps = [name for name in names if name not in targets]
+    if deps:
+        cmds.append(["sudo", "pacman", "-D", "--asdeps"] + deps)
+    return cmds
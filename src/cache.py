@@ -0,0 +1,48 @@
+import os
+import mmap
+import pickle
+import tempfile
+
+# Bump when the layout of cached records changes
+CACHE_VERSION = 1
+
+def get_cache_dir(*parts):
+    """Returns $XDG_CACHE_HOME/goatd[/parts...] (defaults to ~/.cache/goatd)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "goatd", *parts)
+
+def load(path, key):
+    """
+    Loads a cache file written by save() if it was stored under the same key.
+    The file is mmapped so the pickle is decoded straight from the page cache.
+    Returns None on a miss, a stale key or a corrupt file.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                version, stored_key, data = pickle.loads(mm)
+    except Exception:
+        return None
+
+    if version != CACHE_VERSION or stored_key != key:
+        return None
+    return data
+
+def save(path, key, data):
+    """Atomically writes data to path under key. Failures are ignored (cache only)."""
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((CACHE_VERSION, key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        return False
+    return True
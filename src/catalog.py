@@ -0,0 +1,240 @@
+import os
+import re
+import json
+from types import MappingProxyType
+
+import cache
+
+try:
+    import tomllib
+except ImportError: # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+AUR_SOURCES = ("yay", "aur")
+SOURCES = ("pacman",) + AUR_SOURCES
+# makepkg's rule for pkgname: lowercase alphanumerics and @._+-, not starting with - or .
+PKG_NAME = re.compile(r"^[a-z0-9@_+][a-z0-9@._+-]*$")
+# firewalld port spec: a port or a port range, and a protocol
+PORT_SPEC = re.compile(r"^\d+(-\d+)?/(tcp|udp)$")
+
+# Catalog layers in increasing priority (the built-in APPS_CATEGORIES sits below them)
+SYSTEM_CATALOG_DIR = "/etc/goatd/catalog.d"
+CATALOG_EXTENSIONS = (".toml", ".json")
+
+class AppRecord:
+    """A catalog entry. Immutable; use to_dict() for a mutable copy."""
+
+    __slots__ = ("id", "pkg", "name", "category", "source", "tier", "description", "ports")
+
+    def __init__(self, name, category, details):
+        setattr_ = object.__setattr__
+        setattr_(self, "id", details["pkg"])
+        setattr_(self, "pkg", details["pkg"])
+        setattr_(self, "name", name)
+        setattr_(self, "category", category)
+        setattr_(self, "source", details["source"])
+        setattr_(self, "tier", details.get("tier", ""))
+        setattr_(self, "description", details.get("description", ""))
+        setattr_(self, "ports", tuple(details.get("ports", ())))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f"AppRecord({self.pkg!r}, {self.category!r})"
+
+    @property
+    def is_aur(self):
+        return self.source in AUR_SOURCES
+
+    def to_dict(self):
+        """Dict in the shape the screens and installers use (ports only when set)."""
+        data = {
+            "id": self.id,
+            "pkg": self.pkg,
+            "name": self.name,
+            "category": self.category,
+            "source": self.source,
+            "tier": self.tier,
+            "description": self.description,
+        }
+        if self.ports:
+            data["ports"] = list(self.ports)
+        return data
+
+class Catalog:
+    """
+    The app catalog, built once from a {category: {name: details}} mapping.
+
+    Records keep catalog order. Lookups by pkg, category and source are dict
+    indexes, so per-row checks during refreshes are O(1).
+    """
+
+    def __init__(self, categories):
+        records = []
+        by_pkg = {}
+        by_category = {}
+        by_source = {}
+        for category, apps in categories.items():
+            for name, details in apps.items():
+                record = AppRecord(name, category, details)
+                records.append(record)
+                # First entry wins if a pkg is listed in several categories
+                by_pkg.setdefault(record.pkg, record)
+                by_category.setdefault(category, []).append(record)
+                by_source.setdefault(record.source, []).append(record)
+
+        self.records = tuple(records)
+        self.by_pkg = MappingProxyType(by_pkg)
+        self.by_category = MappingProxyType({k: tuple(v) for k, v in by_category.items()})
+        self.by_source = MappingProxyType({k: tuple(v) for k, v in by_source.items()})
+        self.pkgs = frozenset(by_pkg)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, pkg):
+        return pkg in self.by_pkg
+
+    def get(self, pkg):
+        return self.by_pkg.get(pkg)
+
+    def categories(self):
+        return list(self.by_category)
+
+    def in_category(self, category):
+        return self.by_category.get(category, ())
+
+    def with_source(self, *sources):
+        return [record for source in sources for record in self.by_source.get(source, ())]
+
+    def with_ports(self):
+        return [record for record in self.records if record.ports]
+
+def get_user_catalog_dir():
+    """Returns $XDG_CONFIG_HOME/goatd/catalog.d (defaults to ~/.config/goatd/catalog.d)."""
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "goatd", "catalog.d")
+
+def get_catalog_dirs():
+    return [SYSTEM_CATALOG_DIR, get_user_catalog_dir()]
+
+def list_catalog_files(dirs):
+    """Returns catalog files in priority order: by directory, then by file name."""
+    files = []
+    for directory in dirs:
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith(CATALOG_EXTENSIONS) and (tomllib or not name.endswith(".toml")):
+                files.append(os.path.join(directory, name))
+    return files
+
+def valid_ports(ports):
+    """True for a list of firewalld port specs such as "8080/tcp" or "1714-1764/udp"."""
+    return isinstance(ports, list) and all(
+        isinstance(port, str) and PORT_SPEC.match(port) is not None for port in ports
+    )
+
+def valid_entry(details):
+    """
+    True for a details dict with a known source, a valid package name, string
+    tier and description, and valid ports (all optional fields may be absent).
+    """
+    return (
+        isinstance(details, dict)
+        and details.get("source") in SOURCES
+        and isinstance(details.get("pkg"), str)
+        and PKG_NAME.match(details["pkg"]) is not None
+        and isinstance(details.get("tier", ""), str)
+        and isinstance(details.get("description", ""), str)
+        and valid_ports(details.get("ports", []))
+    )
+
+def read_catalog_file(path):
+    """
+    Reads one catalog file. Same shape as APPS_CATEGORIES:
+
+        ["Internal Tools"."Acme VPN"]
+        pkg = "acme-vpn"
+        source = "pacman"
+        tier = "Required"
+        description = "Company VPN client."
+
+    Entries without a valid pkg name or a known source (pacman, yay, aur), and
+    entries with a non-string name, tier or description or with malformed ports,
+    are dropped. Returns {} if the file is unreadable.
+    """
+    try:
+        if path.endswith(".toml"):
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    categories = {}
+    if not isinstance(data, dict):
+        return categories
+    for category, apps in data.items():
+        if not isinstance(apps, dict):
+            continue
+        for name, details in apps.items():
+            if isinstance(name, str) and valid_entry(details):
+                categories.setdefault(category, {})[name] = details
+    return categories
+
+def merge_categories(layers):
+    """Merges category layers; later layers override entries with the same category and name."""
+    merged = {}
+    for layer in layers:
+        for category, apps in layer.items():
+            merged.setdefault(category, {}).update(apps)
+    return merged
+
+def files_key(files):
+    """Cache key of a set of catalog files: path, mtime and size of each."""
+    key = []
+    for path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        key.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+def load_external_categories(dirs=None, cache_path=None):
+    """
+    Loads and merges the system and user catalog files. The merged result is
+    cached (see cache.py) under the mtimes of the files, so unchanged catalogs
+    are never re-parsed.
+    """
+    files = list_catalog_files(get_catalog_dirs() if dirs is None else dirs)
+    if not files:
+        return {}
+    key = files_key(files)
+    if cache_path:
+        categories = cache.load(cache_path, key)
+        if categories is not None:
+            return categories
+
+    categories = merge_categories(read_catalog_file(path) for path in files)
+    if cache_path:
+        cache.save(cache_path, key, categories)
+    return categories
+
+def load_catalog(builtin, dirs=None, cache_path=None):
+    """Builds the Catalog from the built-in categories overlaid with the external catalogs."""
+    if cache_path is None and dirs is None:
+        cache_path = os.path.join(cache.get_cache_dir("catalog"), "catalog.cache")
+    return Catalog(merge_categories([builtin, load_external_categories(dirs, cache_path)]))
@@ -1,13 +1,18 @@
+import os
 import shutil
+import asyncio
 import subprocess
 from textual.app import ComposeResult
 from textual.widgets import SelectionList, Button, RichLog, Label, DataTable
 from textual.containers import Vertical, Horizontal, Grid, ScrollableContainer
 from textual.screen import ModalScreen
-from textual import on
+from textual import on, work
 from rich.markup import escape
-from goatfetch_ui import GoatFetchScreen, TaskDescriptionScreen, FirewallSelectionScreen
-from apps import get_flat_app_list
+from goatfetch_ui import GoatFetchScreen, TaskDescriptionScreen, FirewallSelectionScreen, UpdatesScreen
+from apps import get_catalog
+import pacman_db
+import updates
+import pkg_cache
 
 FIREWALL_SELECTIONS = {}
 
@@ -20,51 +25,35 @@ def detect_aur_helper():
     return None
 
 def get_installed_packages_sync():
-    try:
-        res = subprocess.run(["pacman", "-Qq"], capture_output=True, text=True)
-        if res.returncode == 0:
-            return set(res.stdout.splitlines())
-    except Exception:
-        pass
-    return set()
+    return pacman_db.get_installed_packages()
 
 def get_firewall_apps_data():
     """Returns a list of detected apps with port requirements."""
     installed_packages = get_installed_packages_sync()
-    flat_apps = get_flat_app_list()
-    
-    detected_apps = []
-    
-    for app in flat_apps:
-        if 'ports' in app and app['pkg'] in installed_packages:
-            detected_apps.append(app)
-            
-    return detected_apps
+    return [app.to_dict() for app in get_catalog().with_ports() if app.pkg in installed_packages]
 
 def get_firewall_details():
     """Returns a string representation of firewall details for display."""
     installed_packages = get_installed_packages_sync()
-    flat_apps = get_flat_app_list()
     
     details = []
     found_any = False
     
     details.append("[bold]Firewall Port Analysis:[/bold]")
     
-    for app in flat_apps:
-        if 'ports' in app:
-            if app['pkg'] in installed_packages:
-                found_any = True
-                # Check if disabled by user
-                is_enabled = FIREWALL_SELECTIONS.get(app['pkg'], True)
-                status_color = "green" if is_enabled else "yellow"
-                status_text = "Enabled" if is_enabled else "Disabled by User"
-                
-                ports_str = ", ".join(app['ports'])
-                details.append(f"[{status_color}]Detected: {app['name']} ({status_text})[/{status_color}]")
-                details.append(f"  - Ports: {ports_str}")
-            else:
-                details.append(f"[dim]Not Detected: {app['name']} (would open {', '.join(app['ports'])})[/dim]")
+    for app in get_catalog().with_ports():
+        if app.pkg in installed_packages:
+            found_any = True
+            # Check if disabled by user
+            is_enabled = FIREWALL_SELECTIONS.get(app.pkg, True)
+            status_color = "green" if is_enabled else "yellow"
+            status_text = "Enabled" if is_enabled else "Disabled by User"
+            
+            ports_str = ", ".join(app.ports)
+            details.append(f"[{status_color}]Detected: {app.name} ({status_text})[/{status_color}]")
+            details.append(f"  - Ports: {ports_str}")
+        else:
+            details.append(f"[dim]Not Detected: {app.name} (would open {', '.join(app.ports)})[/dim]")
                 
     if not found_any:
         details.append("\n[yellow]No apps detected that require special port configurations.[/yellow]")
@@ -73,20 +62,19 @@ def get_firewall_details():
 
 def apply_firewall():
     installed_packages = get_installed_packages_sync()
-    flat_apps = get_flat_app_list()
 
     commands = []
     detected_msg = []
     
-    for app in flat_apps:
-        if app['pkg'] in installed_packages and 'ports' in app:
+    for app in get_catalog().with_ports():
+        if app.pkg in installed_packages:
             # Check if user deselected this app in Firewall Selection Screen
-            if not FIREWALL_SELECTIONS.get(app['pkg'], True):
-                detected_msg.append(f"[dim]Skipping {app['name']} (User disabled)[/dim]")
+            if not FIREWALL_SELECTIONS.get(app.pkg, True):
+                detected_msg.append(f"[dim]Skipping {app.name} (User disabled)[/dim]")
                 continue
 
-            detected_msg.append(f"Detected {app['name']}. Opening ports: {', '.join(app['ports'])}")
-            for port in app['ports']:
+            detected_msg.append(f"Detected {app.name}. Opening ports: {', '.join(app.ports)}")
+            for port in app.ports:
                 commands.append(f"sudo firewall-cmd --permanent --zone=public --add-port={port}")
 
     if not commands:
@@ -124,6 +112,13 @@ def apply_lm_sensors():
     except Exception as e:
         return f"Error running sensors-detect: {e}"
 
+def get_catalog_packages():
+    return get_catalog().pkgs
+
+def preview_system_update():
+    """Lists what `pacman -Syu` will upgrade and download, from the offline DBs."""
+    return updates.format_updates(updates.get_pending_updates(), highlight=get_catalog_packages())
+
 def apply_system_update():
     try:
         res = subprocess.run(["sudo", "pacman", "-Syu", "--noconfirm"], check=True, capture_output=True, text=True)
@@ -131,6 +126,24 @@ def apply_system_update():
     except Exception as e:
         return f"Error updating system: {e}"
 
+def plan_cache_prune():
+    state = pacman_db.get_package_state()
+    state.installed() # versions() is derived from the (refreshed) package set
+    return pkg_cache.plan_prune(pkg_cache.index_cache(), state.versions())
+
+def preview_cache_prune():
+    return pkg_cache.format_prune_plan(plan_cache_prune())
+
+def apply_cache_prune():
+    try:
+        plan = plan_cache_prune()
+        if not plan['remove']:
+            return pkg_cache.format_prune_plan(plan)
+        pkg_cache.delete_files(plan['remove'])
+        return f"Package cache pruned. Reclaimed {pacman_db.format_size(plan['freed'])}."
+    except Exception as e:
+        return f"Error pruning package cache: {e}"
+
 def apply_printer_setup():
     try:
         # Install cups if not present (basic check)
@@ -153,9 +166,24 @@ CONFIGS = [
         "description": "Updates all system packages.",
         "steps": ["Execute `sudo pacman -Syu`"],
         "check": lambda: True,
+        "preview": preview_system_update,
         "apply": apply_system_update,
         "default": True
     },
+    {
+        "id": "cache_prune",
+        "name": "Prune Package Cache",
+        "description": f"Keeps the newest {pkg_cache.DEFAULT_KEEP} versions of each package in the pacman cache (plus the installed one) and deletes the rest.",
+        "steps": [
+            f"Index `{pkg_cache.PKG_CACHE_DIR}`",
+            f"Keep the newest {pkg_cache.DEFAULT_KEEP} versions per package and the installed version",
+            "Delete the remaining package files and signatures in one `sudo rm` batch"
+        ],
+        "check": lambda: os.path.isdir(pkg_cache.PKG_CACHE_DIR),
+        "preview": preview_cache_prune,
+        "apply": apply_cache_prune,
+        "default": False
+    },
     {
         "id": "firewall_gaming",
         "name": "Firewall",
@@ -279,6 +307,15 @@ class SystemConfig(Horizontal):
                     config['description'],
                     steps=config.get('steps')
                 ))
+                if row_key == "system_update":
+                    # Opens over the description once loaded; closing it goes back there
+                    self.show_pending_updates()
+
+    @work(exclusive=True, group="pending_updates")
+    async def show_pending_updates(self):
+        # Reads the local DB and the sync databases off the event loop
+        pending = await asyncio.to_thread(updates.get_pending_updates)
+        self.app.push_screen(UpdatesScreen(pending, get_catalog_packages()))
 
     @on(Button.Pressed, "#btn_config_select_all")
     def select_all_configs(self):
@@ -322,6 +359,8 @@ class SystemConfig(Horizontal):
                     self.log_message(f"Launched interactive configuration for {config['name']}.")
                 else:
                     try:
+                        if config.get("preview"):
+                            self.log_message(config['preview']())
                         result = config['apply']()
                         # Escape the result to prevent accidental markup interpretation
                         self.log_message(escape(str(result)))
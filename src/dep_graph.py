@@ -0,0 +1,144 @@
+import re
+
+import pacman_db
+
+# Splits "foo>=1.0" / "libfoo.so=1-64" / "foo: optional reason" into the bare name
+DEP_NAME = re.compile(r"^([^<>=:\s]+)")
+
+def dep_name(dep):
+    """Returns the package/virtual name of a depends, provides or optdepends entry."""
+    match = DEP_NAME.match(dep.strip())
+    return match.group(1) if match else dep.strip()
+
+class DependencyGraph:
+    """
+    In-memory dependency graph of the installed packages.
+
+    Built once from the local DB records (see pacman_db.read_local_db). Dependencies
+    are resolved through provides, so virtual names such as "sh" or "libfoo.so"
+    map to the installed packages that satisfy them. Version constraints are not
+    evaluated: an installed provider is taken to satisfy the dependency.
+    """
+
+    def __init__(self, packages):
+        self.packages = packages
+        self.providers = {} # name or virtual name -> set of installed packages
+        self.depends = {} # pkg -> {dep name -> set of satisfiers}
+        self.required_by = {} # pkg -> set of packages depending on it
+        self.optional_for = {} # pkg -> set of packages listing it in optdepends
+
+        for name, pkg in packages.items():
+            self.providers.setdefault(name, set()).add(name)
+            for provide in pkg.get("provides", []):
+                self.providers.setdefault(dep_name(provide), set()).add(name)
+
+        for name, pkg in packages.items():
+            resolved = {}
+            for dep in pkg.get("depends", []):
+                dname = dep_name(dep)
+                satisfiers = self.providers.get(dname, set())
+                resolved[dname] = satisfiers
+                for provider in satisfiers:
+                    self.required_by.setdefault(provider, set()).add(name)
+            self.depends[name] = resolved
+
+            for opt in pkg.get("optdepends", []):
+                for provider in self.providers.get(dep_name(opt), ()):
+                    self.optional_for.setdefault(provider, set()).add(name)
+
+    @classmethod
+    def from_local_db(cls):
+        """Builds the graph from the shared installed-package cache."""
+        return cls(pacman_db.get_package_state().records())
+
+    def satisfiers(self, dep):
+        return self.providers.get(dep_name(dep), set())
+
+    def _unneeded_deps(self, removal):
+        """Grows removal with dependencies no longer needed (the -s in -Rns)."""
+        queue = list(removal)
+        while queue:
+            name = queue.pop()
+            for satisfiers in self.depends.get(name, {}).values():
+                for dep in satisfiers:
+                    if dep in removal:
+                        continue
+                    # Explicitly installed packages are kept (that would need -Rss)
+                    if self.packages[dep].get("reason") != pacman_db.REASON_DEPEND:
+                        continue
+                    if self.required_by.get(dep, set()) <= removal:
+                        removal.add(dep)
+                        queue.append(dep)
+        return removal
+
+    def removal_plan(self, targets, recursive=True):
+        """
+        Computes what `pacman -R[n]s <targets>` would do without running it.
+
+        Returns a dict:
+            remove: sorted packages that would be removed (targets + unneeded deps)
+            dependencies: the subset of `remove` pulled in as unneeded deps
+            missing: targets that are not installed
+            freed: total installed size of `remove` in bytes
+            breaks: {remaining pkg: [deps left unsatisfied]} (pacman would refuse)
+            optional: {remaining pkg: [optional deps lost]}
+        """
+        missing = sorted(t for t in targets if t not in self.packages)
+        removal = {t for t in targets if t in self.packages}
+        if recursive:
+            self._unneeded_deps(removal)
+
+        breaks = {}
+        optional = {}
+        for name in removal:
+            for dependent in self.required_by.get(name, ()):
+                if dependent in removal:
+                    continue
+                for dname, satisfiers in self.depends[dependent].items():
+                    if satisfiers and satisfiers <= removal:
+                        lost = breaks.setdefault(dependent, [])
+                        if dname not in lost:
+                            lost.append(dname)
+            for dependent in self.optional_for.get(name, ()):
+                if dependent not in removal:
+                    lost = optional.setdefault(dependent, [])
+                    if name not in lost:
+                        lost.append(name)
+
+        return {
+            "remove": sorted(removal),
+            "dependencies": sorted(removal.difference(targets)),
+            "missing": missing,
+            "freed": sum(self.packages[name].get("size", 0) for name in removal),
+            "breaks": {k: sorted(v) for k, v in sorted(breaks.items())},
+            "optional": {k: sorted(v) for k, v in sorted(optional.items())},
+        }
+
+    def orphan_report(self):
+        """
+        Finds packages installed as dependencies that nothing depends on anymore.
+
+        Returns a dict:
+            orphans: sorted packages no installed package needs (pacman -Qdtt)
+            optional_only: {pkg: [packages listing it in optdepends]} for
+                dependencies that are only kept around as optional
+            dependencies: further deps -Rns would take with all of the above
+            freed: total installed size reclaimable by removing all of them
+        """
+        orphans = []
+        optional_only = {}
+        for name, pkg in self.packages.items():
+            if pkg.get("reason") != pacman_db.REASON_DEPEND or self.required_by.get(name):
+                continue
+            if self.optional_for.get(name):
+                optional_only[name] = sorted(self.optional_for[name])
+            else:
+                orphans.append(name)
+
+        plan = self.removal_plan(orphans + list(optional_only))
+        return {
+            "orphans": sorted(orphans),
+            "optional_only": dict(sorted(optional_only.items())),
+            "dependencies": plan["dependencies"],
+            "freed": plan["freed"],
+        }
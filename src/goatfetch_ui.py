@@ -1,5 +1,6 @@
 import shutil
 import subprocess
+from collections import deque
 from textual.screen import Screen, ModalScreen
 from textual.containers import Container, Vertical, Horizontal, ScrollableContainer
 from textual.widgets import Header, Footer, Static, Button, Select, Checkbox, Input, Label, RichLog, DataTable
@@ -7,6 +8,8 @@ from textual.app import ComposeResult
 from textual import on
 from rich.text import Text
 from goatfetch_logic import GoatFetchManager
+from pacman_db import format_size
+from updates import summarize_updates, format_size_delta
 
 class FastFetchMissingScreen(ModalScreen):
     """Screen shown when FastFetch is missing."""
@@ -258,6 +261,164 @@ class FirewallSelectionScreen(ModalScreen):
     def close_screen(self):
         self.dismiss()
 
+class UpdatesScreen(ModalScreen):
+    """Pending upgrades from the local DB vs. the synced repos (see updates.find_updates)."""
+    BINDINGS = [("escape", "dismiss", "Close")]
+
+    def __init__(self, updates, highlight=()):
+        super().__init__()
+        self.updates = updates
+        # Catalog packages, shown first and emphasized
+        self.highlight = set(highlight)
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="updates_container"):
+            yield Label("Pending Updates", id="app_desc_title")
+            summary = summarize_updates(self.updates)
+            yield Label(
+                f"{summary['count']} packages, download {format_size(summary['download'])}, "
+                f"installed size {format_size_delta(summary['size_delta'])}. "
+                "[dim]Based on the last synced databases; -Syu refreshes them first.[/dim]",
+                id="updates_summary"
+            )
+            yield DataTable(id="updates_table", cursor_type="row")
+            with Horizontal(id="app_desc_actions"):
+                yield Button("Close", variant="default", id="close_desc_btn")
+
+    def on_mount(self):
+        table = self.query_one("#updates_table", DataTable)
+        table.add_columns("Package", "Installed", "Available", "Repo", "Download", "Size Change")
+        ordered = sorted(self.updates, key=lambda u: u['name'] not in self.highlight)
+        for u in ordered:
+            style = "bold cyan" if u['name'] in self.highlight else ""
+            table.add_row(
+                Text(u['name'], style=style),
+                u['local_version'],
+                Text(u['new_version'], style=style),
+                u['repo'],
+                format_size(u['download_size']),
+                format_size_delta(u['size_delta']),
+                key=u['name']
+            )
+
+    @on(Button.Pressed, "#close_desc_btn")
+    def close_screen(self):
+        self.dismiss()
+
+class OrphanCleanupScreen(ModalScreen):
+    """Lists orphaned dependencies (see dep_graph.DependencyGraph.orphan_report) for removal."""
+    BINDINGS = [("escape", "cancel", "Cancel")]
+
+    def __init__(self, report, packages):
+        super().__init__()
+        self.report = report
+        self.packages = packages
+        # Plain orphans are preselected; optional-only ones are opt-in
+        self.selected = set(report['orphans'])
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="orphans_container"):
+            yield Label("Orphaned Packages", id="orphans_title")
+            yield Label(
+                f"{len(self.report['orphans'])} orphans, {len(self.report['optional_only'])} only wanted as "
+                f"optional dependencies. Removing all reclaims {format_size(self.report['freed'])}.",
+                id="orphans_summary"
+            )
+            yield DataTable(id="orphans_table", cursor_type="cell")
+            with Horizontal(id="orphans_actions"):
+                yield Button("Remove Selected", variant="error", id="remove_orphans_btn")
+                yield Button("Cancel", variant="primary", id="cancel_orphans_btn")
+
+    def on_mount(self):
+        table = self.query_one("#orphans_table", DataTable)
+        table.add_columns("Select", "Package", "Size", "Kept For")
+        rows = [(pkg, "[dim]nothing[/dim]") for pkg in self.report['orphans']]
+        rows += [(pkg, f"optional for {', '.join(wanted)}") for pkg, wanted in self.report['optional_only'].items()]
+        for pkg, reason in rows:
+            check_mark = r"\[x]" if pkg in self.selected else r"\[ ]"
+            size = self.packages.get(pkg, {}).get('size', 0)
+            table.add_row(check_mark, pkg, format_size(size), reason, key=pkg)
+
+    @on(DataTable.CellSelected, "#orphans_table")
+    def on_cell_selected(self, event: DataTable.CellSelected):
+        if event.coordinate.column == 0:
+            pkg = event.cell_key.row_key.value
+            if pkg in self.selected:
+                self.selected.remove(pkg)
+                event.data_table.update_cell_at(event.coordinate, r"\[ ]")
+            else:
+                self.selected.add(pkg)
+                event.data_table.update_cell_at(event.coordinate, r"\[x]")
+
+    @on(Button.Pressed, "#remove_orphans_btn")
+    def confirm(self):
+        self.dismiss(sorted(self.selected))
+
+    @on(Button.Pressed, "#cancel_orphans_btn")
+    def action_cancel(self):
+        self.dismiss(None)
+
+class AURBuildScreen(ModalScreen):
+    """Live status, timings and logs of the parallel AUR builds (see aur_build)."""
+    BINDINGS = [("escape", "close", "Close")]
+    # Lines of a build log shown when its row is highlighted
+    LOG_TAIL = 200
+
+    def __init__(self, levels, names, log_paths):
+        super().__init__()
+        self.levels = levels
+        self.names = names
+        self.log_paths = log_paths
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="builds_container"):
+            yield Label("AUR Builds", id="builds_title")
+            yield Label("", id="builds_summary")
+            yield DataTable(id="builds_table", cursor_type="row")
+            yield RichLog(id="build_log", markup=False, wrap=True)
+            with Horizontal(id="builds_actions"):
+                yield Button("Close", variant="primary", id="close_builds_btn")
+
+    def on_mount(self):
+        table = self.query_one("#builds_table", DataTable)
+        table.add_column("Package", key="Package")
+        table.add_column("Level", key="Level")
+        table.add_column("Status", key="Status")
+        table.add_column("Time", key="Time")
+        for level, bases in enumerate(self.levels, 1):
+            for base in bases:
+                table.add_row(", ".join(self.names[base]), str(level), "[dim]queued[/dim]", "", key=base)
+
+    def set_summary(self, text):
+        self.query_one("#builds_summary", Label).update(text)
+
+    def set_status(self, base, status, elapsed=None):
+        table = self.query_one("#builds_table", DataTable)
+        table.update_cell(base, "Status", status)
+        if elapsed is not None:
+            table.update_cell(base, "Time", f"{elapsed:.1f}s")
+        if table.cursor_row is not None and table.coordinate_to_cell_key((table.cursor_row, 0)).row_key.value == base:
+            self.show_log(base)
+
+    @on(DataTable.RowHighlighted, "#builds_table")
+    def on_row_highlighted(self, event: DataTable.RowHighlighted):
+        self.show_log(event.row_key.value)
+
+    def show_log(self, base):
+        log = self.query_one("#build_log", RichLog)
+        log.clear()
+        try:
+            with open(self.log_paths[base], "r", errors="replace") as f:
+                lines = deque(f, maxlen=self.LOG_TAIL)
+        except (OSError, KeyError):
+            return
+        log.write("".join(lines).rstrip("\n"))
+
+    @on(Button.Pressed, "#close_builds_btn")
+    def action_close(self):
+        # The builds keep running; the Apps log reports the outcome
+        self.dismiss(None)
+
 class UninstallConfirmationScreen(ModalScreen):
     """Modal screen to confirm uninstallation."""
     BINDINGS = [("escape", "cancel", "Cancel")]
@@ -285,6 +446,29 @@ class UninstallSafetyScreen(ModalScreen):
     """Safety screen for uninstallation (irreversible action)."""
     BINDINGS = [("escape", "cancel", "Cancel")]
 
+    def __init__(self, plan=None):
+        super().__init__()
+        # Removal impact from dep_graph.DependencyGraph.removal_plan (optional)
+        self.plan = plan
+
+    def format_plan(self):
+        plan = self.plan
+        lines = [
+            f"[bold]{len(plan['remove'])} packages will be removed, "
+            f"freeing {format_size(plan['freed'])}.[/bold]"
+        ]
+        if plan['dependencies']:
+            lines.append(f"Unneeded dependencies removed too: {', '.join(plan['dependencies'])}")
+        if plan['missing']:
+            lines.append(f"[dim]Not installed, left out of the removal: {', '.join(plan['missing'])}[/dim]")
+        for pkg, deps in plan['breaks'].items():
+            lines.append(f"[red]Breaks {pkg} (needs {', '.join(deps)})[/red]")
+        if plan['breaks']:
+            lines.append("[red]pacman will refuse this transaction unless those packages are removed too.[/red]")
+        for pkg, deps in plan['optional'].items():
+            lines.append(f"[yellow]{pkg} loses optional support from {', '.join(deps)}[/yellow]")
+        return "\n".join(lines)
+
     def compose(self) -> ComposeResult:
         with Vertical(id="uninstall_safety_container"):
             yield Label("DANGER: This action is irreversible.", classes="danger-title")
@@ -296,6 +480,10 @@ class UninstallSafetyScreen(ModalScreen):
                 "Type 'UNINSTALL' to confirm."
             )
             yield Label(warning_text, classes="danger-instruction")
+
+            if self.plan:
+                with ScrollableContainer(id="uninstall_impact_container"):
+                    yield Label(self.format_plan(), id="uninstall_impact")
             
             yield Input(placeholder="UNINSTALL", id="safety_input")
             with Horizontal(id="uninstall_safety_actions"):
@@ -2,9 +2,12 @@ import subprocess
 import json
 import shlex
 import sys
-import shutil
 
 import gsp_manager
+import pacman_db
+
+# Packages relevant to GPU driver detection
+GPU_PACKAGES = ["nvidia", "nvidia-lts", "nvidia-dkms", "nvidia-open", "nvidia-open-dkms", "nvidia-beta-dkms", "mesa"]
 
 def get_system_gpu_info():
     """
@@ -21,23 +24,15 @@ def get_system_gpu_info():
 
     # 1. Package Discovery
     # We check for specific packages relevant to GPU drivers
-    target_packages = ["nvidia", "nvidia-lts", "nvidia-dkms", "nvidia-open", "nvidia-open-dkms", "nvidia-beta-dkms", "mesa"]
-    
-    if shutil.which('pacman'):
-        try:
-            # Use pacman -Qq to list all installed packages quietly
-            # This is safer than -Qs which does a fuzzy search on description
-            pacman_res = subprocess.run(['pacman', '-Qq'], capture_output=True, text=True)
-            if pacman_res.returncode == 0:
-                installed_set = set(pacman_res.stdout.splitlines())
-                for pkg in target_packages:
-                    if pkg in installed_set:
-                        results["installed_packages"].append(pkg)
-            else:
-                # Log to stderr to avoid corrupting stdout JSON
-                print(f"Warning: pacman returned non-zero exit code: {pacman_res.stderr}", file=sys.stderr)
-        except Exception as e:
-            print(f"Error checking packages: {e}", file=sys.stderr)
+    try:
+        # Read the pacman local DB directly instead of spawning `pacman -Qq`
+        installed_set = pacman_db.get_installed_packages()
+        for pkg in GPU_PACKAGES:
+            if pkg in installed_set:
+                results["installed_packages"].append(pkg)
+    except Exception as e:
+        # Log to stderr to avoid corrupting stdout JSON
+        print(f"Error checking packages: {e}", file=sys.stderr)
 
     # 2. Hardware & Active Driver Discovery
     try:
@@ -113,16 +108,14 @@ def get_system_gpu_info():
                             elif "nvidia-open-dkms" in results["installed_packages"] or "nvidia-open" in results["installed_packages"]:
                                 driver_type = "Nvidia Open Source (Proprietary)"
                             else:
-                                # Fallback to /proc check
-                                try:
-                                    with open("/proc/driver/nvidia/version", "r") as f:
-                                        version_content = f.read()
-                                        if "Open Source" in version_content or "Open Kernel Module" in version_content:
-                                            driver_type = "Proprietary (Open Source Module)"
-                                        else:
-                                            driver_type = "Proprietary (Closed Source)"
-                                except Exception:
+                                # Fallback to /proc check (shared with the GSP compatibility probe)
+                                probe = gsp_manager.probe_nvidia()
+                                if not probe["proc_version"]:
                                     driver_type = "Proprietary (Unknown)"
+                                elif probe["open_module"]:
+                                    driver_type = "Proprietary (Open Source Module)"
+                                else:
+                                    driver_type = "Proprietary (Closed Source)"
 
                         results["gpus"].append({
                             "slot": slot,
@@ -1,5 +1,6 @@
 import getpass
 import os
+import shlex
 import shutil
 from functools import lru_cache
 
@@ -29,14 +30,15 @@ def get_distro_id():
         return "unknown"
     return "unknown"
 
-def get_installation_plan(vendor_id, workloads, driver_type="type_open"):
+def get_installation_plan(vendor_id, workloads, driver_type="type_open", offline=False):
     """
     Generates an installation plan based on vendor and selected workloads.
     
     :param vendor_id: 'nvidia', 'amd', or 'intel'
     :param workloads: Set or list of selected workloads (e.g., {'gaming', 'ai'})
     :param driver_type: 'type_prop', 'type_open', or 'type_beta'
-    :return: Dictionary containing 'packages', 'services', 'post_install_cmds', 'warnings', 'groups', 'nvidia_inst_cmd', 'aur_packages'
+    :param offline: Install 'packages' from the pacman package cache only
+    :return: Dictionary containing 'packages', 'services', 'post_install_cmds', 'warnings', 'groups', 'nvidia_inst_cmd', 'aur_packages', 'offline', 'offline_cmds'
     """
     plan = {
         "packages": [],
@@ -45,7 +47,9 @@ def get_installation_plan(vendor_id, workloads, driver_type="type_open"):
         "post_install_cmds": [],
         "warnings": [],
         "groups": ["video", "render"],
-        "nvidia_inst_cmd": None  # Specific for EndeavourOS Nvidia
+        "nvidia_inst_cmd": None,  # Specific for EndeavourOS Nvidia
+        "offline": offline,
+        "offline_cmds": None  # pacman -U argv lists, filled in once the cache covers 'packages'
     }
     
     workloads = set(workloads) # e.g. {'gaming', 'ai'}
@@ -220,7 +224,10 @@ def generate_installation_command(plan):
 
     # 3. Package Installation (Standard Arch or EOS Extras)
     packages = plan.get("packages", [])
-    if packages:
+    if plan.get("offline_cmds"):
+        # Every package is already in the package cache: install the exact files, no download
+        commands.extend(shlex.join(cmd) for cmd in plan["offline_cmds"])
+    elif packages:
         pkg_str = " ".join(packages)
         commands.append(f"sudo pacman -S --noconfirm --needed {pkg_str}")
 
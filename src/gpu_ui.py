@@ -5,11 +5,14 @@ from textual.containers import Grid, Vertical, Horizontal, Container
 from textual import on, work
 import asyncio
 import shlex
-import subprocess
 import pyperclip
-from gpu import get_system_gpu_info
+from gpu import get_system_gpu_info, GPU_PACKAGES
+import gsp_manager
 from gpu_installer import get_installation_plan, generate_installation_command
 from rich.markup import escape
+import pacman_db
+import preflight
+import sync_db
 
 class GSPManagerScreen(ModalScreen):
     """Screen for Nvidia GSP Firmware Management."""
@@ -41,33 +44,17 @@ class GSPManagerScreen(ModalScreen):
         self.check_status()
 
     def check_status(self):
-        """Checks current GSP status via the script."""
+        """Checks current GSP status using the shared in-process compatibility probe."""
         self.log_message("[dim]Checking GSP status...[/dim]")
         try:
-            # First try without sudo (works if files are readable)
-            # If that fails, we might need to prompt, but for 'check' we want to avoid full suspend if possible.
-            # src/gsp_manager.py --check prints ENABLED or DISABLED and exits 0 usually.
+            # Same result as `src/gsp_manager.py --check`, without spawning a second
+            # interpreter that would repeat the pacman/nvidia-smi probing.
+            status = gsp_manager.get_check_status()
             
-            cmd = ["python3", "src/gsp_manager.py", "--check"]
-            res = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if res.returncode == 0:
-                status = res.stdout.strip()
-                if "INCOMPATIBLE_BLACKWELL" in status:
-                    self.update_status("INCOMPATIBLE_BLACKWELL")
-                elif "INCOMPATIBLE_OPEN" in status:
-                    self.update_status("INCOMPATIBLE_OPEN")
-                elif "INCOMPATIBLE_NO_DRIVER" in status:
-                    self.update_status("INCOMPATIBLE_NO_DRIVER")
-                elif "DISABLED" in status:
-                    self.update_status("DISABLED")
-                else:
-                    self.update_status("ENABLED")
+            if status is None:
+                self.log_message("[yellow]No bootloader detected. Assuming ENABLED or blocked.[/yellow]")
             else:
-                 # Attempt with sudo if failed (might prompt in terminal if we didn't suspend?
-                 # actually capturing output with sudo without suspend will fail if password needed)
-                 self.log_message("[yellow]Could not read config without sudo. Assuming ENABLED or blocked.[/yellow]")
-                 self.log_message(f"[dim]Error: {escape(res.stderr)}[/dim]")
+                self.update_status(status)
         except Exception as e:
             self.log_message(f"[red]Exception checking status: {escape(str(e))}[/red]")
 
@@ -358,6 +345,8 @@ class DriverInstallModal(ModalScreen):
                 else:
                     yield RadioButton("Standard", value=True, id="type_open")
 
+            yield Checkbox("Offline: install from the package cache only", id="chk_offline")
+
             with Horizontal(id="dialog-controls"):
                 yield Button("Cancel", id="btn_cancel", variant="error")
                 yield Button("Review Plan", id="btn_next", variant="success")
@@ -388,7 +377,8 @@ class DriverInstallModal(ModalScreen):
              return
         
         # Generate Plan
-        plan = get_installation_plan(self.vendor_id, selected_workloads, type_id)
+        offline = self.query_one("#chk_offline", Checkbox).value
+        plan = get_installation_plan(self.vendor_id, selected_workloads, type_id, offline)
         
         self.dismiss(plan)
 
@@ -427,9 +417,10 @@ class PlanReviewModal(ModalScreen):
     }
     """
 
-    def __init__(self, command: str):
+    def __init__(self, command: str, notes=None):
         super().__init__()
         self.command = command
+        self.notes = notes or []
 
     def compose(self) -> ComposeResult:
         with Container(id="plan-dialog"):
@@ -442,6 +433,8 @@ class PlanReviewModal(ModalScreen):
 
     def on_mount(self):
         log = self.query_one("#plan-preview", RichLog)
+        for note in self.notes:
+            log.write(note)
         log.write(escape(self.command))
 
     @on(Button.Pressed, "#btn_cancel_plan")
@@ -560,6 +553,15 @@ class GPUConfigWidget(Container):
         table = self.query_one("#gpu_info_table", DataTable)
         table.add_columns("Device", "Driver Version", "Driver Type", "GSP Firmware")
         self.refresh_gpu_info()
+        pacman_db.get_package_state().subscribe(self.on_packages_changed)
+
+    def on_unmount(self):
+        pacman_db.get_package_state().unsubscribe(self.on_packages_changed)
+
+    def on_packages_changed(self, changed):
+        # Only driver package changes affect the status table
+        if changed.intersection(GPU_PACKAGES):
+            self.refresh_gpu_info()
 
     def refresh_gpu_info(self):
         table = self.query_one("#gpu_info_table", DataTable)
@@ -617,12 +619,45 @@ class GPUConfigWidget(Container):
     def on_plan_ready(self, plan):
         if not plan:
             return
-        
+        self.review_plan(plan)
+
+    @work(exclusive=True, group="plan_review")
+    async def review_plan(self, plan):
+        # The sync index and the package cache are read off the event loop
+        notes = await asyncio.to_thread(self.apply_package_cache, plan)
+
         # Construct the full shell command string
         self.pending_command = generate_installation_command(plan)
         
         # Show review modal
-        self.app.push_screen(PlanReviewModal(self.pending_command), self.handle_plan_confirmation)
+        self.app.push_screen(PlanReviewModal(self.pending_command, notes), self.handle_plan_confirmation)
+
+    def apply_package_cache(self, plan):
+        """
+        Reports plan packages whose exact repo version is already in the package cache.
+        Offline plans are switched to pacman -U of those files when the cache covers everything.
+        Returns markup notes for the review modal.
+        """
+        if not plan.get("packages"):
+            return []
+        try:
+            footprint, cache = preflight.plan_cached_install(plan["packages"], sync_db.get_sync_index())
+        except Exception:
+            return []
+
+        notes = []
+        if cache["cached"]:
+            notes.append(
+                f"[green]{len(cache['cached'])} packages already in the package cache "
+                f"({pacman_db.format_size(cache['saved'])} not downloaded).[/green]"
+            )
+        if plan.get("offline"):
+            if cache["offline"]:
+                plan["offline_cmds"] = preflight.offline_install_commands(cache["cached"], plan["packages"])
+            elif footprint["packages"] or footprint["unknown"]:
+                missing = cache["missing"] + footprint["unknown"]
+                notes.append(f"[red]Offline install unavailable, not cached: {', '.join(missing)}. These will be downloaded.[/red]")
+        return notes
 
     def handle_plan_confirmation(self, confirmed: bool):
         if confirmed:
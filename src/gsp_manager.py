@@ -4,6 +4,9 @@ import subprocess
 import shutil
 import argparse
 import glob
+from functools import lru_cache
+
+import pacman_db
 
 GRUB_CONFIG = "/etc/default/grub"
 EOS_CMDLINE = "/etc/kernel/cmdline"
@@ -18,48 +21,113 @@ def run_command(cmd, shell=False):
     except Exception as e:
         return -1, str(e)
 
-def is_blackwell():
+NVIDIA_PROC_VERSION = "/proc/driver/nvidia/version"
+
+# GSP fix is only supported on the closed kernel modules
+BLACKLIST = ["nvidia-open", "nvidia-open-dkms"]
+WHITELIST = ["nvidia", "nvidia-dkms", "nvidia-lts"]
+
+def query_gpu_name():
+    """Returns the Nvidia GPU name reported by nvidia-smi, or "" if unavailable."""
+    # Expected output: "NVIDIA GeForce RTX 5090" or similar.
+    cmd = ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"]
+    ret, out = run_command(cmd)
+    return out if ret == 0 else ""
+
+def is_blackwell_name(gpu_name):
     """
-    Checks if the GPU is Nvidia Blackwell architecture (RTX 5000 series).
+    Checks if a GPU name is Nvidia Blackwell architecture (RTX 5000 series).
     Blackwell cards require Open Kernel Modules and cannot disable GSP.
     """
-    try:
-        # Query GPU name.
-        # Expected output: "NVIDIA GeForce RTX 5090" or similar.
-        cmd = ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"]
-        ret, out = run_command(cmd)
+    out_upper = gpu_name.upper()
+    
+    # Safety Check: Explicitly exclude known "RTX 5000" workstation cards from previous gens
+    # "RTX 5000 Ada Generation" -> Ada
+    # "Quadro RTX 5000" -> Turing
+    if "ADA GENERATION" in out_upper:
+        return False
+    if "QUADRO" in out_upper:
+        return False
+
+    # Check for key identifiers
+    # "RTX 50" will catch "RTX 5000" (Workstation) unless excluded above.
+    # But "RTX 5000" (the workstation card) typically appears as "NVIDIA RTX 5000" or "Quadro RTX 5000".
+    # Consumer cards: "GeForce RTX 5090", "GeForce RTX 5080".
+    
+    # Strict check for consumer Blackwell series
+    # We look for "RTX 50" followed by digits that indicate consumer series (5050-5099)
+    # Simplification: Match "GEFORCE RTX 50"
+    if "GEFORCE RTX 50" in out_upper:
+        return True
         
-        if ret != 0:
-            # If nvidia-smi fails, we assume False (or let driver check fail later)
-            return False
-            
-        out_upper = out.upper()
+    if "BLACKWELL" in out_upper:
+        return True
         
-        # Safety Check: Explicitly exclude known "RTX 5000" workstation cards from previous gens
-        # "RTX 5000 Ada Generation" -> Ada
-        # "Quadro RTX 5000" -> Turing
-        if "ADA GENERATION" in out_upper:
-            return False
-        if "QUADRO" in out_upper:
-            return False
+    return False
 
-        # Check for key identifiers
-        # "RTX 50" will catch "RTX 5000" (Workstation) unless excluded above.
-        # But "RTX 5000" (the workstation card) typically appears as "NVIDIA RTX 5000" or "Quadro RTX 5000".
-        # Consumer cards: "GeForce RTX 5090", "GeForce RTX 5080".
-        
-        # Strict check for consumer Blackwell series
-        # We look for "RTX 50" followed by digits that indicate consumer series (5050-5099)
-        # Simplification: Match "GEFORCE RTX 50"
-        if "GEFORCE RTX 50" in out_upper:
-            return True
-            
-        if "BLACKWELL" in out_upper:
-            return True
-            
-        return False
-    except:
-        return False
+def is_blackwell():
+    """Checks if the installed Nvidia GPU is Blackwell (uses the shared probe)."""
+    return probe_nvidia()["blackwell"]
+
+def read_proc_version():
+    try:
+        with open(NVIDIA_PROC_VERSION, "r") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def is_open_module(proc_version):
+    return "Open Source" in proc_version or "Open Kernel Module" in proc_version
+
+@lru_cache(maxsize=4)
+def _probe(installed_key):
+    installed = set(installed_key)
+    driver_found = bool(installed)
+    proc_version = read_proc_version()
+    # Only spawn nvidia-smi when an Nvidia driver package is present
+    gpu_name = query_gpu_name() if driver_found else ""
+
+    blackwell = is_blackwell_name(gpu_name)
+    open_module = is_open_module(proc_version)
+
+    # 1. Driver presence (whitelist, or blacklist to allow hardware check)
+    if not driver_found:
+        status = "INCOMPATIBLE_NO_DRIVER"
+    # 2. Hardware (Blackwell Guardrail)
+    elif blackwell:
+        status = "INCOMPATIBLE_BLACKWELL"
+    # 3. Active Driver Check (Proc File), then Blacklist Packages (Fallback)
+    elif open_module or installed.intersection(BLACKLIST):
+        status = "INCOMPATIBLE_OPEN"
+    else:
+        status = "COMPATIBLE"
+
+    return {
+        "status": status,
+        "installed": frozenset(installed),
+        "gpu_name": gpu_name,
+        "proc_version": proc_version,
+        "open_module": open_module,
+        "blackwell": blackwell,
+    }
+
+def probe_nvidia():
+    """
+    Gathers everything the GSP safety checks need in one step: Nvidia driver
+    package membership (single local DB lookup), /proc/driver/nvidia/version and
+    the GPU name. The record is memoized per installed driver package set, so
+    callers share it and a driver swap invalidates it automatically. A failed
+    nvidia-smi query (e.g. before the module is loaded) is not memoized.
+
+    Returns a dict with keys: status, installed, gpu_name, proc_version,
+    open_module, blackwell.
+    """
+    installed = pacman_db.filter_installed(WHITELIST + BLACKLIST)
+    probe = _probe(tuple(sorted(installed)))
+    if probe["installed"] and not probe["gpu_name"]:
+        # Probe again next time instead of keeping a result without the GPU name
+        _probe.cache_clear()
+    return probe
 
 def check_nvidia_compatibility():
     """
@@ -70,49 +138,7 @@ def check_nvidia_compatibility():
         "INCOMPATIBLE_OPEN": Open Kernel Modules.
         "INCOMPATIBLE_NO_DRIVER": No driver found.
     """
-    BLACKLIST = ["nvidia-open", "nvidia-open-dkms"]
-    WHITELIST = ["nvidia", "nvidia-dkms", "nvidia-lts"]
-
-    # 1. Check Whitelist (Driver Presence)
-    driver_found = False
-    for pkg in WHITELIST:
-        ret, _ = run_command(["pacman", "-Qq", pkg])
-        if ret == 0:
-            driver_found = True
-            break
-    
-    # Also check blacklist to allow hardware check
-    if not driver_found:
-        for pkg in BLACKLIST:
-            ret, _ = run_command(["pacman", "-Qq", pkg])
-            if ret == 0:
-                driver_found = True
-                break
-    
-    if not driver_found:
-        return "INCOMPATIBLE_NO_DRIVER"
-
-    # 2. Check Hardware (Blackwell Guardrail)
-    if is_blackwell():
-        return "INCOMPATIBLE_BLACKWELL"
-
-    # 3. Active Driver Check (Proc File)
-    try:
-        if os.path.exists("/proc/driver/nvidia/version"):
-            with open("/proc/driver/nvidia/version", "r") as f:
-                content = f.read()
-                if "Open Source" in content or "Open Kernel Module" in content:
-                    return "INCOMPATIBLE_OPEN"
-    except:
-        pass
-
-    # 4. Check Blacklist Packages (Fallback)
-    for pkg in BLACKLIST:
-        ret, _ = run_command(["pacman", "-Qq", pkg])
-        if ret == 0:
-            return "INCOMPATIBLE_OPEN"
-
-    return "COMPATIBLE"
+    return probe_nvidia()["status"]
 
 def detect_bootloader():
     """Detects if using GRUB, Systemd-boot (EOS style), or Manual Systemd-boot."""
@@ -178,6 +204,20 @@ def detect_state():
         return None, None
     return bootloader, is_gsp_disabled(bootloader)
 
+def get_check_status():
+    """
+    Status reported by `--check`: an INCOMPATIBLE_* code, "DISABLED", "ENABLED",
+    or None if no bootloader was detected.
+    """
+    compat = check_nvidia_compatibility()
+    if compat != "COMPATIBLE":
+        return compat
+
+    bootloader = detect_bootloader()
+    if not bootloader:
+        return None
+    return "DISABLED" if is_gsp_disabled(bootloader) else "ENABLED"
+
 def toggle_gsp(bootloader, disable=True):
     """
     disable=True -> Add param (Disable GSP Firmware)
@@ -465,10 +505,8 @@ def main():
         sys.exit(1)
 
     if args.check:
-        is_disabled = is_gsp_disabled(bootloader)
-        # If disabled, it means fix is applied.
-        # If enabled, it means default state.
-        print("DISABLED" if is_disabled else "ENABLED")
+        # DISABLED means fix is applied, ENABLED means default state.
+        print(get_check_status())
         sys.exit(0)
     
     # Modification modes require root
@@ -1,6 +1,7 @@
 import json
 import os
 import datetime
+from collections import deque
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, TabbedContent, TabPane, Label, RichLog, Button
 from textual import on
@@ -8,8 +9,11 @@ from apps import AppInstaller
 from config import SystemConfig
 from printer import PrinterSetup
 from gpu_ui import GPUConfigWidget
+import pacman_db
 
 CONFIG_FILE = "config.json"
+# Log messages kept for export (streamed command output arrives in batches)
+LOG_BUFFER_SIZE = 5000
 
 class GOATdApp(App):
     """The GOAT'd Setup Application."""
@@ -22,12 +26,17 @@ class GOATdApp(App):
     ]
 
     def on_mount(self) -> None:
-        self.log_buffer = []
+        self.log_buffer = deque(maxlen=LOG_BUFFER_SIZE)
         self.load_config()
+        # Keep the shared installed-package cache in sync with outside pacman runs
+        pacman_db.get_package_state().start_watching()
+
+    def on_unmount(self) -> None:
+        pacman_db.get_package_state().stop_watching()
 
     def log_message(self, message: str) -> None:
         if not hasattr(self, "log_buffer"):
-            self.log_buffer = []
+            self.log_buffer = deque(maxlen=LOG_BUFFER_SIZE)
             
         """Log a message to the buffer and the RichLog widget."""
         self.log_buffer.append(str(message))
@@ -99,7 +108,7 @@ class GOATdApp(App):
             with TabPane(title="Logs", id="logs"):
                 yield Label("System Logs")
                 yield Button("Export Logs", id="export_logs_btn")
-                yield RichLog(id="main_log", markup=True)
+                yield RichLog(id="main_log", markup=True, max_lines=LOG_BUFFER_SIZE)
         
         yield Footer()
 
@@ -0,0 +1,388 @@
+import os
+import struct
+import ctypes
+import ctypes.util
+import threading
+import subprocess
+
+LOCAL_DB_PATH = "/var/lib/pacman/local"
+LOCK_FILE = "db.lck"
+
+# %REASON% values written by libalpm
+REASON_EXPLICIT = 0
+REASON_DEPEND = 1
+
+def format_size(num_bytes):
+    """Formats a byte count the way pacman does (KiB/MiB/GiB)."""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def parse_desc(content):
+    """
+    Parses an alpm 'desc' file into a dict of FIELD -> list of lines.
+
+    The format is a series of blocks:
+        %NAME%
+        kitty
+
+        %DEPENDS%
+        python
+        glibc
+    """
+    fields = {}
+    current = None
+    for line in content.splitlines():
+        if line.startswith("%") and line.endswith("%") and len(line) > 2:
+            current = line[1:-1]
+            fields[current] = []
+        elif not line:
+            current = None
+        elif current is not None:
+            fields[current].append(line)
+    return fields
+
+def _first(fields, key, default=""):
+    values = fields.get(key)
+    return values[0] if values else default
+
+def _int(fields, key):
+    try:
+        return int(_first(fields, key, "0"))
+    except ValueError:
+        return 0
+
+def package_from_desc(fields):
+    """Builds a package record from parsed desc fields."""
+    return {
+        "name": _first(fields, "NAME"),
+        "version": _first(fields, "VERSION"),
+        "description": _first(fields, "DESC"),
+        # Explicitly installed packages have no %REASON% block
+        "reason": _int(fields, "REASON"),
+        "size": _int(fields, "SIZE"),
+        "provides": fields.get("PROVIDES", []),
+        "depends": fields.get("DEPENDS", []),
+        "optdepends": fields.get("OPTDEPENDS", []),
+        "conflicts": fields.get("CONFLICTS", []),
+        "replaces": fields.get("REPLACES", []),
+    }
+
+def read_local_entry(entry_path):
+    """Reads a single '<name>-<ver>-<rel>' directory. Returns None if unreadable."""
+    try:
+        with open(os.path.join(entry_path, "desc"), "r", encoding="utf-8", errors="replace") as f:
+            fields = parse_desc(f.read())
+    except OSError:
+        return None
+
+    pkg = package_from_desc(fields)
+    if not pkg["name"]:
+        return None
+    return pkg
+
+def desc_mtime(entry_path):
+    """mtime_ns of an entry's desc file, or None if it is missing."""
+    try:
+        return os.stat(os.path.join(entry_path, "desc")).st_mtime_ns
+    except OSError:
+        return None
+
+def read_local_db(db_path=LOCAL_DB_PATH):
+    """
+    Reads every installed package from the pacman local database in one pass.
+    Returns a dict of name -> package record.
+    """
+    packages = {}
+    try:
+        entries = list(os.scandir(db_path))
+    except OSError:
+        return packages
+
+    for entry in entries:
+        if not entry.is_dir():
+            continue
+        pkg = read_local_entry(entry.path)
+        if pkg:
+            packages[pkg["name"]] = pkg
+    return packages
+
+# inotify(7) constants
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+_EVENT_HEADER = struct.Struct("iIII")
+
+class Inotify:
+    """Minimal non-blocking inotify wrapper (libc via ctypes, no extra dependency)."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+
+    def add_watch(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.watches[wd] = path
+        return wd
+
+    def read_events(self):
+        """Drains pending events. Returns a list of (watched_path, mask, name)."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                events.append((self.watches.get(wd), mask, name))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class PackageState:
+    """
+    Shared cache of the installed package set.
+
+    Only local DB entries that were added, removed or rewritten (desc mtime)
+    since the last refresh are read. When watching, inotify events on the local
+    DB and the release of db.lck at the end of a transaction trigger the refresh
+    and subscribers are called with the set of package names that changed.
+    """
+
+    def __init__(self, db_path=LOCAL_DB_PATH):
+        self.db_path = db_path
+        self.lock_path = os.path.join(os.path.dirname(os.path.abspath(db_path)), LOCK_FILE)
+        self.packages = {}
+        self._entries = {} # entry dirname -> (desc mtime_ns, package name)
+        self._pending = set() # changes found by silent refreshes, not yet notified
+        self._names = frozenset()
+        self._providers = None # provided name -> installed packages providing it (lazy)
+        self._versions = None # name -> installed version (lazy)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._inotify = None
+        self._loop = None
+        self._dirty = False
+        self.loaded = False
+
+    @property
+    def watching(self):
+        return self._inotify is not None
+
+    def installed(self):
+        """Returns the installed package names (refreshing first if not watched)."""
+        if not self.watching:
+            self.refresh(notify=False)
+        return self._names
+
+    def records(self):
+        """Returns {name: package record} (refreshing first if not watched)."""
+        self.installed()
+        return self.packages
+
+    def providers(self):
+        """
+        Returns the provides index: bare provided name -> sorted tuple of the
+        installed packages providing it. Built once per package set change.
+        """
+        providers = self._providers
+        if providers is None:
+            index = {}
+            for name, pkg in list(self.packages.items()):
+                for provide in pkg["provides"]:
+                    # Provides only carry '=' versions ("libfoo.so=1-64")
+                    index.setdefault(provide.split("=", 1)[0], set()).add(name)
+            self._providers = providers = {k: tuple(sorted(v)) for k, v in index.items()}
+        return providers
+
+    def versions(self):
+        """Returns {name: installed version}. Built once per package set change."""
+        versions = self._versions
+        if versions is None:
+            self._versions = versions = {name: pkg["version"] for name, pkg in list(self.packages.items())}
+        return versions
+
+    def provided_names(self):
+        """Returns the bare names in the provides of all installed packages."""
+        return self.providers().keys()
+
+    def satisfier(self, name):
+        """Returns the installed package satisfying name (itself or a provider), or None."""
+        if name in self.packages:
+            return name
+        found = self.providers().get(name)
+        return found[0] if found else None
+
+    def refresh(self, notify=True):
+        """
+        Re-syncs with the local DB by diffing its directory listing and the desc
+        mtimes (`pacman -D` rewrites desc in place).
+        Returns the set of package names that were added, removed or changed.
+        With notify=False subscribers are not called; the changes are kept and
+        delivered (and returned) by the next notifying refresh.
+        """
+        with self._lock:
+            try:
+                current = {
+                    e.name: desc_mtime(e.path)
+                    for e in os.scandir(self.db_path) if e.is_dir()
+                }
+            except OSError:
+                return set()
+
+            changed = set()
+            for dirname in set(self._entries) - set(current):
+                _mtime, name = self._entries.pop(dirname)
+                # Upgrades swap the entry dir; the new one is read back below
+                self.packages.pop(name, None)
+                changed.add(name)
+
+            for dirname, mtime in current.items():
+                known = self._entries.get(dirname)
+                if known and known[0] == mtime:
+                    continue
+                pkg = read_local_entry(os.path.join(self.db_path, dirname))
+                if not pkg:
+                    # Entry still being written; picked up on the next refresh
+                    continue
+                self._entries[dirname] = (mtime, pkg["name"])
+                self.packages[pkg["name"]] = pkg
+                changed.add(pkg["name"])
+
+            if changed:
+                self._names = frozenset(self.packages)
+                self._providers = None
+                self._versions = None
+            # The initial load is not a change anyone missed
+            first_load = not self.loaded
+            self.loaded = True
+
+            if not notify:
+                if not first_load:
+                    self._pending |= changed
+                return changed
+            changed |= self._pending
+            self._pending = set()
+
+        if changed:
+            for callback in list(self._subscribers):
+                try:
+                    callback(changed)
+                except Exception:
+                    pass
+        return changed
+
+    def subscribe(self, callback):
+        """Registers callback(changed_names) for package set changes."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def start_watching(self, loop=None):
+        """
+        Watches the local DB with inotify, dispatching on the given asyncio loop
+        (defaults to the running loop). Returns False if inotify is unavailable.
+        """
+        if self.watching:
+            return True
+        try:
+            import asyncio
+            loop = loop or asyncio.get_running_loop()
+            inotify = Inotify()
+            try:
+                inotify.add_watch(self.db_path, IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO)
+                inotify.add_watch(os.path.dirname(self.lock_path), IN_DELETE)
+            except OSError:
+                inotify.close()
+                raise
+        except Exception:
+            return False
+
+        self._inotify = inotify
+        self._loop = loop
+        if not self.loaded:
+            self.refresh(notify=False)
+        loop.add_reader(inotify.fd, self._on_inotify)
+        return True
+
+    def stop_watching(self):
+        if not self.watching:
+            return
+        try:
+            self._loop.remove_reader(self._inotify.fd)
+        except Exception:
+            pass
+        self._inotify.close()
+        self._inotify = None
+        self._loop = None
+
+    def _on_inotify(self):
+        lock_released = False
+        for path, _mask, name in self._inotify.read_events():
+            if path == self.db_path:
+                self._dirty = True
+            elif name == LOCK_FILE:
+                # Transactions may also rewrite entries in place (pacman -D)
+                lock_released = self._dirty = True
+
+        # Entries are written while pacman holds db.lck; wait for its release
+        if self._dirty and (lock_released or not os.path.exists(self.lock_path)):
+            self._dirty = False
+            self.refresh()
+
+_STATES = {}
+
+def get_package_state(db_path=LOCAL_DB_PATH):
+    """Returns the shared PackageState for a local DB path."""
+    state = _STATES.get(db_path)
+    if state is None:
+        state = _STATES[db_path] = PackageState(db_path)
+    return state
+
+def get_installed_packages(db_path=LOCAL_DB_PATH):
+    """
+    Returns the set of installed package names.
+    Reads the local database directly; falls back to `pacman -Qq` if it is missing.
+    """
+    if os.path.isdir(db_path):
+        return get_package_state(db_path).installed()
+
+    try:
+        res = subprocess.run(["pacman", "-Qq"], capture_output=True, text=True)
+        if res.returncode == 0:
+            return set(res.stdout.splitlines())
+    except Exception:
+        pass
+    return set()
+
+def filter_installed(names, db_path=LOCAL_DB_PATH):
+    """
+    Batched membership check against a single installed-set snapshot.
+    Returns the subset of names that are installed.
+    """
+    installed = get_installed_packages(db_path)
+    return {name for name in names if name in installed}
@@ -0,0 +1,95 @@
+import os
+import re
+import subprocess
+from functools import cmp_to_key
+
+from pacman_db import format_size
+from vercmp import vercmp
+
+PKG_CACHE_DIR = "/var/cache/pacman/pkg"
+# Versions kept per package, like paccache's default
+DEFAULT_KEEP = 3
+
+# <name>-<[epoch:]pkgver>-<pkgrel>-<arch>.pkg.tar[.ext] (only the name may contain dashes)
+PKG_FILENAME = re.compile(r"^(.+)-([^-]+-[^-]+)-([^-]+)\.pkg\.tar(?:\.[a-z0-9]+)?$")
+SIG_SUFFIX = ".sig"
+
+_newest_first = cmp_to_key(lambda a, b: vercmp(b["version"], a["version"]))
+
+def parse_pkg_filename(filename):
+    """Returns (name, version, arch) for a package file name, or None."""
+    match = PKG_FILENAME.match(filename)
+    if not match:
+        return None
+    return match.group(1), match.group(2), match.group(3)
+
+def index_cache(cache_dir=PKG_CACHE_DIR):
+    """
+    Indexes the package cache by file name in one directory scan.
+    Returns {(name, arch): [{version, path, size}]}; the size includes the .sig file.
+    Partial downloads and unknown files are ignored.
+    """
+    files = {}
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    files[entry.name] = entry
+    except OSError:
+        return {}
+
+    index = {}
+    for filename, entry in files.items():
+        parsed = parse_pkg_filename(filename)
+        if not parsed:
+            continue
+        name, version, arch = parsed
+        paths = [entry.path]
+        size = entry.stat(follow_symlinks=False).st_size
+        sig = files.get(filename + SIG_SUFFIX)
+        if sig:
+            paths.append(sig.path)
+            size += sig.stat(follow_symlinks=False).st_size
+        index.setdefault((name, arch), []).append({"version": version, "paths": paths, "size": size})
+    return index
+
+def plan_prune(index, installed_versions, keep=DEFAULT_KEEP):
+    """
+    Picks cached package files to delete: everything but the newest `keep`
+    versions of each package, never touching the installed version.
+
+    Returns a dict:
+        remove: file paths to delete (packages and their signatures)
+        freed: bytes reclaimed
+        kept: number of package files kept
+    """
+    remove = []
+    freed = 0
+    kept = 0
+    for (name, _arch), versions in index.items():
+        installed = installed_versions.get(name)
+        versions.sort(key=_newest_first)
+        for i, entry in enumerate(versions):
+            if i < keep or entry["version"] == installed:
+                kept += 1
+                continue
+            remove.extend(entry["paths"])
+            freed += entry["size"]
+    remove.sort()
+    return {"remove": remove, "freed": freed, "kept": kept}
+
+def format_prune_plan(plan):
+    if not plan["remove"]:
+        return f"Package cache is clean ({plan['kept']} packages kept)."
+    return (
+        f"Pruning {len(plan['remove'])} files from the package cache, "
+        f"reclaiming {format_size(plan['freed'])} ({plan['kept']} packages kept)."
+    )
+
+def delete_files(paths):
+    """Deletes paths with a single privileged call (xargs splits huge lists for rm)."""
+    data = "\0".join(paths) + "\0"
+    return subprocess.run(
+        ["sudo", "xargs", "-0", "rm", "-f", "--"],
+        input=data, check=True, capture_output=True, text=True
+    )
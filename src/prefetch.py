@@ -0,0 +1,46 @@
+import os
+import tempfile
+
+import cache
+import pacman_db
+import sync_db
+
+# Where each AUR helper keeps its PKGBUILD clones (under $XDG_CACHE_HOME)
+AUR_CLONE_DIRS = {
+    "yay": ("yay",),
+    "paru": ("paru", "clone"),
+}
+# Concurrent `makepkg --verifysource` runs while prefetching AUR sources
+AUR_PREFETCH_JOBS = 4
+
+def make_download_dbpath(local_db=pacman_db.LOCAL_DB_PATH, sync_dir=sync_db.SYNC_DB_DIR):
+    """
+    Creates a temporary pacman dbpath whose local/ and sync/ link to the real
+    ones, like checkupdates does. `pacman -Sw --dbpath` against it locks only
+    the temporary directory, so downloads never hold the real DB lock and can
+    run while an AUR helper installs. Returns the TemporaryDirectory.
+    """
+    tmp = tempfile.TemporaryDirectory(prefix="goatd-dl-", ignore_cleanup_errors=True)
+    os.symlink(os.path.abspath(local_db), os.path.join(tmp.name, "local"))
+    os.symlink(os.path.abspath(sync_dir), os.path.join(tmp.name, "sync"))
+    return tmp
+
+def download_command(packages, dbpath):
+    """Download-only transaction (targets and missing deps) into the package cache."""
+    return ["sudo", "pacman", "-Sw", "--noconfirm", "--needed", "--dbpath", dbpath] + list(packages)
+
+def get_aur_clone_dir(helper):
+    """The helper's PKGBUILD clone directory, or None for helpers without a known layout."""
+    parts = AUR_CLONE_DIRS.get(helper)
+    if not parts:
+        return None
+    # get_cache_dir() is $XDG_CACHE_HOME/goatd; the helpers live next to it
+    return os.path.join(os.path.dirname(cache.get_cache_dir()), *parts)
+
+def clone_command(helper, packages):
+    """Fetches PKGBUILDs into the current directory (`<helper> -G`)."""
+    return [helper, "-G"] + list(packages)
+
+def verify_source_command():
+    """Downloads and checksums a PKGBUILD's sources without building or installing anything."""
+    return ["makepkg", "--verifysource", "--noconfirm"]
@@ -0,0 +1,170 @@
+import os
+import time
+
+import pacman_db
+from dep_graph import dep_name
+from pacman_db import format_size
+from pkg_cache import PKG_CACHE_DIR
+ROOT_DIR = "/"
+
+_cache_listings = {} # cache dir -> (mtime_ns, frozenset of file names)
+# A directory changed this recently may change again within the same mtime tick
+RACY_MTIME_NS = 2 * 10 ** 9
+
+def get_free_space(path):
+    """Returns (free bytes available to the user, st_dev) for path, or (None, None)."""
+    try:
+        st = os.statvfs(path)
+        return st.f_bavail * st.f_frsize, os.stat(path).st_dev
+    except OSError:
+        return None, None
+
+def compute_install_footprint(targets, sync_index, installed_packages, installed_provides=(), installed_versions=None):
+    """
+    Totals what installing `targets` would download and occupy, including repo
+    dependencies that are not installed yet (resolved through the sync index).
+    With installed_versions ({name: version}), installed targets at a different
+    version than the repo one (e.g. after a rollback) count as well, like -S --needed.
+
+    Returns a dict:
+        packages: repo packages that would be installed (targets + missing deps)
+        download: total download size in bytes
+        installed: total installed size in bytes
+        unknown: targets not in the sync repos (AUR etc.), size not known
+    """
+    satisfied = set(installed_packages) | set(installed_provides)
+    to_install = {}
+    unknown = []
+
+    queue = []
+    for target in targets:
+        record = sync_index.get(target) if sync_index else None
+        if target in installed_provides and target not in installed_packages:
+            # Satisfied by a provider (e.g. a -git variant); installing it would conflict
+            continue
+        if target in installed_packages:
+            if installed_versions is None or not record or installed_versions.get(target) == record["version"]:
+                continue
+        if record is None:
+            unknown.append(target)
+        else:
+            queue.append(record)
+
+    while queue:
+        record = queue.pop()
+        if record["name"] in to_install:
+            continue
+        to_install[record["name"]] = record
+        for dep in record["depends"]:
+            name = dep_name(dep)
+            if name in satisfied or name in to_install:
+                continue
+            provider = sync_index.find_provider(name)
+            if provider and provider["name"] not in to_install:
+                queue.append(provider)
+
+    return {
+        "packages": sorted(to_install),
+        "download": sum(r["download_size"] for r in to_install.values()),
+        "installed": sum(r["installed_size"] for r in to_install.values()),
+        "unknown": sorted(unknown),
+    }
+
+def plan_cached_install(targets, sync_index):
+    """
+    Footprint of targets against the shared installed-package state, plus the
+    package cache lookup. Returns (footprint, cache) as from compute_install_footprint
+    and find_cached_packages; the footprint download excludes cached bytes.
+    """
+    state = pacman_db.get_package_state()
+    installed = state.installed()
+    footprint = compute_install_footprint(targets, sync_index, installed, state.provided_names(), state.versions())
+    cache = find_cached_packages(footprint, sync_index)
+    footprint["download"] -= cache["saved"]
+    return footprint, cache
+
+def check_disk_space(footprint, root=ROOT_DIR, cache_dir=PKG_CACHE_DIR):
+    """
+    Compares a footprint against free space on the root filesystem and the pacman
+    package cache. Returns (free, problems) where free maps each path to its free
+    bytes (None if unknown) and problems is a list of human-readable messages.
+    """
+    root_free, root_dev = get_free_space(root)
+    cache_free, cache_dev = get_free_space(cache_dir)
+    free = {root: root_free, cache_dir: cache_free}
+    problems = []
+
+    if root_dev is not None and root_dev == cache_dev:
+        # Same filesystem: the downloads and the unpacked files share the space
+        needed = footprint["download"] + footprint["installed"]
+        if needed > root_free:
+            problems.append(
+                f"{root} needs {format_size(needed)} (downloads + install) but only {format_size(root_free)} is free."
+            )
+        return free, problems
+
+    if root_free is not None and footprint["installed"] > root_free:
+        problems.append(f"{root} needs {format_size(footprint['installed'])} but only {format_size(root_free)} is free.")
+    if cache_free is not None and footprint["download"] > cache_free:
+        problems.append(f"{cache_dir} needs {format_size(footprint['download'])} but only {format_size(cache_free)} is free.")
+    return free, problems
+
+def list_cache_dir(cache_dir=PKG_CACHE_DIR):
+    """File names in the package cache. Listed again only when the directory mtime changes."""
+    try:
+        mtime = os.stat(cache_dir).st_mtime_ns
+    except OSError:
+        return frozenset()
+    listing = _cache_listings.get(cache_dir)
+    if listing is None or listing[0] != mtime or time.time_ns() - mtime < RACY_MTIME_NS:
+        try:
+            listing = _cache_listings[cache_dir] = (mtime, frozenset(os.listdir(cache_dir)))
+        except OSError:
+            return frozenset()
+    return listing[1]
+
+def find_cached_packages(footprint, sync_index, cache_dir=PKG_CACHE_DIR):
+    """
+    Looks up the exact sync version of every package in a footprint in the
+    package cache (by its repo file name).
+
+    Returns a dict:
+        cached: {name: path} for packages whose exact file is already cached
+        missing: packages that still have to be downloaded
+        saved: download bytes avoided thanks to the cache
+        offline: True when the whole footprint can be installed with -U
+    """
+    present = list_cache_dir(cache_dir)
+    cached = {}
+    missing = []
+    saved = 0
+    for name in footprint["packages"]:
+        record = sync_index.get(name) if sync_index else None
+        filename = record.get("filename") if record else None
+        if filename and filename in present:
+            cached[name] = os.path.join(cache_dir, filename)
+            saved += record["download_size"]
+        else:
+            missing.append(name)
+
+    return {
+        "cached": cached,
+        "missing": missing,
+        "saved": saved,
+        "offline": bool(cached) and not missing and not footprint["unknown"],
+    }
+
+def offline_install_commands(cached, targets):
+    """
+    pacman -U commands installing a fully cached plan without touching the network.
+    Dependencies go first with --asdeps so they keep the install reason -S would give them.
+    """
+    targets = set(targets)
+    deps = [path for name, path in sorted(cached.items()) if name not in targets]
+    explicit = [path for name, path in sorted(cached.items()) if name in targets]
+    commands = []
+    if deps:
+        commands.append(["sudo", "pacman", "-U", "--noconfirm", "--needed", "--asdeps"] + deps)
+    if explicit:
+        commands.append(["sudo", "pacman", "-U", "--noconfirm", "--needed"] + explicit)
+    return commands
@@ -8,6 +8,7 @@ from textual.app import ComposeResult
 from textual.containers import Vertical, Horizontal
 from textual.widgets import Input, Button, SelectionList, Label, RichLog, Checkbox
 from textual.worker import Worker, WorkerState
+import pacman_db
 
 class PrinterSetup(Horizontal):
     def __init__(self, *args, **kwargs):
@@ -169,17 +170,12 @@ class PrinterSetup(Horizontal):
             return []
 
     def is_package_installed(self, package_name: str) -> bool:
-        """Check if a package is installed using pacman."""
-        try:
-            subprocess.run(
-                ["pacman", "-Qi", package_name],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        """Check if a package is installed (shared local DB snapshot, no pacman spawn)."""
+        return package_name in pacman_db.get_installed_packages()
+
+    async def get_installed_subset(self, packages) -> set[str]:
+        """Batched installed check for many packages, run off the event loop."""
+        return await asyncio.to_thread(pacman_db.filter_installed, list(packages))
 
     def log_message(self, message: str):
         """Log a message to the local RichLog and the main app's RichLog if available."""
@@ -355,7 +351,7 @@ class PrinterSetup(Horizontal):
             output = stdout.decode()
             lines = output.strip().split('\n')
             
-            drivers = []
+            results = []
             current_package = None
             package_pattern = re.compile(r'^([^/\s]+)/([^\s]+)\s+([^\s]+)')
             ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
@@ -372,20 +368,20 @@ class PrinterSetup(Horizontal):
                     if current_package:
                         # We shouldn't usually get here if yay output is standard (Repo/Name Desc),
                         # but to be safe against weird output or description parsing failures:
-                        drivers.append((f"{current_package} - [No Description]", current_package))
+                        results.append((current_package, "[No Description]"))
                         
                     current_package = match.group(2)
                 elif current_package and (line.startswith(" ") or line.startswith("\t")):
-                    description = line.strip()
-                    
-                    # Check if installed
-                    is_installed = self.is_package_installed(current_package)
-                    status_mark = "[Installed] " if is_installed else ""
-                    display_label = f"{status_mark}{current_package} - {description}"
-                    
-                    drivers.append((display_label, current_package))
+                    results.append((current_package, line.strip()))
                     current_package = None
 
+            # Label all results with one batched installed check
+            installed = await self.get_installed_subset(pkg for pkg, _ in results)
+            drivers = []
+            for pkg, description in results:
+                status_mark = "[Installed] " if pkg in installed else ""
+                drivers.append((f"{status_mark}{pkg} - {description}", pkg))
+
             driver_list = self.query_one("#driver_list", SelectionList)
             driver_list.clear_options()
             
@@ -534,12 +530,9 @@ class PrinterSetup(Horizontal):
         else:
             # We are in Driver Mode
             # Check if package is installed to enable Uninstall
-            any_installed = False
-            for pkg in selected:
-                # Check if it looks like a package name (no ://)
-                if "://" not in pkg and self.is_package_installed(pkg):
-                    any_installed = True
-                    break
+            # Check if it looks like a package name (no ://)
+            installed = pacman_db.filter_installed(pkg for pkg in selected if "://" not in pkg)
+            any_installed = bool(installed)
             
             uninstall_btn.disabled = not any_installed
             
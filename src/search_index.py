@@ -0,0 +1,115 @@
+import re
+import heapq
+from array import array
+
+TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+
+# Rank buckets (lower is better)
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_NAME = 2
+RANK_DESCRIPTION = 3
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class SearchIndex:
+    """
+    In-memory trigram/prefix index for instant package search.
+
+    Queries of 3+ characters use trigram postings (only the rarest two are
+    intersected, candidates are then verified by substring match). Shorter
+    queries use a token-prefix index over names and package ids.
+    Postings are compact arrays of document ids, so tens of thousands of repo
+    packages stay cheap to hold and query.
+    """
+
+    def __init__(self):
+        self.docs = [] # doc id -> (key, name, pkg, description, source)
+        self._names = [] # doc id -> lowercased "name pkg"
+        self._haystacks = [] # doc id -> lowercased "name pkg description"
+        self._keys = {} # key -> doc id
+        self._trigrams = {}
+        self._prefixes = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def add(self, key, name, pkg, description="", source=""):
+        """Adds a document. Keys already present are ignored (first add wins)."""
+        if key in self._keys:
+            return
+        doc_id = len(self.docs)
+        self._keys[key] = doc_id
+        self.docs.append((key, name, pkg, description, source))
+
+        names = f"{name} {pkg}".lower()
+        haystack = f"{names} {description}".lower()
+        self._names.append(names)
+        self._haystacks.append(haystack)
+
+        for gram in trigrams(haystack):
+            postings = self._trigrams.get(gram)
+            if postings is None:
+                postings = self._trigrams[gram] = array("I")
+            postings.append(doc_id)
+
+        prefixes = set()
+        for token in TOKEN_SPLIT.split(names):
+            if token:
+                prefixes.add(token[:1])
+                prefixes.add(token[:2])
+        for prefix in prefixes:
+            postings = self._prefixes.get(prefix)
+            if postings is None:
+                postings = self._prefixes[prefix] = array("I")
+            postings.append(doc_id)
+
+    def _candidates(self, query):
+        if len(query) < 3:
+            return self._prefixes.get(query, ())
+
+        postings = []
+        for gram in trigrams(query):
+            found = self._trigrams.get(gram)
+            if not found:
+                return ()
+            postings.append(found)
+        postings.sort(key=len)
+        if len(postings) == 1:
+            return postings[0]
+        # The rarest two narrow things down enough; the substring check does the rest
+        return set(postings[0]).intersection(postings[1])
+
+    def _rank(self, doc_id, query):
+        _key, name, pkg, _desc, _source = self.docs[doc_id]
+        lname = name.lower()
+        if pkg == query or lname == query:
+            return RANK_EXACT
+        if pkg.startswith(query) or lname.startswith(query):
+            return RANK_PREFIX
+        names = self._names[doc_id]
+        if query in names:
+            return RANK_NAME
+        if query in self._haystacks[doc_id]:
+            return RANK_DESCRIPTION
+        return None
+
+    def search(self, query, limit=100):
+        """Returns up to `limit` docs (key, name, pkg, description, source), best first."""
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        scored = []
+        for doc_id in self._candidates(query):
+            rank = self._rank(doc_id, query)
+            if rank is not None:
+                # Earlier docs (the curated catalog) win ties
+                scored.append((rank, doc_id))
+
+        best = heapq.nsmallest(limit, scored)
+        return [self.docs[doc_id] for _rank, doc_id in best]
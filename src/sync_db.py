@@ -0,0 +1,233 @@
+import os
+import io
+import gzip
+import lzma
+import bz2
+import tarfile
+import threading
+import subprocess
+
+import cache
+from pacman_db import parse_desc
+from dep_graph import dep_name
+
+SYNC_DB_DIR = "/var/lib/pacman/sync"
+PACMAN_CONF = "/etc/pacman.conf"
+
+# Magic bytes of the compressions repo-add can produce
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+BZIP2_MAGIC = b"BZh"
+
+def _zstd_decompress(data):
+    """Decompresses zstd data, preferring the optional python binding over the `zstd` CLI."""
+    try:
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    except ImportError:
+        pass
+    # zstd is a dependency of pacman itself, so the CLI is always present on Arch
+    res = subprocess.run(["zstd", "-dc"], input=data, capture_output=True, check=True)
+    return res.stdout
+
+def decompress_db(data):
+    """Returns the raw tar bytes of a sync DB, detecting its compression."""
+    if data.startswith(GZIP_MAGIC):
+        return gzip.decompress(data)
+    if data.startswith(ZSTD_MAGIC):
+        return _zstd_decompress(data)
+    if data.startswith(XZ_MAGIC):
+        return lzma.decompress(data)
+    if data.startswith(BZIP2_MAGIC):
+        return bz2.decompress(data)
+    # Uncompressed tar
+    return data
+
+def _int(fields, key):
+    try:
+        return int(fields.get(key, ["0"])[0])
+    except (ValueError, IndexError):
+        return 0
+
+def package_from_sync_desc(fields, repo):
+    """Builds a sync package record from parsed desc (+ legacy depends) fields."""
+    def first(key):
+        values = fields.get(key)
+        return values[0] if values else ""
+
+    return {
+        "name": first("NAME"),
+        "version": first("VERSION"),
+        "repo": repo,
+        "description": first("DESC"),
+        "filename": first("FILENAME"),
+        "download_size": _int(fields, "CSIZE"),
+        "installed_size": _int(fields, "ISIZE"),
+        "depends": fields.get("DEPENDS", []),
+        "optdepends": fields.get("OPTDEPENDS", []),
+        "provides": fields.get("PROVIDES", []),
+        "conflicts": fields.get("CONFLICTS", []),
+        "replaces": fields.get("REPLACES", []),
+    }
+
+def parse_sync_db_bytes(data, repo):
+    """Parses the (compressed) bytes of a sync DB. Returns dict name -> record."""
+    packages = {}
+    entries = {}
+    with tarfile.open(fileobj=io.BytesIO(decompress_db(data)), mode="r:") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            entry, _, filename = member.name.rpartition("/")
+            # Newer DBs only ship 'desc'; older ones split deps into 'depends'
+            if filename not in ("desc", "depends"):
+                continue
+            content = tar.extractfile(member).read().decode("utf-8", errors="replace")
+            entries.setdefault(entry, {}).update(parse_desc(content))
+
+    for fields in entries.values():
+        pkg = package_from_sync_desc(fields, repo)
+        if pkg["name"]:
+            packages[pkg["name"]] = pkg
+    return packages
+
+def parse_sync_db(path, repo=None):
+    """Parses a sync DB file (e.g. /var/lib/pacman/sync/extra.db)."""
+    if repo is None:
+        repo = os.path.basename(path)[:-len(".db")]
+    with open(path, "rb") as f:
+        return parse_sync_db_bytes(f.read(), repo)
+
+def get_repo_order(conf_path=PACMAN_CONF):
+    """Returns repo names in pacman.conf order (which decides who wins on duplicates)."""
+    repos = []
+    try:
+        with open(conf_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("[") and line.endswith("]"):
+                    name = line[1:-1].strip()
+                    if name != "options":
+                        repos.append(name)
+    except OSError:
+        pass
+    return repos
+
+def list_sync_dbs(sync_dir=SYNC_DB_DIR, conf_path=PACMAN_CONF):
+    """Returns [(repo, path)] for every sync DB, ordered by pacman.conf priority."""
+    try:
+        available = {
+            name[:-len(".db")]: os.path.join(sync_dir, name)
+            for name in os.listdir(sync_dir) if name.endswith(".db")
+        }
+    except OSError:
+        return []
+
+    ordered = [repo for repo in get_repo_order(conf_path) if repo in available]
+    ordered += sorted(repo for repo in available if repo not in ordered)
+    return [(repo, available[repo]) for repo in ordered]
+
+class SyncIndex:
+    """
+    Offline index of every package in the sync repos.
+    Maps name -> record with repo, version, sizes, depends, provides and conflicts.
+    Repos are re-parsed only when their .db file changes.
+
+    With a cache_dir, each parsed repo is persisted there keyed by the mtime and
+    size of its .db, so later launches skip decompression and parsing entirely.
+    """
+
+    def __init__(self, sync_dir=SYNC_DB_DIR, conf_path=PACMAN_CONF, cache_dir=None):
+        self.sync_dir = sync_dir
+        self.conf_path = conf_path
+        self.cache_dir = cache_dir
+        self.packages = {}
+        self._providers = None # virtual name -> first providing package (built lazily)
+        self._repos = {} # repo -> (stat_key, packages)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stat_key(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def load_repo(self, repo, path):
+        """Parses a single repo. Returns its dict of packages."""
+        return parse_sync_db(path, repo)
+
+    def cache_path(self, repo):
+        return os.path.join(self.cache_dir, f"{repo}.cache")
+
+    def load_repo_cached(self, repo, path, key):
+        """Loads a repo from the on-disk cache, re-parsing (and re-caching) if stale."""
+        if self.cache_dir:
+            packages = cache.load(self.cache_path(repo), key)
+            if packages is not None:
+                return packages
+
+        packages = self.load_repo(repo, path)
+        if self.cache_dir:
+            cache.save(self.cache_path(repo), key, packages)
+        return packages
+
+    def refresh(self):
+        """Re-parses changed repos and rebuilds the merged view. Returns self."""
+        with self._lock:
+            repos = {}
+            changed = False
+            dbs = list_sync_dbs(self.sync_dir, self.conf_path)
+            for repo, path in dbs:
+                try:
+                    key = self.stat_key(path)
+                    cached = self._repos.get(repo)
+                    if cached and cached[0] == key:
+                        repos[repo] = cached
+                        continue
+                    repos[repo] = (key, self.load_repo_cached(repo, path, key))
+                    changed = True
+                except Exception:
+                    continue
+
+            if changed or set(repos) != set(self._repos):
+                merged = {}
+                # Earlier repos in pacman.conf take precedence
+                for repo, _path in reversed(dbs):
+                    if repo in repos:
+                        merged.update(repos[repo][1])
+                self.packages = merged
+                self._providers = None
+            self._repos = repos
+        return self
+
+    def get(self, name):
+        return self.packages.get(name)
+
+    def find_provider(self, name):
+        """Returns the package satisfying a name: the package itself, else a provider."""
+        pkg = self.packages.get(name)
+        if pkg:
+            return pkg
+        if self._providers is None:
+            providers = {}
+            for pkg_name, record in self.packages.items():
+                for provide in record["provides"]:
+                    providers.setdefault(dep_name(provide), pkg_name)
+            self._providers = providers
+        provider = self._providers.get(name)
+        return self.packages.get(provider) if provider else None
+
+    def __contains__(self, name):
+        return name in self.packages
+
+    def __len__(self):
+        return len(self.packages)
+
+_INDEX = None
+
+def get_sync_index():
+    """Returns the shared SyncIndex, refreshed against the current sync DBs."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = SyncIndex(cache_dir=cache.get_cache_dir("sync"))
+    return _INDEX.refresh()
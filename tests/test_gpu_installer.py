@@ -172,5 +172,27 @@ class TestGpuInstaller(unittest.TestCase):
         # Verify mkinitcpio replacement logic
         self.assertIn('if command -v mkinitcpio >/dev/null; then sudo mkinitcpio -P', cmd)
 
+    @patch('src.gpu_installer.getpass.getuser')
+    def test_generate_installation_command_offline(self, mock_getuser):
+        mock_getuser.return_value = 'testuser'
+
+        plan = {
+            "groups": [],
+            "aur_packages": [],
+            "packages": ["cuda", "cudnn"],
+            "post_install_cmds": [],
+            "services": [],
+            "offline": True,
+            "offline_cmds": [
+                ["sudo", "pacman", "-U", "--noconfirm", "--needed", "/var/cache/pacman/pkg/cuda-12.4.1-1-x86_64.pkg.tar.zst"],
+            ]
+        }
+
+        cmd = gpu_installer.generate_installation_command(plan)
+
+        # Installs the cached files instead of downloading through -S
+        self.assertIn('sudo pacman -U --noconfirm --needed /var/cache/pacman/pkg/cuda-12.4.1-1-x86_64.pkg.tar.zst', cmd)
+        self.assertNotIn('pacman -S', cmd)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import gsp_manager
+
+class TestNvidiaProbe(unittest.TestCase):
+
+    def setUp(self):
+        # The probe is memoized; start every test from a cold cache
+        gsp_manager._probe.cache_clear()
+
+    @patch('gsp_manager.read_proc_version')
+    @patch('gsp_manager.query_gpu_name')
+    @patch('gsp_manager.pacman_db.filter_installed')
+    def test_compatible_and_memoized(self, mock_installed, mock_name, mock_proc):
+        mock_installed.return_value = {'nvidia-dkms'}
+        mock_name.return_value = "NVIDIA GeForce RTX 4080"
+        mock_proc.return_value = "NVRM version: NVIDIA UNIX x86_64 Kernel Module  550.78"
+
+        self.assertEqual(gsp_manager.check_nvidia_compatibility(), "COMPATIBLE")
+        self.assertFalse(gsp_manager.is_blackwell())
+        probe = gsp_manager.probe_nvidia()
+        self.assertEqual(probe["gpu_name"], "NVIDIA GeForce RTX 4080")
+
+        # nvidia-smi and /proc are read once for all callers
+        mock_name.assert_called_once()
+        mock_proc.assert_called_once()
+        # Package membership is a single batched lookup per call
+        mock_installed.assert_called_with(gsp_manager.WHITELIST + gsp_manager.BLACKLIST)
+
+    @patch('gsp_manager.read_proc_version')
+    @patch('gsp_manager.query_gpu_name')
+    @patch('gsp_manager.pacman_db.filter_installed')
+    def test_driver_change_invalidates_probe(self, mock_installed, mock_name, mock_proc):
+        mock_name.return_value = "NVIDIA GeForce RTX 4080"
+        mock_proc.return_value = ""
+
+        mock_installed.return_value = {'nvidia-dkms'}
+        self.assertEqual(gsp_manager.check_nvidia_compatibility(), "COMPATIBLE")
+
+        mock_installed.return_value = {'nvidia-open-dkms'}
+        self.assertEqual(gsp_manager.check_nvidia_compatibility(), "INCOMPATIBLE_OPEN")
+
+    @patch('gsp_manager.read_proc_version')
+    @patch('gsp_manager.query_gpu_name')
+    @patch('gsp_manager.pacman_db.filter_installed')
+    def test_failed_gpu_query_is_not_memoized(self, mock_installed, mock_name, mock_proc):
+        mock_installed.return_value = {'nvidia'}
+        mock_proc.return_value = ""
+        mock_name.return_value = ""
+        self.assertEqual(gsp_manager.probe_nvidia()["gpu_name"], "")
+
+        mock_name.return_value = "NVIDIA GeForce RTX 5090"
+        self.assertEqual(gsp_manager.check_nvidia_compatibility(), "INCOMPATIBLE_BLACKWELL")
+        self.assertEqual(mock_name.call_count, 2)
+
+    @patch('gsp_manager.read_proc_version')
+    @patch('gsp_manager.query_gpu_name')
+    @patch('gsp_manager.pacman_db.filter_installed')
+    def test_no_driver_skips_nvidia_smi(self, mock_installed, mock_name, mock_proc):
+        mock_installed.return_value = set()
+        mock_proc.return_value = ""
+
+        self.assertEqual(gsp_manager.check_nvidia_compatibility(), "INCOMPATIBLE_NO_DRIVER")
+        mock_name.assert_not_called()
+
+    @patch('gsp_manager.read_proc_version')
+    @patch('gsp_manager.query_gpu_name')
+    @patch('gsp_manager.pacman_db.filter_installed')
+    def test_blackwell_and_open_module(self, mock_installed, mock_name, mock_proc):
+        mock_installed.return_value = {'nvidia'}
+        mock_name.return_value = "NVIDIA GeForce RTX 5090"
+        mock_proc.return_value = ""
+        self.assertEqual(gsp_manager.check_nvidia_compatibility(), "INCOMPATIBLE_BLACKWELL")
+
+        gsp_manager._probe.cache_clear()
+        mock_name.return_value = "NVIDIA RTX 5000 Ada Generation"
+        mock_proc.return_value = "NVRM version: NVIDIA UNIX Open Kernel Module for x86_64  550.78"
+        self.assertEqual(gsp_manager.check_nvidia_compatibility(), "INCOMPATIBLE_OPEN")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+import os
+import sys
+import shutil
+import asyncio
+import unittest
+import tempfile
+from unittest.mock import patch
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pacman_db
+
+KITTY_DESC = """%NAME%
+kitty
+
+%VERSION%
+0.35.2-1
+
+%DESC%
+A modern, hackable, featureful, OpenGL-based terminal emulator
+
+%SIZE%
+41943040
+
+%DEPENDS%
+python3
+harfbuzz>=8.0
+
+%OPTDEPENDS%
+imagemagick: viewing images with icat
+
+%PROVIDES%
+terminal-emulator
+"""
+
+LIBFOO_DESC = """%NAME%
+libfoo
+
+%VERSION%
+1.2-3
+
+%SIZE%
+1024
+
+%REASON%
+1
+"""
+
+def write_local_db(root, descs):
+    for dirname, content in descs.items():
+        entry = os.path.join(root, dirname)
+        os.makedirs(entry)
+        with open(os.path.join(entry, "desc"), "w") as f:
+            f.write(content)
+    # ALPM_DB_VERSION is a plain file and must be skipped
+    with open(os.path.join(root, "ALPM_DB_VERSION"), "w") as f:
+        f.write("9\n")
+
+class TestPacmanDB(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = self.tmp.name
+        write_local_db(self.db_path, {
+            "kitty-0.35.2-1": KITTY_DESC,
+            "libfoo-1.2-3": LIBFOO_DESC,
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_desc_fields(self):
+        fields = pacman_db.parse_desc(KITTY_DESC)
+        self.assertEqual(fields["NAME"], ["kitty"])
+        self.assertEqual(fields["DEPENDS"], ["python3", "harfbuzz>=8.0"])
+
+    def test_read_local_db(self):
+        packages = pacman_db.read_local_db(self.db_path)
+        self.assertEqual(set(packages), {"kitty", "libfoo"})
+
+        kitty = packages["kitty"]
+        self.assertEqual(kitty["version"], "0.35.2-1")
+        self.assertEqual(kitty["size"], 41943040)
+        self.assertEqual(kitty["reason"], pacman_db.REASON_EXPLICIT)
+        self.assertEqual(kitty["provides"], ["terminal-emulator"])
+        self.assertEqual(kitty["optdepends"], ["imagemagick: viewing images with icat"])
+
+        self.assertEqual(packages["libfoo"]["reason"], pacman_db.REASON_DEPEND)
+        self.assertEqual(packages["libfoo"]["depends"], [])
+
+    @patch('pacman_db.subprocess.run')
+    def test_get_installed_packages_reads_directory(self, mock_run):
+        installed = pacman_db.get_installed_packages(self.db_path)
+        self.assertEqual(installed, {"kitty", "libfoo"})
+        mock_run.assert_not_called()
+
+    @patch('pacman_db.subprocess.run')
+    def test_get_installed_packages_fallback(self, mock_run):
+        mock_run.return_value.returncode = 0
+        mock_run.return_value.stdout = "steam\nmesa\n"
+
+        installed = pacman_db.get_installed_packages(os.path.join(self.db_path, "missing"))
+        self.assertEqual(installed, {"steam", "mesa"})
+
+    @patch('pacman_db.subprocess.run')
+    def test_filter_installed_batched(self, mock_run):
+        found = pacman_db.filter_installed(["kitty", "brother-dcp-l2550dw", "libfoo"], self.db_path)
+        self.assertEqual(found, {"kitty", "libfoo"})
+        mock_run.assert_not_called()
+
+class TestPackageState(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "local")
+        os.makedirs(self.db_path)
+        write_local_db(self.db_path, {"kitty-0.35.2-1": KITTY_DESC})
+        self.state = pacman_db.PackageState(self.db_path)
+
+    def tearDown(self):
+        self.state.stop_watching()
+        self.tmp.cleanup()
+
+    def test_refresh_reads_only_changed_entries(self):
+        self.assertEqual(self.state.refresh(), {"kitty"})
+
+        write_local_db(self.db_path, {"libfoo-1.2-3": LIBFOO_DESC})
+
+        with patch('pacman_db.read_local_entry', wraps=pacman_db.read_local_entry) as mock_read:
+            changed = self.state.refresh()
+        self.assertEqual(changed, {"libfoo"})
+        mock_read.assert_called_once()
+        self.assertEqual(self.state.installed(), {"kitty", "libfoo"})
+
+    def test_refresh_notifies_subscribers_on_removal(self):
+        self.state.refresh()
+        received = []
+        self.state.subscribe(received.append)
+
+        shutil.rmtree(os.path.join(self.db_path, "kitty-0.35.2-1"))
+        self.state.refresh()
+        self.assertEqual(received, [{"kitty"}])
+
+        # No change -> no notification
+        self.state.refresh()
+        self.assertEqual(len(received), 1)
+
+    def test_refresh_rereads_entries_rewritten_in_place(self):
+        self.state.refresh()
+        # pacman -D --asdeps rewrites desc without touching the directory
+        desc = os.path.join(self.db_path, "kitty-0.35.2-1", "desc")
+        with open(desc, "w") as f:
+            f.write(KITTY_DESC + "\n%REASON%\n1\n")
+        mtime = os.stat(desc).st_mtime_ns
+        os.utime(desc, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+        self.assertEqual(self.state.refresh(), {"kitty"})
+        self.assertEqual(self.state.packages["kitty"]["reason"], pacman_db.REASON_DEPEND)
+        self.assertEqual(self.state.refresh(), set())
+
+    def test_silent_refresh_changes_are_delivered_later(self):
+        self.state.refresh()
+        received = []
+        self.state.subscribe(received.append)
+
+        write_local_db(self.db_path, {"libfoo-1.2-3": LIBFOO_DESC})
+        self.assertEqual(self.state.installed(), {"kitty", "libfoo"})
+        self.assertEqual(received, [])
+
+        self.assertEqual(self.state.refresh(), {"libfoo"})
+        self.assertEqual(received, [{"libfoo"}])
+
+    def test_records_refresh_when_not_watched(self):
+        self.assertEqual(set(self.state.records()), {"kitty"})
+        write_local_db(self.db_path, {"libfoo-1.2-3": LIBFOO_DESC})
+        self.assertEqual(self.state.records()["libfoo"]["version"], "1.2-3")
+
+    def test_providers_index(self):
+        self.state.refresh()
+        self.assertEqual(self.state.providers(), {"terminal-emulator": ("kitty",)})
+        self.assertEqual(self.state.satisfier("kitty"), "kitty")
+        self.assertEqual(self.state.satisfier("terminal-emulator"), "kitty")
+        self.assertIsNone(self.state.satisfier("alacritty"))
+
+        # The index is rebuilt when the package set changes
+        shutil.rmtree(os.path.join(self.db_path, "kitty-0.35.2-1"))
+        self.state.refresh()
+        self.assertIsNone(self.state.satisfier("terminal-emulator"))
+
+    def test_inotify_waits_for_lock_release(self):
+        received = []
+        lock_path = os.path.join(self.tmp.name, "db.lck")
+
+        async def scenario():
+            self.assertTrue(self.state.start_watching())
+            self.state.subscribe(received.append)
+
+            open(lock_path, "w").close()
+            write_local_db(self.db_path, {"libfoo-1.2-3": LIBFOO_DESC})
+            await asyncio.sleep(0.05)
+            # Transaction still holds the lock
+            self.assertEqual(received, [])
+
+            os.remove(lock_path)
+            await asyncio.sleep(0.05)
+            self.state.stop_watching()
+
+        asyncio.run(scenario())
+        self.assertEqual(received, [{"libfoo"}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import tempfile
+import unittest
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pkg_cache
+
+class TestPkgCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def touch(self, name, size=10):
+        with open(os.path.join(self.dir, name), "wb") as f:
+            f.write(b"x" * size)
+
+    def test_parse_pkg_filename(self):
+        self.assertEqual(
+            pkg_cache.parse_pkg_filename("linux-firmware-20240312.3b128b60-1-any.pkg.tar.zst"),
+            ("linux-firmware", "20240312.3b128b60-1", "any")
+        )
+        self.assertEqual(
+            pkg_cache.parse_pkg_filename("mesa-1:24.0.3-1-x86_64.pkg.tar.xz"),
+            ("mesa", "1:24.0.3-1", "x86_64")
+        )
+        self.assertIsNone(pkg_cache.parse_pkg_filename("kitty-0.31.0-1-x86_64.pkg.tar.zst.part"))
+        self.assertIsNone(pkg_cache.parse_pkg_filename("kitty-0.31.0-1-x86_64.pkg.tar.zst.sig"))
+
+    def test_keep_newest_and_installed(self):
+        for version in ("0.9-1", "0.10-1", "0.11-1", "0.11-2", "1:0.1-1"):
+            self.touch(f"kitty-{version}-x86_64.pkg.tar.zst", size=100)
+            self.touch(f"kitty-{version}-x86_64.pkg.tar.zst.sig", size=1)
+        self.touch("kitty-0.12-1-x86_64.pkg.tar.zst.part")
+
+        index = pkg_cache.index_cache(self.dir)
+        plan = pkg_cache.plan_prune(index, {"kitty": "0.9-1"}, keep=2)
+        removed = sorted(os.path.basename(p) for p in plan["remove"])
+        # Kept: 1:0.1-1 and 0.11-2 (newest two) plus the installed 0.9-1
+        self.assertEqual(removed, [
+            "kitty-0.10-1-x86_64.pkg.tar.zst", "kitty-0.10-1-x86_64.pkg.tar.zst.sig",
+            "kitty-0.11-1-x86_64.pkg.tar.zst", "kitty-0.11-1-x86_64.pkg.tar.zst.sig",
+        ])
+        self.assertEqual(plan["freed"], 202)
+        self.assertEqual(plan["kept"], 3)
+
+    def test_plan_is_fast_on_large_caches(self):
+        index = {}
+        for p in range(2000):
+            index[(f"pkg{p}", "x86_64")] = [
+                {"version": f"{major}.{minor}-1", "paths": [f"/c/pkg{p}-{major}.{minor}"], "size": 1}
+                for major in range(2) for minor in range(5)
+            ]
+        start = time.perf_counter()
+        plan = pkg_cache.plan_prune(index, {}, keep=3)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(len(plan["remove"]), 2000 * 7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import prefetch
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.local = os.path.join(self.tmp.name, "local")
+        self.sync = os.path.join(self.tmp.name, "sync")
+        os.makedirs(self.local)
+        os.makedirs(self.sync)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_download_dbpath_links_real_dbs(self):
+        dbpath = prefetch.make_download_dbpath(self.local, self.sync)
+        with dbpath:
+            self.assertEqual(os.readlink(os.path.join(dbpath.name, "local")), self.local)
+            self.assertEqual(os.readlink(os.path.join(dbpath.name, "sync")), self.sync)
+        self.assertFalse(os.path.exists(dbpath.name))
+        self.assertTrue(os.path.isdir(self.local))
+
+    def test_download_command(self):
+        self.assertEqual(
+            prefetch.download_command(["kitty", "fish"], "/tmp/db"),
+            ["sudo", "pacman", "-Sw", "--noconfirm", "--needed", "--dbpath", "/tmp/db", "kitty", "fish"]
+        )
+
+    def test_aur_clone_dir(self):
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": "/home/u/.cache"}):
+            self.assertEqual(prefetch.get_aur_clone_dir("yay"), "/home/u/.cache/yay")
+            self.assertEqual(prefetch.get_aur_clone_dir("paru"), "/home/u/.cache/paru/clone")
+            self.assertIsNone(prefetch.get_aur_clone_dir("trizen"))
+
+    def test_aur_commands(self):
+        self.assertEqual(prefetch.clone_command("paru", ["foo-git"]), ["paru", "-G", "foo-git"])
+        self.assertIn("--verifysource", prefetch.verify_source_command())
+
+if __name__ == '__main__':
+    unittest.main()
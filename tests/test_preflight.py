@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import preflight
+from sync_db import SyncIndex
+
+def record(name, csize, isize, depends=(), provides=()):
+    return {
+        "name": name, "version": "1.0-1", "repo": "extra", "description": "",
+        "download_size": csize, "installed_size": isize,
+        "depends": list(depends), "provides": list(provides), "conflicts": [],
+    }
+
+class TestPreflight(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SyncIndex(sync_dir="/nonexistent")
+        self.index.packages = {
+            "steam": record("steam", 100, 1000, depends=["lib32-glibc", "vulkan-driver"]),
+            "lib32-glibc": record("lib32-glibc", 10, 50),
+            "vulkan-radeon": record("vulkan-radeon", 20, 80, provides=["vulkan-driver"]),
+            "kitty": record("kitty", 30, 300, depends=["python"]),
+        }
+
+    def test_footprint_includes_missing_dependencies(self):
+        footprint = preflight.compute_install_footprint(
+            ["steam", "brave-bin"], self.index, installed_packages={"python"}
+        )
+        self.assertEqual(footprint["packages"], ["lib32-glibc", "steam", "vulkan-radeon"])
+        self.assertEqual(footprint["download"], 130)
+        self.assertEqual(footprint["installed"], 1130)
+        self.assertEqual(footprint["unknown"], ["brave-bin"])
+
+    def test_installed_targets_and_provided_deps_are_skipped(self):
+        footprint = preflight.compute_install_footprint(
+            ["steam", "kitty"], self.index,
+            installed_packages={"kitty", "lib32-glibc"}, installed_provides={"vulkan-driver"}
+        )
+        self.assertEqual(footprint["packages"], ["steam"])
+
+    @patch('preflight.get_free_space')
+    def test_disk_space_separate_filesystems(self, mock_free):
+        mock_free.side_effect = lambda path: (500, 1) if path == "/" else (50, 2)
+        footprint = {"download": 130, "installed": 1130}
+        free, problems = preflight.check_disk_space(footprint)
+        self.assertEqual(free, {"/": 500, preflight.PKG_CACHE_DIR: 50})
+        self.assertEqual(len(problems), 2)
+
+    @patch('preflight.get_free_space')
+    def test_disk_space_shared_filesystem(self, mock_free):
+        mock_free.return_value = (1200, 1)
+        _free, problems = preflight.check_disk_space({"download": 130, "installed": 1000})
+        # 1130 fits in 1200 only if counted once, but downloads and files share the disk
+        self.assertEqual(problems, [])
+        _free, problems = preflight.check_disk_space({"download": 300, "installed": 1000})
+        self.assertEqual(len(problems), 1)
+
+    def test_targets_satisfied_by_a_provider_are_skipped(self):
+        footprint = preflight.compute_install_footprint(
+            ["vulkan-driver", "steam"], self.index, installed_packages={"steam"},
+            installed_provides={"vulkan-driver"}
+        )
+        self.assertEqual(footprint["packages"], [])
+        self.assertEqual(footprint["unknown"], [])
+
+    def test_installed_versions_count_rolled_back_targets(self):
+        footprint = preflight.compute_install_footprint(
+            ["lib32-glibc"], self.index, installed_packages={"lib32-glibc"},
+            installed_versions={"lib32-glibc": "0.9-1"}
+        )
+        self.assertEqual(footprint["packages"], ["lib32-glibc"])
+
+    def test_cache_listing_is_reused_until_the_directory_changes(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            open(os.path.join(cache_dir, "steam-1.0-1-x86_64.pkg.tar.zst"), "w").close()
+            os.utime(cache_dir, ns=(10 ** 18, 10 ** 18))
+            with patch('preflight.os.listdir', wraps=os.listdir) as mock_listdir:
+                self.assertEqual(preflight.list_cache_dir(cache_dir), {"steam-1.0-1-x86_64.pkg.tar.zst"})
+                preflight.list_cache_dir(cache_dir)
+                self.assertEqual(mock_listdir.call_count, 1)
+
+                open(os.path.join(cache_dir, "kitty-1.0-1-x86_64.pkg.tar.zst"), "w").close()
+                os.utime(cache_dir, ns=(10 ** 18 + 1, 10 ** 18 + 1))
+                self.assertEqual(len(preflight.list_cache_dir(cache_dir)), 2)
+                self.assertEqual(mock_listdir.call_count, 2)
+
+    def test_find_cached_packages(self):
+        for name, pkg in self.index.packages.items():
+            pkg["filename"] = f"{name}-1.0-1-x86_64.pkg.tar.zst"
+        footprint = preflight.compute_install_footprint(["steam"], self.index, installed_packages=set())
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for name in ("steam", "lib32-glibc"):
+                open(os.path.join(cache_dir, f"{name}-1.0-1-x86_64.pkg.tar.zst"), "w").close()
+            # A different version of a package does not count
+            open(os.path.join(cache_dir, "vulkan-radeon-0.9-1-x86_64.pkg.tar.zst"), "w").close()
+
+            cache = preflight.find_cached_packages(footprint, self.index, cache_dir)
+            self.assertEqual(sorted(cache["cached"]), ["lib32-glibc", "steam"])
+            self.assertEqual(cache["missing"], ["vulkan-radeon"])
+            self.assertEqual(cache["saved"], 110)
+            self.assertFalse(cache["offline"])
+
+            open(os.path.join(cache_dir, "vulkan-radeon-1.0-1-x86_64.pkg.tar.zst"), "w").close()
+            cache = preflight.find_cached_packages(footprint, self.index, cache_dir)
+            self.assertTrue(cache["offline"])
+
+            commands = preflight.offline_install_commands(cache["cached"], ["steam"])
+            self.assertEqual(commands[0][:6], ["sudo", "pacman", "-U", "--noconfirm", "--needed", "--asdeps"])
+            self.assertEqual([os.path.basename(p) for p in commands[0][6:]], [
+                "lib32-glibc-1.0-1-x86_64.pkg.tar.zst", "vulkan-radeon-1.0-1-x86_64.pkg.tar.zst"
+            ])
+            self.assertEqual([os.path.basename(p) for p in commands[1][5:]], ["steam-1.0-1-x86_64.pkg.tar.zst"])
+
+if __name__ == '__main__':
+    unittest.main()
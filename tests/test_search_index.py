@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import unittest
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from search_index import SearchIndex
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("kitty", "Kitty", "kitty", "GPU-accelerated terminal emulator.", "pacman")
+        self.index.add("alacritty", "Alacritty", "alacritty", "GPU-accelerated terminal emulator.", "pacman")
+        self.index.add("heroic-games-launcher-bin", "Heroic Launcher", "heroic-games-launcher-bin", "Game launcher for Epic Games and GOG.", "aur")
+        self.index.add("steam", "Steam", "steam", "Video game digital distribution service.", "pacman")
+
+    def keys(self, query, **kwargs):
+        return [doc[0] for doc in self.index.search(query, **kwargs)]
+
+    def test_exact_and_prefix_rank_first(self):
+        self.index.add("kitty-terminfo", "kitty-terminfo", "kitty-terminfo", "Terminfo for kitty", "extra")
+        self.assertEqual(self.keys("kitty"), ["kitty", "kitty-terminfo"])
+
+    def test_description_matches_rank_after_names(self):
+        # "game" is in heroic's pkg id but only in steam's description
+        self.assertEqual(self.keys("game"), ["heroic-games-launcher-bin", "steam"])
+
+    def test_short_query_uses_token_prefixes(self):
+        self.assertEqual(self.keys("ga"), ["heroic-games-launcher-bin"])
+        self.assertEqual(self.keys("k"), ["kitty"])
+
+    def test_no_match_and_empty(self):
+        self.assertEqual(self.keys("zzzz"), [])
+        self.assertEqual(self.keys("   "), [])
+
+    def test_duplicate_keys_keep_first(self):
+        self.index.add("kitty", "kitty", "kitty", "repo copy", "extra")
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.search("kitty")[0][4], "pacman")
+
+    def test_large_index_query_is_fast(self):
+        index = SearchIndex()
+        for i in range(20000):
+            index.add(f"pkg-{i}", f"pkg-{i}", f"pkg-{i}", f"library number {i} for testing", "extra")
+
+        start = time.perf_counter()
+        results = index.search("pkg-1999", limit=100)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(results[0][0], "pkg-1999")
+        # Well within a single frame
+        self.assertLess(elapsed, 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import io
+import os
+import sys
+import gzip
+import shutil
+import tarfile
+import tempfile
+import subprocess
+import unittest
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import sync_db
+
+def make_desc(name, version, csize, isize, depends=(), provides=()):
+    lines = [
+        "%FILENAME%", f"{name}-{version}-x86_64.pkg.tar.zst", "",
+        "%NAME%", name, "",
+        "%VERSION%", version, "",
+        "%DESC%", f"{name} description", "",
+        "%CSIZE%", str(csize), "",
+        "%ISIZE%", str(isize), "",
+    ]
+    if depends:
+        lines += ["%DEPENDS%", *depends, ""]
+    if provides:
+        lines += ["%PROVIDES%", *provides, ""]
+    return "\n".join(lines) + "\n"
+
+def make_db_tar(entries):
+    """entries: dict of 'name-ver' -> {filename: content}. Returns uncompressed tar bytes."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for entry, files in entries.items():
+            info = tarfile.TarInfo(entry)
+            info.type = tarfile.DIRTYPE
+            tar.addfile(info)
+            for filename, content in files.items():
+                data = content.encode()
+                info = tarfile.TarInfo(f"{entry}/{filename}")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+CORE = {
+    "kitty-0.35.2-1": {"desc": make_desc("kitty", "0.35.2-1", 9000000, 41943040, depends=["python3"])},
+    "mesa-1:24.1.0-1": {"desc": make_desc("mesa", "1:24.1.0-1", 100, 200, provides=["opengl-driver"])},
+}
+EXTRA = {
+    "kitty-0.30.0-1": {"desc": make_desc("kitty", "0.30.0-1", 1, 1)},
+    # Legacy layout with a separate depends file
+    "steam-1.0.0.79-1": {
+        "desc": make_desc("steam", "1.0.0.79-1", 3000, 4000),
+        "depends": "%DEPENDS%\nbash\ncurl\n\n%CONFLICTS%\nsteam-native\n",
+    },
+}
+
+class TestSyncDB(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sync_dir = os.path.join(self.tmp.name, "sync")
+        os.makedirs(self.sync_dir)
+        self.conf = os.path.join(self.tmp.name, "pacman.conf")
+        with open(self.conf, "w") as f:
+            f.write("[options]\nHoldPkg = pacman\n\n[core]\nInclude = x\n\n[extra]\nInclude = x\n")
+
+        with open(os.path.join(self.sync_dir, "core.db"), "wb") as f:
+            f.write(gzip.compress(make_db_tar(CORE)))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_extra(self, compressor):
+        with open(os.path.join(self.sync_dir, "extra.db"), "wb") as f:
+            f.write(compressor(make_db_tar(EXTRA)))
+
+    def test_parse_gzip_db(self):
+        packages = sync_db.parse_sync_db(os.path.join(self.sync_dir, "core.db"))
+        kitty = packages["kitty"]
+        self.assertEqual(kitty["repo"], "core")
+        self.assertEqual(kitty["version"], "0.35.2-1")
+        self.assertEqual(kitty["download_size"], 9000000)
+        self.assertEqual(kitty["installed_size"], 41943040)
+        self.assertEqual(kitty["depends"], ["python3"])
+        self.assertEqual(packages["mesa"]["provides"], ["opengl-driver"])
+
+    @unittest.skipUnless(shutil.which("zstd"), "zstd CLI not available")
+    def test_parse_zstd_db_with_legacy_depends(self):
+        def zstd(data):
+            return subprocess.run(["zstd", "-c", "-q"], input=data, capture_output=True, check=True).stdout
+
+        self.write_extra(zstd)
+        packages = sync_db.parse_sync_db(os.path.join(self.sync_dir, "extra.db"))
+        self.assertEqual(packages["steam"]["depends"], ["bash", "curl"])
+        self.assertEqual(packages["steam"]["conflicts"], ["steam-native"])
+
+    def test_index_respects_repo_order(self):
+        self.write_extra(lambda data: data)
+        index = sync_db.SyncIndex(self.sync_dir, self.conf).refresh()
+
+        self.assertEqual(len(index), 3)
+        # core comes first in pacman.conf and wins for duplicates
+        self.assertEqual(index.get("kitty")["repo"], "core")
+        self.assertEqual(index.get("steam")["repo"], "extra")
+        self.assertNotIn("firefox", index)
+
+    def test_index_reparses_only_changed_repos(self):
+        self.write_extra(gzip.compress)
+        index = sync_db.SyncIndex(self.sync_dir, self.conf)
+        parsed = []
+        original = index.load_repo
+        index.load_repo = lambda repo, path: parsed.append(repo) or original(repo, path)
+
+        index.refresh()
+        self.assertEqual(sorted(parsed), ["core", "extra"])
+
+        parsed.clear()
+        index.refresh()
+        self.assertEqual(parsed, [])
+
+        # Simulate `pacman -Sy` updating only extra
+        self.write_extra(lambda data: data)
+        os.utime(os.path.join(self.sync_dir, "extra.db"), ns=(1, 1))
+        index.refresh()
+        self.assertEqual(parsed, ["extra"])
+
+    def test_disk_cache_survives_restart(self):
+        self.write_extra(gzip.compress)
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        first = sync_db.SyncIndex(self.sync_dir, self.conf, cache_dir=cache_dir).refresh()
+        self.assertTrue(os.path.exists(os.path.join(cache_dir, "core.cache")))
+
+        # A fresh process loads every repo from the cache without parsing
+        second = sync_db.SyncIndex(self.sync_dir, self.conf, cache_dir=cache_dir)
+        parsed = []
+        original = second.load_repo
+        second.load_repo = lambda repo, path: parsed.append(repo) or original(repo, path)
+        second.refresh()
+        self.assertEqual(parsed, [])
+        self.assertEqual(second.packages, first.packages)
+
+        # Only the repo whose .db changed is rebuilt
+        os.utime(os.path.join(self.sync_dir, "core.db"), ns=(1, 1))
+        third = sync_db.SyncIndex(self.sync_dir, self.conf, cache_dir=cache_dir)
+        third.load_repo = lambda repo, path: parsed.append(repo) or original(repo, path)
+        third.refresh()
+        self.assertEqual(parsed, ["core"])
+
+if __name__ == '__main__':
+    unittest.main()
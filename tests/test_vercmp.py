@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+
+# Add src execution path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from vercmp import vercmp, parse_evr
+from sync_db import SyncIndex
+from updates import find_updates, summarize_updates
+
+# Cases from pacman's vercmp test suite (expected result of vercmp(a, b))
+VERCMP_CASES = [
+    ("1.5.0", "1.5.0", 0),
+    ("1.5.1", "1.5.0", 1),
+    ("1.5.1", "1.5", 1),
+    ("1.5.0-1", "1.5.0-2", -1),
+    ("1.5-2", "1.5.1-1", -1),
+    ("1.5", "1.5-1", 0),
+    ("1.0-1", "1.1", -1),
+    ("1.5b-1", "1.5-1", -1),
+    ("1.5b", "1.5.1", -1),
+    ("1.0a", "1.0alpha", -1),
+    ("1.0alpha", "1.0b", -1),
+    ("1.0beta", "1.0rc", -1),
+    ("1.0rc", "1.0", -1),
+    ("1.5.a", "1.5", 1),
+    ("1.5.1", "1.5.b", 1),
+    ("1.5.b-1", "1.5.b", 0),
+    ("1.5-1", "1.5.b", -1),
+    ("2.0", "2_0", 0),
+    ("2.0_a", "2_0.a", 0),
+    ("2.0a", "2.0.a", -1),
+    ("2___a", "2_a", 1),
+    ("0:1.0", "0:1.1", -1),
+    ("1:1.0", "0:1.1", 1),
+    ("1:1.0-1", "0:1.1-1", 1),
+    ("0:1.0", "1.0", 0),
+    ("1:1.0", "1.1", 1),
+    ("1.010", "1.9", 1),
+    ("1.001", "1.1", 0),
+]
+
+class TestVercmp(unittest.TestCase):
+
+    def test_pacman_suite(self):
+        for a, b, expected in VERCMP_CASES:
+            with self.subTest(a=a, b=b):
+                self.assertEqual(vercmp(a, b), expected)
+                self.assertEqual(vercmp(b, a), -expected)
+
+    def test_parse_evr(self):
+        self.assertEqual(parse_evr("2:1.0-3"), ("2", "1.0", "3"))
+        self.assertEqual(parse_evr("1.0"), ("0", "1.0", None))
+        self.assertEqual(parse_evr(":1.0-1"), ("0", "1.0", "1"))
+
+class TestUpdates(unittest.TestCase):
+
+    def test_find_updates(self):
+        local = {
+            "kitty": {"name": "kitty", "version": "0.30.0-1", "size": 1000},
+            "linux": {"name": "linux", "version": "6.6.1.arch1-1", "size": 5000},
+            "brave-bin": {"name": "brave-bin", "version": "1.0-1", "size": 10},
+            "mesa": {"name": "mesa", "version": "1:24.1-2", "size": 100},
+        }
+        index = SyncIndex(sync_dir="/nonexistent")
+        index.packages = {
+            "kitty": {"version": "0.31.0-1", "repo": "extra", "download_size": 300, "installed_size": 1200},
+            "linux": {"version": "6.6.1.arch1-1", "repo": "core", "download_size": 900, "installed_size": 5000},
+            # Local epoch wins over a higher pkgver: no downgrade
+            "mesa": {"version": "25.0-1", "repo": "extra", "download_size": 50, "installed_size": 90},
+        }
+        found = find_updates(local, index)
+        self.assertEqual([u["name"] for u in found], ["kitty"])
+        self.assertEqual(found[0]["new_version"], "0.31.0-1")
+        self.assertEqual(summarize_updates(found), {"count": 1, "download": 300, "size_delta": 200})
+
+if __name__ == '__main__':
+    unittest.main()